@@ -0,0 +1,69 @@
+"""
+Admin routes - bulk analytics exports (restricted to ADMIN_EMAILS)
+"""
+import os
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from models import User
+from db_config import get_db
+from auth import get_admin_user
+from interview_export import (
+    EXPORT_DIR, EXPORT_FORMATS, DEFAULT_WATERMARK, PYARROW_AVAILABLE, export_interviews, get_watermark
+)
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+# One export at a time per worker - concurrent incremental runs would race on the watermark
+_export_lock = threading.Lock()
+
+
+def _run_export(fmt: str, incremental: bool, watermark: str):
+    if not _export_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="An export is already running")
+    try:
+        return export_interviews(fmt=fmt, incremental=incremental, watermark=watermark)
+    finally:
+        _export_lock.release()
+
+
+@router.post("/exports/interviews")
+async def create_interview_export(
+    format: str = "parquet",
+    incremental: bool = True,
+    watermark: str = DEFAULT_WATERMARK,
+    admin: User = Depends(get_admin_user)
+):
+    """Export interviews to a Parquet/Arrow file; download it from /exports/files/{name}"""
+    if not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=503, detail="pyarrow is not installed on this server")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    summary = await run_in_threadpool(_run_export, format, incremental, watermark)
+    summary["file"] = os.path.basename(summary.pop("path"))
+    return summary
+
+
+@router.get("/exports/watermarks/{name}")
+async def get_export_watermark(
+    name: str,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Where the next incremental export will start"""
+    completed_at, last_id = get_watermark(db, name)
+    return {"name": name, "completed_at": completed_at.isoformat() if completed_at else None, "last_id": last_id}
+
+
+@router.get("/exports/files/{name}")
+async def download_export(name: str, admin: User = Depends(get_admin_user)):
+    """Stream a finished export file"""
+    path = os.path.join(EXPORT_DIR, os.path.basename(name))
+    if os.path.basename(name) != name or not name.endswith(tuple(EXPORT_FORMATS.values())) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Export not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
@@ -0,0 +1,165 @@
+"""
+Answer Scorer - Lightweight per-turn scoring that runs off the request path
+"""
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from logger import get_logger
+
+logger = get_logger("answer_scorer")
+
+SCORER_MODEL = "llama-3.1-8b-instant"
+SCORER_MAX_WORKERS = 4
+MAX_ANSWER_CHARS = 1500
+MAX_QUESTION_CHARS = 300
+
+SIGNALS = ("communication", "technical", "preparation")
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_EXAMPLE_RE = re.compile(r"\b(for example|for instance|when i|i led|i built|we built|resulted in|\d+%)", re.IGNORECASE)
+
+
+class AnswerScorer:
+    def __init__(self, call_llm: Callable[..., str], max_workers: int = SCORER_MAX_WORKERS):
+        self.call_llm = call_llm
+        self.turn_scores: Dict[str, List[Dict]] = {}  # session_id -> list of per-turn scores
+        self._pending: Dict[str, List[Future]] = {}
+        self._turn_counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="answer-scorer")
+
+    def schedule(self, session_id: str, question: str, answer: str, kind: str = "answer", role_name: str = "") -> Future:
+        """Queue a turn for scoring and return immediately"""
+        with self._lock:
+            turn = self._turn_counters.get(session_id, 0)
+            self._turn_counters[session_id] = turn + 1
+        future = self._executor.submit(self._score_turn, session_id, turn, question, answer, kind, role_name)
+        with self._lock:
+            pending = self._pending.setdefault(session_id, [])
+            pending[:] = [f for f in pending if not f.done()]
+            pending.append(future)
+        return future
+
+    def wait_for_session(self, session_id: str, timeout: float = 10.0):
+        """Block until queued turns for a session are scored (or timeout)"""
+        with self._lock:
+            pending = list(self._pending.get(session_id, []))
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def wait_for_sessions(self, session_ids: List[str], timeout: float = 10.0):
+        """Block until queued turns for all these sessions are scored, under one overall timeout"""
+        with self._lock:
+            pending = [future for session_id in session_ids for future in self._pending.get(session_id, [])]
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def get_turn_scores(self, session_id: str) -> List[Dict]:
+        """Scored turns for a session, in the order they were asked"""
+        with self._lock:
+            return sorted(self.turn_scores.get(session_id, []), key=lambda t: t["turn"])
+
+    def aggregate(self, session_id: str) -> Optional[Dict]:
+        """Average per-turn signals into session-level 1-10 scores"""
+        turns = self.get_turn_scores(session_id)
+        if not turns:
+            return None
+
+        averages = {
+            signal: sum(t[signal] for t in turns) / len(turns)
+            for signal in SIGNALS
+        }
+        return {
+            "communication_score": round(averages["communication"]),
+            "technical_score": round(averages["technical"]),
+            "preparation_score": round(averages["preparation"]),
+            "overall_score": round(sum(averages.values()) / len(SIGNALS)),
+            "turn_count": len(turns),
+            "notes": [t["note"] for t in turns if t.get("note")]
+        }
+
+    def restore_session(self, session_id: str, turn_scores: List[Dict]):
+        """Reload scored turns for a session handed over from another worker"""
+        with self._lock:
+            self.turn_scores[session_id] = list(turn_scores)
+            self._turn_counters[session_id] = max((t["turn"] for t in turn_scores), default=-1) + 1
+
+    def clear_session(self, session_id: str):
+        """Forget scores for a finished session"""
+        with self._lock:
+            self.turn_scores.pop(session_id, None)
+            self._pending.pop(session_id, None)
+            self._turn_counters.pop(session_id, None)
+
+    def _score_turn(self, session_id: str, turn: int, question: str, answer: str, kind: str, role_name: str):
+        """Score one answer with a small model, falling back to a heuristic"""
+        scores = None
+        try:
+            response = self.call_llm([
+                {"role": "system", "content": "You grade single interview answers and reply with JSON only."},
+                {"role": "user", "content": self._build_scoring_prompt(question, answer, kind, role_name)}
+            ], temperature=0.2, max_tokens=120, model=SCORER_MODEL)
+            scores = self._parse_scores(response)
+        except Exception as e:
+            logger.warning("turn_scoring_failed", extra={"session_id": session_id, "turn": turn, "error": str(e)})
+
+        if scores is None:
+            scores = self._heuristic_scores(answer, kind)
+
+        scores.update({
+            "turn": turn,
+            "kind": kind,
+            "timestamp": datetime.now().isoformat()
+        })
+        with self._lock:
+            self.turn_scores.setdefault(session_id, []).append(scores)
+
+    def _build_scoring_prompt(self, question: str, answer: str, kind: str, role_name: str) -> str:
+        """Build a compact grading prompt for one question/answer pair"""
+        answer_label = "Code submitted" if kind == "code" else "Answer"
+        return f"""Interview for: {role_name or 'a professional role'}
+Question: {question[:MAX_QUESTION_CHARS]}
+{answer_label}: {answer[:MAX_ANSWER_CHARS]}
+
+Rate this single response from 1-10 on each signal:
+- communication: clarity, structure, conciseness
+- technical: correctness, depth, domain knowledge
+- preparation: concrete examples, specifics, readiness
+
+Reply with ONLY: {{"communication": n, "technical": n, "preparation": n, "note": "<20 words on what stood out, quoting the candidate if possible>"}}"""
+
+    def _parse_scores(self, response: str) -> Optional[Dict]:
+        """Extract the JSON scores from the scorer response"""
+        match = _JSON_OBJECT_RE.search(response or "")
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group(0))
+            scores = {signal: max(1, min(10, int(round(float(data[signal]))))) for signal in SIGNALS}
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+        scores["note"] = str(data.get("note", "")).strip()[:200]
+        scores["source"] = "llm"
+        return scores
+
+    def _heuristic_scores(self, answer: str, kind: str) -> Dict:
+        """Rough length/example based scores used when the scorer model is unavailable"""
+        words = len(answer.split())
+        if kind == "code":
+            communication = 6
+            technical = 6 if words > 5 else 3
+        else:
+            communication = 3 if words < 10 else 5 if words < 40 else 7 if words < 250 else 5
+            technical = 5
+        preparation = 7 if _EXAMPLE_RE.search(answer) else 5 if words >= 40 else 3
+        return {
+            "communication": communication,
+            "technical": technical,
+            "preparation": preparation,
+            "note": "",
+            "source": "heuristic"
+        }
@@ -17,6 +17,9 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-min-3
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Comma-separated emails allowed to use the /api/admin endpoints
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
 # Password hashing - using argon2 to avoid bcrypt 72-byte limitation on Windows
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
@@ -58,12 +61,8 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from token"""
-    token = credentials.credentials
+def authenticate_token(token: str, db: Session) -> User:
+    """Resolve a bearer token to an active user (shared by HTTP and WebSocket auth)"""
     payload = decode_token(token)
     
     email: str = payload.get("sub")
@@ -87,3 +86,19 @@ def get_current_user(
         )
     
     return user
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user from token"""
+    return authenticate_token(credentials.credentials, db)
+
+def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    """Current user, if listed in ADMIN_EMAILS"""
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -0,0 +1,92 @@
+"""
+Code analysis benchmark - accuracy and analysis time over typical interview solutions
+
+Each corpus file is checked against corpus/code/expected.json (syntax error,
+line, complexity estimate, number of findings). Samples are stored as .txt so
+the deliberately broken ones stay out of compileall. Files in languages without
+an installed parser (tree-sitter) are reported as skipped.
+
+Usage (from backend/):
+    python benchmarks/bench_code_analysis.py [--iterations 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from code_analysis import analyze_code
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "code")
+
+
+def load_corpus():
+    with open(os.path.join(CORPUS_DIR, "expected.json")) as f:
+        expected = json.load(f)
+    corpus = []
+    for file_name, expectation in sorted(expected.items()):
+        with open(os.path.join(CORPUS_DIR, file_name), encoding="utf-8") as f:
+            corpus.append((file_name, f.read(), expectation))
+    return corpus
+
+
+def check(analysis, expectation):
+    """Return a list of mismatch descriptions"""
+    mismatches = []
+    has_error = analysis["syntax_error"] is not None
+    if has_error != expectation["syntax_error"]:
+        return [f"syntax_error={has_error} expected {expectation['syntax_error']}"]
+    if has_error:
+        if "line" in expectation and analysis["syntax_error"]["line"] != expectation["line"]:
+            mismatches.append(f"line={analysis['syntax_error']['line']} expected {expectation['line']}")
+        return mismatches
+    if "complexity" in expectation and analysis["complexity"] != expectation["complexity"]:
+        mismatches.append(f"complexity={analysis['complexity']} expected {expectation['complexity']}")
+    if "findings" in expectation and len(analysis["findings"]) != expectation["findings"]:
+        mismatches.append(f"findings={len(analysis['findings'])} expected {expectation['findings']}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    mismatches = []
+    skipped = 0
+    syntax_errors = 0
+
+    print(f"{'file':<30} {'us/analysis':>12}  result")
+    for file_name, code, expectation in corpus:
+        analysis = analyze_code(code, expectation["language"])
+        if analysis is None:
+            skipped += 1
+            print(f"{file_name:<30} {'-':>12}  skipped (no {expectation['language']} parser)")
+            continue
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            analyze_code(code, expectation["language"])
+        micros = (time.perf_counter() - start) / args.iterations * 1e6
+
+        problems = check(analysis, expectation)
+        mismatches.extend(f"{file_name}: {problem}" for problem in problems)
+        syntax_errors += analysis["syntax_error"] is not None
+        summary = "syntax error" if analysis["syntax_error"] else analysis["complexity"]
+        print(f"{file_name:<30} {micros:>12.1f}  {'MISMATCH' if problems else 'ok'} ({summary})")
+
+    checked = len(corpus) - skipped
+    print(f"\nAccuracy: {checked - len({m.split(':')[0] for m in mismatches})}/{checked} files fully correct, {skipped} skipped")
+    print(f"LLM calls avoided (syntax errors answered locally): {syntax_errors}/{checked}")
+    for mismatch in mismatches:
+        print(f"  MISMATCH {mismatch}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
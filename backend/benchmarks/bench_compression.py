@@ -0,0 +1,134 @@
+"""
+Column compression benchmark - stored size and read/write cost: plain vs zstd vs zstd + trained dictionary
+
+Samples are feedback documents and interview transcripts. By default they are
+synthesized from benchmarks/corpus/feedback (recombined sections, varied scores)
+and interview-style question/answer templates; --from-db uses the rows in
+DATABASE_URL instead. Half the samples train the dictionary, the other half
+are measured, so the ratios reflect unseen interviews.
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py [--samples 600] [--dict-size 65536]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from compression import MARKER, ZSTD_AVAILABLE, ZSTD_LEVEL, _corpus_samples, train_dictionary
+
+QUESTIONS = [
+    "Can you tell me about a project you're proud of and your role in it?",
+    "How do you approach debugging a production issue you can't reproduce locally?",
+    "Tell me about a time you disagreed with a teammate. How did you resolve it?",
+    "Walk me through how you would design a URL shortener.",
+    "What's the difference between a process and a thread?",
+    "How do you handle an unhappy customer who wants a refund outside policy?",
+    "Now let's move to a coding challenge. Please use the code editor on the screen to write your solution.",
+]
+ANSWERS = [
+    "In my last role I led the migration of our billing service to {tech}, which cut latency by {n}%.",
+    "I usually start by looking at the logs and metrics around the time of the incident, then narrow it down.",
+    "We disagreed about using {tech}; I wrote a short comparison and we agreed to prototype both.",
+    "I'd use a hash of the URL stored in {tech}, with a cache in front for the hot links.",
+    "A process has its own memory space while threads share the memory of their process.",
+    "I listen first, acknowledge the frustration, and then explain what I can do within policy.",
+]
+TECH = ["PostgreSQL", "Redis", "Kafka", "Go", "Kubernetes", "React", "DynamoDB", "gRPC"]
+
+
+def synthesize_transcript(rng):
+    history = []
+    for _ in range(rng.randint(4, 12)):
+        history.append({"role": "assistant", "content": rng.choice(QUESTIONS), "timestamp": f"2026-01-{rng.randint(1, 28):02d}T10:{rng.randint(0, 59):02d}:00"})
+        answer = rng.choice(ANSWERS).format(tech=rng.choice(TECH), n=rng.randint(10, 60))
+        history.append({"role": "user", "content": answer, "timestamp": f"2026-01-{rng.randint(1, 28):02d}T10:{rng.randint(0, 59):02d}:30"})
+    return json.dumps(history)
+
+
+def synthesize_feedback(rng, corpus):
+    lines = rng.choice(corpus).splitlines()
+    middle = lines[2:-2]
+    rng.shuffle(middle)
+    text = "\n".join(lines[:2] + middle + lines[-2:])
+    return re.sub(r"\b([1-9]|10)/10\b", lambda _: f"{rng.randint(3, 9)}/10", text)
+
+
+def build_samples(count, seed=7):
+    rng = random.Random(seed)
+    corpus = [sample.decode("utf-8") for sample in _corpus_samples()]
+    return [
+        (synthesize_transcript(rng) if index % 2 else synthesize_feedback(rng, corpus)).encode("utf-8")
+        for index in range(count)
+    ]
+
+
+def stored_size(compressed: bytes, dict_id: int) -> int:
+    """Length as written to the column by compression.compress_text"""
+    return len(f"{MARKER}{dict_id}:") + len(base64.b85encode(compressed))
+
+
+def measure(name, samples, compressor=None, decompressor=None, dict_id=0):
+    sizes, write_us, read_us = [], [], []
+    for raw in samples:
+        if compressor is None:
+            start = time.perf_counter()
+            stored = raw.decode("utf-8")
+            write_us.append((time.perf_counter() - start) * 1e6)
+            start = time.perf_counter()
+            stored.encode("utf-8")
+            read_us.append((time.perf_counter() - start) * 1e6)
+            sizes.append(len(stored))
+            continue
+        start = time.perf_counter()
+        compressed = compressor.compress(raw)
+        encoded = base64.b85encode(compressed)
+        write_us.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        decompressor.decompress(base64.b85decode(encoded))
+        read_us.append((time.perf_counter() - start) * 1e6)
+        sizes.append(min(len(raw), stored_size(compressed, dict_id)))
+    raw_total = sum(len(raw) for raw in samples)
+    print(f"{name:<22} {sum(sizes):>10} {raw_total / sum(sizes):>7.2f}x "
+          f"{statistics.median(write_us):>10.1f} {statistics.median(read_us):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=600)
+    parser.add_argument("--dict-size", type=int, default=64 * 1024)
+    parser.add_argument("--from-db", action="store_true", help="sample stored interviews instead of synthesized ones")
+    args = parser.parse_args()
+
+    if not ZSTD_AVAILABLE:
+        sys.exit("zstandard is not installed (pip install zstandard)")
+    import zstandard
+
+    if args.from_db:
+        from compression import _database_samples
+        samples = _database_samples(args.samples)
+    else:
+        samples = build_samples(args.samples)
+    train, test = samples[::2], samples[1::2]
+    dictionary = train_dictionary(train, args.dict_size)
+
+    print(f"{len(test)} test samples, {sum(map(len, test))} bytes; dictionary {len(dictionary.as_bytes())} bytes "
+          f"from {len(train)} training samples\n")
+    print(f"{'storage':<22} {'bytes':>10} {'ratio':>8} {'write us':>10} {'read us':>10}")
+    measure("plain", test)
+    measure("zstd", test, zstandard.ZstdCompressor(level=ZSTD_LEVEL), zstandard.ZstdDecompressor())
+    measure("zstd + dictionary", test,
+            zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary),
+            zstandard.ZstdDecompressor(dict_data=dictionary), dictionary.dict_id())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Feedback parser benchmark - accuracy and parse time over recorded LLM outputs
+
+Usage (from backend/):
+    python benchmarks/bench_feedback_parser.py [--iterations 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from feedback_analyzer import FeedbackAnalyzer, SCORE_FIELDS, LIST_FIELDS
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "feedback")
+
+
+def load_corpus():
+    """Load recorded LLM outputs and their expected parse results"""
+    with open(os.path.join(CORPUS_DIR, "expected.json")) as f:
+        expected = json.load(f)
+    corpus = []
+    for file_name, expectation in sorted(expected.items()):
+        with open(os.path.join(CORPUS_DIR, file_name), encoding="utf-8") as f:
+            corpus.append((file_name, f.read(), expectation))
+    return corpus
+
+
+def check_accuracy(analyzer, corpus):
+    """Compare parsed fields with expectations, return list of mismatches"""
+    mismatches = []
+    for file_name, text, expectation in corpus:
+        parsed = analyzer._parse_feedback(text, [])
+        for field in SCORE_FIELDS:
+            if parsed[field] != expectation[field]:
+                mismatches.append(f"{file_name}: {field}={parsed[field]} expected {expectation[field]}")
+        for field in LIST_FIELDS:
+            if len(parsed[field]) != expectation[field]:
+                mismatches.append(f"{file_name}: len({field})={len(parsed[field])} expected {expectation[field]}")
+        if bool(parsed["detailed_analysis"]) != expectation["has_analysis"]:
+            mismatches.append(f"{file_name}: detailed_analysis presence mismatch")
+    return mismatches
+
+
+def time_parser(analyzer, corpus, iterations: int):
+    """Return mean parse time in microseconds per document"""
+    results = {}
+    for file_name, text, _ in corpus:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            analyzer._parse_feedback(text, [])
+        results[file_name] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    analyzer = FeedbackAnalyzer()
+    corpus = load_corpus()
+
+    # Warnings about defaulted scores are expected for some documents; keep output readable
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        mismatches = check_accuracy(analyzer, corpus)
+        timings = time_parser(analyzer, corpus, args.iterations)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print(f"{'document':<28} {'us/parse':>10}")
+    for file_name, micros in timings.items():
+        print(f"{file_name:<28} {micros:>10.1f}")
+    print(f"\nAccuracy: {len(corpus) - len({m.split(':')[0] for m in mismatches})}/{len(corpus)} documents fully correct")
+    for mismatch in mismatches:
+        print(f"  MISMATCH {mismatch}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Frame upload benchmark - server-side CPU time and peak memory per frame, base64 JSON vs raw binary
+
+Simulates what the backend does with a received frame before the vision call:
+  base64+PIL  JSON body -> pydantic -> b64decode -> PIL.Image.open/load  (old /video-frame)
+  base64      JSON body -> pydantic -> b64decode                         (current /video-frame)
+  binary      streamed body chunks -> one join                           (/video-frame/binary)
+
+Usage (from backend/):
+    python benchmarks/bench_frame_upload.py [--iterations 300] [--width 640 --height 480]
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import time
+import tracemalloc
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Starlette hands request bodies over in chunks of this size
+STREAM_CHUNK_BYTES = 64 * 1024
+# Typical 640x480 webcam JPEG at quality 0.8, used when Pillow is not installed
+FALLBACK_FRAME_BYTES = 48 * 1024
+
+
+class FramePayload(BaseModel):
+    """Same shape as interview_routes.VideoFrameRequest"""
+    session_id: str
+    image_base64: str
+    current_question: Optional[str] = ""
+
+
+def make_frame(width: int, height: int) -> bytes:
+    """A webcam-sized JPEG (random noise compresses about as badly as a real frame)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        # Only the transport paths run without Pillow, and they never look inside the bytes
+        return os.urandom(FALLBACK_FRAME_BYTES)
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def base64_path(body: bytes, decode_image: bool) -> bytes:
+    payload = FramePayload.model_validate_json(body)
+    image_bytes = base64.b64decode(payload.image_base64)
+    if decode_image:
+        import PIL.Image
+        PIL.Image.open(io.BytesIO(image_bytes)).load()
+    return image_bytes
+
+
+def binary_path(chunks) -> bytes:
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def measure(func, iterations: int):
+    """Mean CPU microseconds per call, and peak traced allocation of a single call in KB"""
+    func()
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    cpu_us = (time.process_time() - start) / iterations * 1e6
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_us, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    frame_bytes = make_frame(args.width, args.height)
+    frame_base64 = base64.b64encode(frame_bytes).decode()
+    json_body = json.dumps({"session_id": "bench", "image_base64": frame_base64, "current_question": ""}).encode()
+    chunks = [frame_bytes[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(frame_bytes), STREAM_CHUNK_BYTES)]
+
+    cases = [
+        ("base64", len(json_body), lambda: base64_path(json_body, decode_image=False)),
+        ("binary", len(frame_bytes), lambda: binary_path(chunks)),
+    ]
+    try:
+        import PIL.Image  # noqa: F401
+        cases.insert(0, ("base64+PIL", len(json_body), lambda: base64_path(json_body, decode_image=True)))
+    except ImportError:
+        print("Pillow not installed - skipping the base64+PIL case\n")
+
+    print(f"Frame: {args.width}x{args.height}, {len(frame_bytes) / 1024:.1f} KB JPEG\n")
+    print(f"{'path':<12} {'wire KB':>9} {'CPU us/frame':>14} {'peak KB/frame':>15}")
+    for name, wire_bytes, func in cases:
+        cpu_us, peak_kb = measure(func, args.iterations)
+        print(f"{name:<12} {wire_bytes / 1024:>9.1f} {cpu_us:>14.1f} {peak_kb:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Question memory benchmark - lookup latency and repeat recall for a user with a long practice history
+
+Builds an in-memory index (no database) of --history past questions made from
+interview-style templates, then times question_memory.similar() for new turns
+and checks how often a paraphrase of a past question retrieves the original.
+
+Usage (from backend/):
+    python benchmarks/bench_question_memory.py [--history 500] [--lookups 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from question_memory import QuestionMemory
+
+TOPICS = [
+    "a REST API", "database indexing", "a caching layer", "a message queue", "unit testing", "code reviews",
+    "a production outage", "memory leaks", "concurrency bugs", "a microservice migration", "CI pipelines",
+    "load balancing", "rate limiting", "schema migrations", "feature flags", "an on-call incident",
+    "a tight deadline", "a disagreement with a teammate", "mentoring a junior engineer", "technical debt",
+]
+TEMPLATES = [
+    "Can you walk me through how you designed {topic} in a previous project?",
+    "What was the hardest problem you ran into with {topic}, and how did you solve it?",
+    "How would you explain the trade-offs of {topic} to a non-technical stakeholder?",
+    "If you had to redo your work on {topic}, what would you change?",
+    "How do you decide when {topic} is worth the added complexity?",
+]
+PARAPHRASES = [
+    "Tell me about designing {topic} on one of your past projects - how did you approach it?",
+    "Describe the toughest challenge you faced with {topic} and how you fixed it.",
+    "How would you describe the trade-offs involved in {topic} to someone non-technical?",
+    "Looking back at {topic}, what would you do differently next time?",
+    "When is {topic} worth the extra complexity, in your view?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=500, help="past questions in the user's index")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    memory = QuestionMemory(use_db=False)
+    past = {"user_id": 1, "role": "engineer", "interview_round": "technical"}
+    asked = []
+    for number in range(args.history):
+        template, topic = rng.randrange(len(TEMPLATES)), rng.choice(TOPICS)
+        asked.append((template, topic))
+        past["session_id"] = f"past-{number // 12}"
+        memory.remember(past, f"Thanks, that's helpful. {TEMPLATES[template].format(topic=topic)}")
+
+    current = {"user_id": 1, "role": "engineer", "interview_round": "technical", "session_id": "current"}
+    contexts = [
+        f"{PARAPHRASES[template].format(topic=topic)}\nI worked on it last year with a small team."
+        for template, topic in (rng.choice(asked) for _ in range(args.lookups))
+    ]
+
+    timings = []
+    for context in contexts:
+        start = time.perf_counter()
+        memory.similar(current, context)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    checked = min(200, len(asked))
+    hits = 0
+    for template, topic in asked[:checked]:
+        hits += TEMPLATES[template].format(topic=topic) in memory.similar(
+            current, PARAPHRASES[template].format(topic=topic)
+        )
+
+    timings.sort()
+    print(f"History: {args.history} questions, {args.lookups} lookups")
+    print(f"Lookup ms: median {statistics.median(timings):.3f}, p95 {timings[int(len(timings) * 0.95) - 1]:.3f}, "
+          f"max {timings[-1]:.3f}")
+    print(f"Paraphrase recall (original in top results): {hits}/{checked}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark - time for a fresh interpreter to import the app, gated against a budget
+
+Each run starts a new interpreter, imports main (which builds the FastAPI app and
+every route module) and reports the wall time. The median over --runs is
+compared with --max-seconds, or the value stored in cold_start_budget.json;
+the script exits 1 when the budget is exceeded so CI can fail on regressions.
+
+Usage (from backend/):
+    python benchmarks/cold_start.py [--runs 7] [--max-seconds 1.5]
+    python benchmarks/cold_start.py --update-budget   # record current median + 25% headroom
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cold_start_budget.json")
+BUDGET_HEADROOM = 1.25
+
+# Timed inside the child so interpreter start-up itself isn't counted
+PROBE = "import time; started = time.perf_counter(); import {target}; print(time.perf_counter() - started)"
+
+
+def time_import(target: str) -> float:
+    # No background warm-up: it would race the measurement and needs real API keys anyway
+    env = dict(os.environ, WARMUP_PROVIDERS="0")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(target=target)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        sys.exit(result.returncode)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def load_budget():
+    if not os.path.exists(BUDGET_FILE):
+        return None
+    with open(BUDGET_FILE) as f:
+        return json.load(f).get("max_seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="main")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--max-seconds", type=float, default=None, help="budget for the median (overrides the budget file)")
+    parser.add_argument("--update-budget", action="store_true", help="write the measured median plus headroom to the budget file")
+    args = parser.parse_args()
+
+    # The first run also fills the bytecode cache; don't count it
+    time_import(args.target)
+    timings = [time_import(args.target) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"import {args.target}: median {median:.3f}s  min {min(timings):.3f}s  max {max(timings):.3f}s  ({args.runs} runs)")
+
+    if args.update_budget:
+        budget = round(median * BUDGET_HEADROOM, 3)
+        with open(BUDGET_FILE, "w") as f:
+            json.dump({"max_seconds": budget}, f, indent=2)
+            f.write("\n")
+        print(f"Budget updated: {budget:.3f}s")
+        return
+
+    budget = args.max_seconds if args.max_seconds is not None else load_budget()
+    if budget is None:
+        # A gate without a budget would pass everything
+        print("No budget set (use --max-seconds or --update-budget)")
+        sys.exit(1)
+    if median > budget:
+        print(f"REGRESSION: median {median:.3f}s exceeds budget {budget:.3f}s")
+        sys.exit(1)
+    print(f"Within budget ({budget:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
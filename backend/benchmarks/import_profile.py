@@ -0,0 +1,74 @@
+"""
+Import-time profile - which modules `import main` spends its time on
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and ranks
+modules by cumulative import time (top-level packages folded together).
+
+Usage (from backend/):
+    python benchmarks/import_profile.py [--top 25] [--modules]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       412 |       1530 |     groq._client"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(target: str):
+    """Return [(module, self_us, cumulative_us, depth)] from one fresh interpreter"""
+    env = dict(os.environ, WARMUP_PROVIDERS="0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        sys.exit(result.returncode)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # importtime indents nested imports by two spaces per level
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def by_package(rows):
+    """Self time summed per top-level package - what making one import lazy would save"""
+    totals = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        totals[module.split(".")[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--modules", action="store_true", help="rank individual modules by cumulative time instead")
+    args = parser.parse_args()
+
+    rows = run_importtime(args.target)
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+    print(f"import {args.target}: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+
+    if args.modules:
+        print(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+        for module, self_us, cumulative_us, _ in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+            print(f"{module:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    else:
+        print(f"{'package':<30} {'ms':>9} {'share':>7}")
+        for package, self_us in by_package(rows)[:args.top]:
+            print(f"{package:<30} {self_us / 1000:>9.1f} {self_us / max(total_us, 1):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Load generator - drives full interview sessions through the FastAPI app
+
+Each simulated candidate registers, starts an interview, sends N messages,
+submits code, posts video frames and ends the interview. Latency is
+reported per endpoint (p50/p95/p99) together with sessions per second.
+
+Run the mock provider first so no real Groq/Gemini quota is used:
+    python benchmarks/mock_llm_server.py --port 9100 &
+
+In-process (no HTTP server, single worker):
+    GROQ_API_KEY=mock GROQ_BASE_URL=http://127.0.0.1:9100 \\
+    GEMINI_API_KEY=mock GEMINI_API_ENDPOINT=http://127.0.0.1:9100 \\
+    python benchmarks/load_test.py --sessions 20 --concurrency 5
+
+Against a running server:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --workers 4
+"""
+import argparse
+import asyncio
+import base64
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Smallest valid baseline JPEG, used when Pillow is not installed
+TINY_JPEG_BASE64 = (
+    "/9j/4AAQSkZJRgABAQEASABIAAD/2wBDAP//////////////////////////////////////////////////////"
+    "////////////////////////////////wgALCAABAAEBAREA/8QAFBABAAAAAAAAAAAAAAAAAAAAAP/aAAgBAQABPxA="
+)
+
+ANSWERS = [
+    "In my last role I built a payments service in Python and reduced checkout latency by 30% by adding caching.",
+    "I usually start by reproducing the bug, then add logging around the failing path and write a regression test.",
+    "We had a disagreement about the database choice, so I wrote a short comparison doc and we agreed on Postgres.",
+    "For example, when traffic doubled I moved the image processing to a queue with autoscaled workers.",
+]
+
+CODE_SAMPLES = [
+    ("python", "def reverse_string(s):\n    return s[::-1]\n"),
+    ("python", "def is_palindrome(s):\n    cleaned = ''.join(c.lower() for c in s if c.isalnum())\n    return cleaned == cleaned[::-1]\n"),
+    ("javascript", "function largest(arr) {\n  return Math.max(...arr);\n}\n"),
+]
+
+
+def make_frame_base64(width: int = 640, height: int = 480) -> str:
+    """A webcam-sized JPEG frame (random noise compresses about as badly as a real frame)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return TINY_JPEG_BASE64
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=70)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            raise
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_session(client: httpx.AsyncClient, recorder: LatencyRecorder, args, frame_base64: str) -> bool:
+    """One full candidate session; returns True if it reached /end successfully"""
+    frame_bytes = base64.b64decode(frame_base64)
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    response = await recorder.call(client, "POST /api/auth/register", "POST", "/api/auth/register", json={
+        "email": email, "password": "benchmark-password", "full_name": "Bench Candidate"
+    })
+    if response.status_code != 200:
+        return False
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await recorder.call(client, "POST /api/interview/start", "POST", "/api/interview/start", headers=headers, json={
+        "role": "engineer", "interview_round": "technical", "duration_minutes": 30
+    })
+    if response.status_code != 200:
+        return False
+    session_id = response.json()["session_id"]
+
+    frames_sent = 0
+    for turn in range(args.messages):
+        await recorder.call(client, "POST /api/interview/message", "POST", "/api/interview/message", headers=headers, json={
+            "session_id": session_id, "message": random.choice(ANSWERS), "is_voice": True
+        })
+        # Spread frames and code submissions across the conversation
+        while frames_sent < args.frames * (turn + 1) // max(1, args.messages):
+            if args.binary_frames:
+                await recorder.call(client, "POST /api/interview/video-frame/binary", "POST", "/api/interview/video-frame/binary",
+                                    headers={**headers, "Content-Type": "image/jpeg"}, params={"session_id": session_id},
+                                    content=frame_bytes)
+            else:
+                await recorder.call(client, "POST /api/interview/video-frame", "POST", "/api/interview/video-frame", headers=headers, json={
+                    "session_id": session_id, "image_base64": frame_base64
+                })
+            frames_sent += 1
+        if turn < args.code_submissions:
+            language, code = random.choice(CODE_SAMPLES)
+            await recorder.call(client, "POST /api/interview/code-submission", "POST", "/api/interview/code-submission", headers=headers, json={
+                "session_id": session_id, "code": code, "language": language
+            })
+
+    await recorder.call(client, "GET /api/interview/{session_id}/status", "GET", f"/api/interview/{session_id}/status", headers=headers)
+    response = await recorder.call(client, "POST /api/interview/end", "POST", "/api/interview/end", headers=headers, json={
+        "session_id": session_id
+    })
+    return response.status_code == 200
+
+
+async def run_load(args) -> None:
+    recorder = LatencyRecorder()
+    frame_base64 = make_frame_base64()
+    app = None
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from main import app
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=args.timeout)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded_session():
+        async with semaphore:
+            try:
+                return await run_session(client, recorder, args, frame_base64)
+            except httpx.HTTPError:
+                return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bounded_session() for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - start
+
+    await client.aclose()
+    if app is not None:
+        await app.router.shutdown()
+
+    completed = sum(1 for ok in results if ok)
+    print(f"\n{'endpoint':<42} {'count':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name in sorted(recorder.samples):
+        values = sorted(recorder.samples[name])
+        print(f"{name:<42} {len(values):>6} {recorder.errors[name]:>5} "
+              f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+
+    sessions_per_second = completed / elapsed if elapsed else 0.0
+    print(f"\nSessions completed: {completed}/{args.sessions} in {elapsed:.1f}s")
+    print(f"Throughput: {sessions_per_second:.3f} sessions/s total, "
+          f"{sessions_per_second / args.workers:.3f} sessions/s per worker ({args.workers} worker(s))")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="Base URL of a running backend; omit to run the app in-process")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker count, used for the per-worker rate")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=6)
+    parser.add_argument("--code-submissions", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=6)
+    parser.add_argument("--binary-frames", action="store_true", help="Post frames as raw image/jpeg to /video-frame/binary")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    if not args.url:
+        args.workers = 1
+    asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
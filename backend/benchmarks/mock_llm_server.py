@@ -0,0 +1,207 @@
+"""
+Mock LLM and vision server for offline benchmarks
+
+Serves an OpenAI/Groq-compatible chat completions endpoint and a Gemini
+generateContent stub, with configurable latency, token rate and error
+injection. Point the backend at it with:
+
+    GROQ_API_KEY=mock GROQ_BASE_URL=http://127.0.0.1:9100 \\
+    GEMINI_API_KEY=mock GEMINI_API_ENDPOINT=http://127.0.0.1:9100 \\
+    uvicorn main:app
+
+Usage (from backend/):
+    python benchmarks/mock_llm_server.py --port 9100 --latency-median-ms 400 \\
+        --latency-sigma 0.5 --tokens-per-second 400 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Defaults, overridden from the command line in main()
+CONFIG = {
+    "latency_median_ms": 400.0,
+    "latency_sigma": 0.5,
+    "tokens_per_second": 400.0,
+    "error_rate": 0.0,
+    "error_statuses": [429, 500, 503],
+    "vision_latency_median_ms": 1500.0,
+}
+
+INTERVIEW_REPLIES = [
+    "Thanks for sharing that. Can you walk me through a specific challenge you faced and how you solved it?",
+    "That makes sense. How would you approach scaling that system to ten times the traffic?",
+    "Good example. What would you do differently if you had to build it again today?",
+    "Interesting. How do you usually handle disagreements with teammates about technical decisions?",
+]
+
+FEEDBACK_JSON = {
+    "overall_score": 7,
+    "strengths": ["Clear structure in answers", "Concrete examples with metrics", "Good problem decomposition"],
+    "areas_for_improvement": ["Discuss edge cases earlier", "Keep behavioral answers shorter", "Explain trade-offs explicitly"],
+    "communication_score": 7,
+    "technical_score": 7,
+    "preparation_score": 6,
+    "detailed_analysis": "Solid performance overall with room to add depth on trade-offs.",
+    "recommendations": ["Practice edge-case enumeration", "Prepare STAR stories", "Review system design trade-offs"],
+}
+
+VISION_TEXT = """EYE_CONTACT: good
+FACIAL_EXPRESSION: positive
+BODY_LANGUAGE: engaged
+CONFIDENCE_LEVEL: moderate
+MALPRACTICE: none
+NOTES: Candidate is centered in frame and looking at the camera."""
+
+app = FastAPI(title="Mock LLM server")
+
+
+def _sample_latency(median_ms: float) -> float:
+    """Log-normal latency in seconds around the configured median"""
+    return random.lognormvariate(math.log(median_ms / 1000.0), CONFIG["latency_sigma"])
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _injected_error():
+    """Return an error response with probability error_rate"""
+    if CONFIG["error_rate"] and random.random() < CONFIG["error_rate"]:
+        status = random.choice(CONFIG["error_statuses"])
+        return JSONResponse(status_code=status, content={"error": {"message": "injected error", "type": "mock"}})
+    return None
+
+
+def _completion_text(messages) -> str:
+    """Pick a plausible response for the prompt shape used by the backend"""
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    if "grade single interview answers" in system:
+        return json.dumps({
+            "communication": random.randint(5, 9),
+            "technical": random.randint(4, 9),
+            "preparation": random.randint(4, 9),
+            "note": "Gave a concrete example with measurable impact"
+        })
+    if "structured facts from resumes" in system:
+        return json.dumps({"skills": ["Python", "SQL"], "projects": ["Payments API"], "roles": ["Backend Engineer"]})
+    if "interview coach" in system:
+        if '"strengths"' in prompt and "Do NOT re-score" in prompt:
+            return json.dumps({key: FEEDBACK_JSON[key] for key in ("strengths", "areas_for_improvement", "detailed_analysis", "recommendations")})
+        return json.dumps(FEEDBACK_JSON)
+    return random.choice(INTERVIEW_REPLIES)
+
+
+async def _simulate(median_ms: float, completion_tokens: int):
+    """Sleep for network/queue latency plus generation time"""
+    await asyncio.sleep(_sample_latency(median_ms) + completion_tokens / CONFIG["tokens_per_second"])
+
+
+@app.post("/openai/v1/chat/completions")
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """OpenAI/Groq-compatible chat completion"""
+    body = await request.json()
+    error = _injected_error()
+    if error:
+        await asyncio.sleep(_sample_latency(CONFIG["latency_median_ms"]) / 4)
+        return error
+
+    messages = body.get("messages", [])
+    text = _completion_text(messages)
+    prompt_tokens = sum(_estimate_tokens(str(m.get("content", ""))) for m in messages)
+    completion_tokens = min(_estimate_tokens(text), body.get("max_tokens") or 10_000)
+    await _simulate(CONFIG["latency_median_ms"], completion_tokens)
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+@app.post("/v1beta/models/{model}:generateContent")
+@app.post("/v1/models/{model}:generateContent")
+async def gemini_generate_content(model: str, request: Request):
+    """Gemini REST generateContent stub (vision frames and text fallback)"""
+    body = await request.json()
+    error = _injected_error()
+    if error:
+        return error
+
+    parts = [part for content in body.get("contents", []) for part in content.get("parts", [])]
+    has_image = any("inline_data" in part or "inlineData" in part for part in parts)
+    prompt_text = " ".join(part.get("text", "") for part in parts)
+
+    if has_image:
+        text = VISION_TEXT
+        median_ms = CONFIG["vision_latency_median_ms"]
+    else:
+        text = _completion_text([{"role": "user", "content": prompt_text}])
+        median_ms = CONFIG["latency_median_ms"]
+
+    completion_tokens = _estimate_tokens(text)
+    await _simulate(median_ms, completion_tokens)
+
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0
+        }],
+        "usageMetadata": {
+            "promptTokenCount": _estimate_tokens(prompt_text) + (258 if has_image else 0),
+            "candidatesTokenCount": completion_tokens,
+            "totalTokenCount": _estimate_tokens(prompt_text) + completion_tokens
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-median-ms", type=float, default=CONFIG["latency_median_ms"])
+    parser.add_argument("--latency-sigma", type=float, default=CONFIG["latency_sigma"],
+                        help="Log-normal sigma; 0 gives constant latency")
+    parser.add_argument("--vision-latency-median-ms", type=float, default=CONFIG["vision_latency_median_ms"])
+    parser.add_argument("--tokens-per-second", type=float, default=CONFIG["tokens_per_second"])
+    parser.add_argument("--error-rate", type=float, default=CONFIG["error_rate"],
+                        help="Probability (0-1) of returning an injected 429/500/503")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    CONFIG.update({
+        "latency_median_ms": args.latency_median_ms,
+        "latency_sigma": args.latency_sigma,
+        "vision_latency_median_ms": args.vision_latency_median_ms,
+        "tokens_per_second": args.tokens_per_second,
+        "error_rate": args.error_rate,
+    })
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Code analysis - fast local pre-pass over submissions: syntax errors, complexity estimate and common anti-patterns
+"""
+import ast
+from typing import Dict, List, Optional
+
+from logger import get_logger
+
+logger = get_logger("code_analysis")
+
+# Optional: tree-sitter grammars for languages other than Python
+try:
+    from tree_sitter_languages import get_parser as _get_tree_sitter_parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+# Editor language -> tree-sitter grammar name
+TREE_SITTER_LANGUAGES = {
+    "javascript": "javascript", "js": "javascript",
+    "typescript": "typescript", "ts": "typescript",
+    "java": "java", "c": "c", "cpp": "cpp", "c++": "cpp",
+    "csharp": "c_sharp", "c#": "c_sharp", "go": "go",
+    "ruby": "ruby", "rust": "rust", "php": "php", "kotlin": "kotlin", "sql": "sql",
+}
+TREE_SITTER_LOOP_TYPES = {
+    "for_statement", "while_statement", "do_statement", "for_in_statement",
+    "enhanced_for_statement", "for_range_loop", "foreach_statement", "for_expression",
+    "while_expression", "loop_expression", "for", "while", "until",
+}
+TREE_SITTER_BRANCH_TYPES = TREE_SITTER_LOOP_TYPES | {
+    "if_statement", "if_expression", "switch_case", "case_statement", "catch_clause",
+    "conditional_expression", "ternary_expression", "match_arm", "elif", "if",
+}
+
+MAX_FINDINGS = 6
+# Longer submissions skip the pre-pass (same cap as code_sandbox.MAX_CODE_CHARS)
+MAX_CODE_CHARS = 20000
+
+
+def _complexity_label(loop_depth: int, sorts: bool, recursive: bool) -> str:
+    if recursive:
+        return "recursive (check the recurrence)"
+    if loop_depth == 0:
+        return "O(n log n)" if sorts else "O(1) or O(n) via built-ins"
+    if loop_depth == 1:
+        return "O(n log n)" if sorts else "O(n)"
+    return f"O(n^{loop_depth})"
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    """Single walk collecting loop depth, branches, recursion and anti-patterns"""
+
+    def __init__(self):
+        self.functions: List[str] = []
+        self.function_stack: List[str] = []
+        self.loop_depth = 0
+        self.max_loop_depth = 0
+        self.branches = 0
+        self.sorts = False
+        self.recursive = False
+        self.string_vars = set()
+        self.findings: List[str] = []
+
+    def _note(self, node, message: str):
+        finding = f"line {node.lineno}: {message}"
+        if finding not in self.findings:
+            self.findings.append(finding)
+
+    def _loop(self, node):
+        self.branches += 1
+        self.loop_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    def visit_FunctionDef(self, node):
+        self.functions.append(node.name)
+        for default in node.args.defaults + node.args.kw_defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self._note(default, f"mutable default argument in {node.name}()")
+        self.function_stack.append(node.name)
+        # Loops in one function don't nest inside another function's loops
+        outer_depth, self.loop_depth = self.loop_depth, 0
+        self.generic_visit(node)
+        self.loop_depth = outer_depth
+        self.function_stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_For(self, node):
+        iterator = node.iter
+        if (isinstance(iterator, ast.Call) and getattr(iterator.func, "id", None) == "range"
+                and iterator.args and isinstance(iterator.args[-1], ast.Call)
+                and getattr(iterator.args[-1].func, "id", None) == "len"):
+            self._note(node, "range(len(...)) loop - iterate directly or use enumerate()")
+        self._loop(node)
+
+    visit_AsyncFor = visit_For
+    visit_While = _loop
+
+    def visit_comprehension(self, node):
+        self.branches += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+    def _comprehension(self, node):
+        # Each generator is a loop level
+        self.loop_depth += len(node.generators)
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= len(node.generators)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _comprehension
+
+    def visit_If(self, node):
+        self.branches += 1
+        self.generic_visit(node)
+
+    def visit_IfExp(self, node):
+        self.branches += 1
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        self.branches += len(node.values) - 1
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        self.branches += 1
+        if node.type is None:
+            self._note(node, "bare except: hides real errors")
+        self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            self.string_vars.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        if (self.loop_depth and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name)
+                and node.target.id in self.string_vars):
+            self._note(node, f"string built with += in a loop ({node.target.id}) - collect parts and ''.join()")
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(comparator, ast.Constant) and comparator.value is None:
+                self._note(node, "comparison to None with ==/!= - use 'is'")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        name = getattr(node.func, "id", None) or getattr(node.func, "attr", None)
+        if name in ("sorted", "sort"):
+            self.sorts = True
+        if name in ("eval", "exec"):
+            self._note(node, f"{name}() on input is unsafe")
+        if self.loop_depth and name in ("index", "count", "remove", "insert") and isinstance(node.func, ast.Attribute):
+            self._note(node, f".{name}() inside a loop - hidden O(n) per iteration")
+        if self.function_stack and name == self.function_stack[-1] and isinstance(node.func, ast.Name):
+            self.recursive = True
+        self.generic_visit(node)
+
+    def visit_Global(self, node):
+        self._note(node, "uses global state")
+        self.generic_visit(node)
+
+
+def _analyze_python(code: str) -> Dict:
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return {"parser": "ast", "syntax_error": {"message": e.msg, "line": e.lineno, "column": e.offset}}
+
+    visitor = _PythonVisitor()
+    visitor.visit(tree)
+    return {
+        "parser": "ast",
+        "syntax_error": None,
+        "functions": visitor.functions,
+        "loop_depth": visitor.max_loop_depth,
+        "cyclomatic": visitor.branches + 1,
+        "complexity": _complexity_label(visitor.max_loop_depth, visitor.sorts, visitor.recursive),
+        "findings": visitor.findings[:MAX_FINDINGS]
+    }
+
+
+def _analyze_tree_sitter(code: str, grammar: str) -> Dict:
+    tree = _get_tree_sitter_parser(grammar).parse(code.encode("utf-8"))
+
+    # Iterative walk - deep submissions must not hit the recursion limit
+    error_node = None
+    max_depth = 0
+    branches = 0
+    stack = [(tree.root_node, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if error_node is None and (node.type == "ERROR" or node.is_missing):
+            error_node = node
+        if node.type in TREE_SITTER_LOOP_TYPES:
+            depth += 1
+            max_depth = max(max_depth, depth)
+        if node.type in TREE_SITTER_BRANCH_TYPES:
+            branches += 1
+        stack.extend((child, depth) for child in node.children)
+
+    if error_node is not None:
+        line, column = error_node.start_point
+        message = f"missing {error_node.type}" if error_node.is_missing else "unexpected or incomplete syntax"
+        return {"parser": "tree-sitter", "syntax_error": {"message": message, "line": line + 1, "column": column + 1}}
+    return {
+        "parser": "tree-sitter",
+        "syntax_error": None,
+        "functions": [],
+        "loop_depth": max_depth,
+        "cyclomatic": branches + 1,
+        "complexity": _complexity_label(max_depth, "sort" in code, False),
+        "findings": []
+    }
+
+
+def analyze_code(code: str, language: str) -> Optional[Dict]:
+    """Static analysis of a submission; None when no parser is available for the language"""
+    if len(code) > MAX_CODE_CHARS:
+        return None
+    language = language.lower()
+    if language in ("python", "py", "python3"):
+        try:
+            return _analyze_python(code)
+        except (RecursionError, MemoryError):
+            # Pathologically nested input ("Parser stack overflowed" is a MemoryError) - leave it to the reviewer
+            return None
+    grammar = TREE_SITTER_LANGUAGES.get(language)
+    if grammar and TREE_SITTER_AVAILABLE:
+        try:
+            return _analyze_tree_sitter(code, grammar)
+        except Exception as e:
+            logger.warning("tree_sitter_analysis_failed", extra={"language": language, "error": str(e)})
+    return None
+
+
+def format_findings(analysis: Dict) -> str:
+    """Compact findings summary for the code review prompt"""
+    lines = [f"Static analysis: estimated time complexity {analysis['complexity']}, "
+             f"loop nesting {analysis['loop_depth']}, cyclomatic complexity {analysis['cyclomatic']}."]
+    lines.extend(f"- {finding}" for finding in analysis["findings"])
+    return "\n".join(lines)
+
+
+def syntax_error_review(analysis: Dict, language: str) -> str:
+    """Instant interviewer reply for code that doesn't parse"""
+    error = analysis["syntax_error"]
+    location = f" on line {error['line']}" if error.get("line") else ""
+    return (f"Before we go through the logic - your {language} code doesn't parse yet: "
+            f"{error['message']}{location}. Take a moment to fix that and submit it again, "
+            "and talk me through your approach while you do.")
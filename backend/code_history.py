@@ -0,0 +1,107 @@
+"""
+Code history - stores repeated code submissions as line deltas and renders diffs and change logs
+"""
+import difflib
+from typing import Dict, List, Optional
+
+# Below this similarity to the previous version a submission is stored (and reviewed) in full
+MIN_DELTA_SIMILARITY = 0.5
+DIFF_CONTEXT_LINES = 3
+
+
+def make_delta(previous: str, current: str) -> List[list]:
+    """Line delta turning previous into current: ["=", i1, i2] copies, ["+", i1, i2, lines] replaces"""
+    old_lines = previous.splitlines(keepends=True)
+    new_lines = current.splitlines(keepends=True)
+    delta = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append(["=", i1, i2])
+        else:
+            delta.append(["+", i1, i2, new_lines[j1:j2]])
+    return delta
+
+
+def apply_delta(previous: str, delta: List[list]) -> str:
+    old_lines = previous.splitlines(keepends=True)
+    parts = []
+    for op in delta:
+        if op[0] == "=":
+            parts.extend(old_lines[op[1]:op[2]])
+        else:
+            parts.extend(op[3])
+    return "".join(parts)
+
+
+def similarity(previous: str, current: str) -> float:
+    return difflib.SequenceMatcher(None, previous.splitlines(), current.splitlines(), autojunk=False).ratio()
+
+
+def unified_diff(previous: str, current: str, context: int = DIFF_CONTEXT_LINES) -> str:
+    lines = difflib.unified_diff(
+        previous.splitlines(), current.splitlines(),
+        fromfile="previous", tofile="current", n=context, lineterm=""
+    )
+    return "\n".join(lines)
+
+
+def line_changes(previous: str, current: str) -> str:
+    """'+3/-1 lines' summary of a revision"""
+    added = removed = 0
+    for line in difflib.unified_diff(previous.splitlines(), current.splitlines(), n=0, lineterm=""):
+        if line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return f"+{added}/-{removed} lines"
+
+
+def submission_code(submissions: List[Dict], index: int) -> str:
+    """Full code of submissions[index], replaying deltas from the nearest full copy"""
+    start = index
+    while "code" not in submissions[start]:
+        start = submissions[start]["base"]
+    code = submissions[start]["code"]
+    chain = []
+    cursor = index
+    while cursor != start:
+        chain.append(submissions[cursor]["delta"])
+        cursor = submissions[cursor]["base"]
+    for delta in reversed(chain):
+        code = apply_delta(code, delta)
+    return code
+
+
+def previous_version(submissions: List[Dict], language: str) -> Optional[int]:
+    """Index of the latest earlier submission in the same language"""
+    for index in range(len(submissions) - 1, -1, -1):
+        if submissions[index].get("language") == language:
+            return index
+    return None
+
+
+def final_versions(submissions: List[Dict]) -> Dict[str, str]:
+    """Last submitted code per language"""
+    latest = {}
+    for index, submission in enumerate(submissions):
+        latest[submission.get("language", "unknown")] = index
+    return {language: submission_code(submissions, index) for language, index in latest.items()}
+
+
+def change_log(submissions: List[Dict]) -> List[str]:
+    """One line per submission: full version or revision size, plus test results when known"""
+    entries = []
+    for number, submission in enumerate(submissions, 1):
+        language = submission.get("language", "unknown")
+        if "delta" in submission:
+            entry = f"Submission {number} ({language}): revision of submission {submission['base'] + 1}, {submission.get('changes', 'edited')}"
+        else:
+            entry = f"Submission {number} ({language}): new version, {len(submission.get('code', '').splitlines())} lines"
+        execution = submission.get("execution")
+        if execution:
+            entry += f", tests {execution['passed']}/{execution['total']} passed"
+        analysis = submission.get("analysis")
+        if analysis and analysis.get("syntax_error"):
+            entry += ", syntax error"
+        entries.append(entry)
+    return entries
@@ -0,0 +1,258 @@
+"""
+Code review cache - reuses reviews of equivalent submissions to the same question across sessions
+"""
+import ast
+import builtins
+import hashlib
+import io
+import keyword
+import os
+import re
+import threading
+import tokenize
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from logger import get_logger
+from metrics import CODE_REVIEW_CACHE
+
+logger = get_logger("code_review_cache")
+
+CODE_REVIEW_CACHE_ENABLED = os.getenv("CODE_REVIEW_CACHE_ENABLED", "1") != "0"
+# Reviews held in this worker's memory
+CODE_REVIEW_CACHE_SIZE = int(os.getenv("CODE_REVIEW_CACHE_SIZE", "2048"))
+# Also persist reviews in the code_review_cache table, shared by every worker
+CODE_REVIEW_CACHE_DB = os.getenv("CODE_REVIEW_CACHE_DB", "1") != "0"
+
+PYTHON_LANGUAGES = ("python", "py", "python3")
+PYTHON_RESERVED = set(keyword.kwlist) | set(dir(builtins))
+
+# Keywords of the other editor languages (JavaScript, Java, C/C++, ...), kept verbatim
+GENERIC_RESERVED = PYTHON_RESERVED | {
+    "function", "var", "let", "const", "return", "if", "else", "for", "while", "do", "switch", "case",
+    "break", "continue", "new", "this", "class", "extends", "implements", "interface", "public", "private",
+    "protected", "static", "void", "int", "long", "short", "char", "float", "double", "boolean", "bool",
+    "string", "String", "null", "undefined", "true", "false", "typeof", "instanceof", "throw", "try",
+    "catch", "finally", "import", "export", "default", "struct", "auto", "unsigned", "signed", "include",
+    "namespace", "using", "std", "vector", "map", "set", "length", "size", "push", "pop", "console", "log",
+    "Math", "System", "out", "println", "printf", "cout", "endl", "main", "SELECT", "FROM", "WHERE",
+}
+_GENERIC_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/|#[^\n]*|--[^\n]*", re.DOTALL)
+_GENERIC_TOKEN_RE = re.compile(r"""[A-Za-z_]\w*|\d+(?:\.\d+)?|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`[^`]*`|\S""")
+_PLACEHOLDER_RE = re.compile(r"\{\{(v\d+)\}\}")
+# Words that introduce a declared name in the other editor languages ("let x", "int n", "function f")
+GENERIC_DECLARATIONS = {
+    "function", "var", "let", "const", "class", "struct", "interface", "def", "fn", "func", "val",
+    "int", "long", "short", "char", "float", "double", "boolean", "bool", "string", "String", "auto", "void",
+}
+# Names that can't be ordinary words in review prose (snake_case, camelCase, digits)
+_CODE_LIKE_NAME_RE = re.compile(r".*(_|[a-z][A-Z]|\d)")
+
+
+def _python_local_names(tree: ast.AST) -> Set[str]:
+    """Names the submission binds itself (defs, parameters, assignment/loop/with/except targets), minus imports"""
+    bound, imported = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            bound.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            imported.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+    return bound - imported - PYTHON_RESERVED
+
+
+def _normalize_python(code: str) -> Tuple[str, Dict[str, str]]:
+    local_names = _python_local_names(ast.parse(code))
+    names = {}
+    parts = []
+    previous = None
+    for token in tokenize.generate_tokens(io.StringIO(code).readline):
+        if token.type in (tokenize.COMMENT, tokenize.NL, tokenize.ENCODING, tokenize.ENDMARKER):
+            continue
+        if token.type == tokenize.NEWLINE:
+            text = ";"
+        elif token.type == tokenize.INDENT:
+            text = "{"
+        elif token.type == tokenize.DEDENT:
+            text = "}"
+        elif token.type == tokenize.NAME and token.string in local_names and previous != ".":
+            # Imported and external names stay (floor vs ceil), as do attributes (s.lower() vs s.upper())
+            text = names.setdefault(token.string, f"v{len(names)}")
+        else:
+            text = token.string
+        parts.append(text)
+        previous = token.string
+    return " ".join(parts), names
+
+
+def _generic_local_names(tokens) -> Set[str]:
+    """Names that are declared ("let x", "int n") or assigned ("x = ...") in the submission"""
+    bound = set()
+    for index, text in enumerate(tokens):
+        if not (text[0].isalpha() or text[0] == "_") or text in GENERIC_RESERVED:
+            continue
+        following = tokens[index + 1:index + 3]
+        assigned = following[:1] == ["="] and following[1:] not in (["="], [">"])
+        if assigned or (index and tokens[index - 1] in GENERIC_DECLARATIONS):
+            bound.add(text)
+    return bound
+
+
+def _normalize_generic(code: str) -> Tuple[str, Dict[str, str]]:
+    tokens = _GENERIC_TOKEN_RE.findall(_GENERIC_COMMENT_RE.sub(" ", code))
+    local_names = _generic_local_names(tokens)
+    names = {}
+    parts = []
+    previous = None
+    for text in tokens:
+        if text in local_names and previous != ".":
+            text = names.setdefault(text, f"v{len(names)}")
+        parts.append(text)
+        previous = text
+    return " ".join(parts), names
+
+
+def normalize_code(code: str, language: str) -> Tuple[str, Dict[str, str]]:
+    """Code without comments or layout, with locally bound identifiers renamed in order of appearance.
+
+    Imported, builtin and other external names are kept, so code calling
+    floor() never shares a review with code calling ceil(). Returns the
+    normalized text and the original -> canonical name mapping.
+    """
+    if language.lower() in PYTHON_LANGUAGES:
+        try:
+            return _normalize_python(code)
+        except (tokenize.TokenError, SyntaxError, ValueError, RecursionError):
+            pass
+    return _normalize_generic(code)
+
+
+def _templatize(review: str, names: Dict[str, str]) -> str:
+    """Replace the submitter's identifiers in a review with canonical placeholders"""
+    for original, canonical in sorted(names.items(), key=lambda item: -len(item[0])):
+        placeholder = "{{" + canonical + "}}"
+        if _CODE_LIKE_NAME_RE.match(original):
+            review = re.sub(rf"\b{re.escape(original)}\b", placeholder, review)
+        else:
+            # Plain words ("result", "s") are only rewritten where the review quotes them as code
+            review = review.replace(f"`{original}`", f"`{placeholder}`")
+    return review
+
+
+def _render(template: str, names: Dict[str, str]) -> str:
+    """Fill placeholders with this submitter's identifiers"""
+    originals = {canonical: original for original, canonical in names.items()}
+    return _PLACEHOLDER_RE.sub(lambda match: originals.get(match.group(1), match.group(1)), template)
+
+
+def question_key(problem_id: Optional[str], question: str) -> str:
+    """Catalogue problem id when known; otherwise the question text, lower-cased and collapsed"""
+    if problem_id:
+        return problem_id
+    text = " ".join(question.lower().split())
+    return "q:" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def execution_outcome(execution: Optional[Dict]) -> str:
+    """Pass/fail pattern of a sandbox run, so a review is only reused for code that behaved the same"""
+    if execution is None:
+        return "noexec"
+    if not execution["tests"]:
+        return "error:" + (execution.get("error_type") or execution.get("error") or "")
+    return "tests:" + "".join("1" if test["passed"] else "0" for test in execution["tests"])
+
+
+def _cache_key(normalized: str, language: str, q_key: str, outcome: str) -> str:
+    return hashlib.sha256(f"{language.lower()}\0{q_key}\0{outcome}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class ReviewCache:
+    """Bounded in-memory LRU in front of the (optional) code_review_cache table.
+
+    Reviews are stored with the original submitter's identifiers replaced by
+    placeholders, so a hit reads naturally for code that only differs in names.
+    """
+
+    def __init__(self, max_entries: int = CODE_REVIEW_CACHE_SIZE, use_db: bool = CODE_REVIEW_CACHE_DB):
+        self.max_entries = max(1, max_entries)
+        self.use_db = use_db
+        self.entries: "OrderedDict[str, str]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def lookup(self, code: str, language: str, q_key: str, outcome: str) -> Optional[str]:
+        """Review of an equivalent earlier submission to the same question with the same test outcome, or None"""
+        normalized, names = normalize_code(code, language)
+        template = self.get(_cache_key(normalized, language, q_key, outcome))
+        return None if template is None else _render(template, names)
+
+    def store(self, code: str, language: str, q_key: str, outcome: str, review: str):
+        normalized, names = normalize_code(code, language)
+        self.put(_cache_key(normalized, language, q_key, outcome), language, q_key, _templatize(review, names))
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            review = self.entries.get(key)
+            if review is not None:
+                self.entries.move_to_end(key)
+        if review is None and self.use_db:
+            review = self._db_get(key)
+            if review is not None:
+                self._remember(key, review)
+        CODE_REVIEW_CACHE.labels("hit" if review is not None else "miss").inc()
+        return review
+
+    def put(self, key: str, language: str, q_key: str, review: str):
+        self._remember(key, review)
+        if self.use_db:
+            self._db_put(key, language, q_key, review)
+
+    def _remember(self, key: str, review: str):
+        with self.lock:
+            self.entries[key] = review
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[str]:
+        from db_config import SessionLocal
+        from models import CodeReviewCache
+
+        db = SessionLocal()
+        try:
+            entry = db.query(CodeReviewCache).filter(CodeReviewCache.key == key).first()
+            if entry is None:
+                return None
+            entry.hits = (entry.hits or 0) + 1
+            entry.last_used_at = datetime.utcnow()
+            review = entry.review
+            db.commit()
+            return review
+        except Exception as e:
+            db.rollback()
+            logger.warning("code_review_cache_lookup_failed", extra={"error": str(e)})
+            return None
+        finally:
+            db.close()
+
+    def _db_put(self, key: str, language: str, q_key: str, review: str):
+        from db_config import SessionLocal
+        from models import CodeReviewCache
+
+        db = SessionLocal()
+        try:
+            db.merge(CodeReviewCache(key=key, language=language.lower(), question_key=q_key, review=review))
+            db.commit()
+        except Exception as e:
+            # Another worker stored the same review concurrently, or the DB is unavailable
+            db.rollback()
+            logger.warning("code_review_cache_store_failed", extra={"error": str(e)})
+        finally:
+            db.close()
@@ -0,0 +1,230 @@
+"""
+Code execution sandbox - a warm pool of pre-started, resource-limited processes that run submissions against tests
+
+Off by default. Workers isolate themselves (unprivileged uid, user and network
+namespaces, seccomp filter - see sandbox_runner) and refuse jobs when they
+can't; the pool probes one worker first and stays disabled if it refuses, so
+submissions are never executed unisolated.
+
+Only the first CODE_SANDBOX_VISIBLE_TESTS tests of a problem are examples whose
+inputs, outputs and errors are reported; the rest are hidden and report pass or
+fail and the exception type.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from logger import get_logger
+
+logger = get_logger("code_sandbox")
+
+CODE_SANDBOX_ENABLED = os.getenv("CODE_SANDBOX_ENABLED", "0") == "1"
+# Idle workers kept ready per language
+CODE_SANDBOX_POOL_SIZE = int(os.getenv("CODE_SANDBOX_POOL_SIZE", "2"))
+# Wall-clock limit for one submission (all of its tests)
+CODE_SANDBOX_TIMEOUT_SECONDS = float(os.getenv("CODE_SANDBOX_TIMEOUT_SECONDS", "2"))
+CODE_SANDBOX_MEMORY_BYTES = int(os.getenv("CODE_SANDBOX_MEMORY_MB", "256")) * 1024 * 1024
+# Tests per problem whose details are shown; the rest only report pass/fail
+CODE_SANDBOX_VISIBLE_TESTS = int(os.getenv("CODE_SANDBOX_VISIBLE_TESTS", "2"))
+MAX_CODE_CHARS = 20000
+MAX_RESULT_CHARS = 200000
+PROBE_JOB = {"code": "def probe():\n    return 1\n", "function_names": ["probe"], "tests": [[[], 1]], "compare": None}
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_runner.py")
+
+# Language -> command that starts one idle worker. Python only for now; the
+# runner protocol (one JSON job in, one JSON result out) is language-neutral.
+LANGUAGE_COMMANDS = {
+    "python": [
+        sys.executable, "-I", "-S", RUNNER_PATH,
+        str(int(CODE_SANDBOX_TIMEOUT_SECONDS) + 1), str(CODE_SANDBOX_MEMORY_BYTES)
+    ],
+}
+LANGUAGE_ALIASES = {"py": "python", "python3": "python"}
+
+
+class SandboxPool:
+    """Idle sandbox processes per language; each runs exactly one job, then exits.
+
+    A worker is replaced as soon as it is taken, so the next submission finds a
+    process whose interpreter start-up has already happened and only pays for
+    executing the candidate's code.
+    """
+
+    def __init__(self, pool_size: int = CODE_SANDBOX_POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self.idle: Dict[str, deque] = {language: deque() for language in LANGUAGE_COMMANDS}
+        self.lock = threading.Lock()
+        self.closed = False
+        self.available = True
+
+    def _spawn(self, language: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            LANGUAGE_COMMANDS[language],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd="/" if os.name == "posix" else None,
+            env={"PATH": os.getenv("PATH", ""), "PYTHONHASHSEED": "0"},
+            text=True
+        )
+
+    def fill(self, language: Optional[str] = None):
+        """Top every (or one) language up to pool_size idle workers"""
+        for lang in ([language] if language else list(LANGUAGE_COMMANDS)):
+            while True:
+                with self.lock:
+                    if self.closed or len(self.idle[lang]) >= self.pool_size:
+                        break
+                worker = self._spawn(lang)
+                with self.lock:
+                    if self.closed:
+                        worker.kill()
+                        break
+                    self.idle[lang].append(worker)
+
+    def _take(self, language: str) -> subprocess.Popen:
+        with self.lock:
+            idle = self.idle[language]
+            while idle:
+                worker = idle.popleft()
+                if worker.poll() is None:
+                    break
+            else:
+                worker = None
+        # Replace it off the request path
+        threading.Thread(target=self.fill, args=(language,), daemon=True).start()
+        return worker or self._spawn(language)
+
+    def run(self, language: str, job: Dict) -> Optional[Dict]:
+        """Run one job in a fresh sandbox and return the runner's result (None if it refused the job)"""
+        worker = self._take(language)
+        try:
+            stdout, _ = worker.communicate(json.dumps(job) + "\n", timeout=CODE_SANDBOX_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.communicate()
+            return {"error": f"Timed out after {CODE_SANDBOX_TIMEOUT_SECONDS:g}s", "tests": []}
+        if not stdout.strip():
+            # Killed by an rlimit (CPU, memory) or the code exited the interpreter
+            return {"error": f"Sandbox process exited with code {worker.returncode}", "tests": []}
+        if len(stdout) > MAX_RESULT_CHARS:
+            return {"error": "Sandbox output too large", "tests": []}
+        try:
+            result = json.loads(stdout.strip().splitlines()[-1])
+        except ValueError:
+            return {"error": "Sandbox returned an unreadable result", "tests": []}
+        if result.get("isolated") is not True:
+            self.disable(result.get("error", "worker did not report isolation"))
+            return None
+        return result
+
+    def probe(self) -> bool:
+        """Run a trivial job; disables the pool if the worker can't isolate itself"""
+        result = self.run(next(iter(LANGUAGE_COMMANDS)), PROBE_JOB)
+        if result is not None and not result["tests"]:
+            self.disable(result.get("error", "probe failed"))
+        return self.available
+
+    def disable(self, reason: str):
+        with self.lock:
+            was_available, self.available = self.available, False
+        if was_available:
+            logger.error("code_sandbox_unavailable", extra={"reason": reason})
+        self.shutdown()
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+            workers = [worker for idle in self.idle.values() for worker in idle]
+            for idle in self.idle.values():
+                idle.clear()
+        for worker in workers:
+            worker.kill()
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Get or create the sandbox pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool()
+            _pool.probe()
+    return _pool
+
+
+def shutdown_sandbox_pool():
+    """Kill idle sandbox processes (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _public_result(result: Dict) -> Dict:
+    """Drop everything a hidden test could reveal beyond pass/fail and the exception type"""
+    tests = []
+    for number, test in enumerate(result["tests"]):
+        if number < CODE_SANDBOX_VISIBLE_TESTS:
+            tests.append(test)
+        else:
+            tests.append({"hidden": True, "passed": test["passed"], "error_type": test.get("error_type"), "ms": test["ms"]})
+    result["tests"] = tests
+    return result
+
+
+def run_submission(problem: Optional[Dict], code: str, language: str) -> Optional[Dict]:
+    """Execute a submission against its catalogue problem (see coding_problems.find_problem).
+
+    Returns None when the sandbox is off or unavailable, the language isn't
+    supported or there is no catalogue problem.
+    """
+    language = LANGUAGE_ALIASES.get(language.lower(), language.lower())
+    if problem is None or not CODE_SANDBOX_ENABLED or language not in LANGUAGE_COMMANDS or len(code) > MAX_CODE_CHARS:
+        return None
+    pool = get_sandbox_pool()
+    if not pool.available:
+        return None
+
+    result = pool.run(language, {
+        "code": code,
+        "function_names": problem["function_names"],
+        "tests": problem["tests"],
+        "compare": problem.get("compare")
+    })
+    if result is None:
+        return None
+    result = _public_result(result)
+    result["problem"] = problem["title"]
+    result["passed"] = sum(1 for test in result["tests"] if test["passed"])
+    result["total"] = len(problem["tests"])
+    logger.info("code_executed", extra={
+        "problem": problem["id"], "passed": result["passed"], "total": result["total"],
+        "error": result.get("error"), "ms": result.get("total_ms")
+    })
+    return result
+
+
+def format_execution_report(result: Dict) -> str:
+    """Plain-text test report for the code review prompt"""
+    if result.get("error") and not result["tests"]:
+        return f'Automated tests for "{result["problem"]}" could not run: {result["error"]}'
+    lines = [f'Automated tests for "{result["problem"]}": {result["passed"]}/{result["total"]} passed '
+             f'(function {result.get("function")}, {result.get("total_ms", 0):.1f} ms)']
+    for number, test in enumerate(result["tests"], 1):
+        if test["passed"]:
+            continue
+        if test.get("hidden"):
+            raised = f' (raised {test["error_type"]})' if test.get("error_type") else ""
+            lines.append(f"- FAILED hidden test {number}{raised}")
+        else:
+            outcome = test["error"] or f'got {test["actual"]}'
+            lines.append(f'- FAILED ({test["args"]}): expected {test["expected"]}, {outcome}')
+    return "\n".join(lines)
@@ -0,0 +1,112 @@
+"""
+Coding problem catalogue - test cases for the coding questions the interviewer asks
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Each problem: keyword groups that must all appear in the question (any word of a
+# group), candidate function names, and (args, expected) test cases.
+# "compare": "unordered" accepts any ordering of a list result.
+PROBLEMS: List[Dict] = [
+    {
+        "id": "reverse_string",
+        "title": "Reverse a string",
+        "keywords": [("reverse",), ("string", "word", "text")],
+        "function_names": ["reverse_string", "reverse", "reverseString", "reverse_str", "string_reverse"],
+        "tests": [
+            (["hello"], "olleh"),
+            ([""], ""),
+            (["a"], "a"),
+            (["racecar"], "racecar"),
+            (["Hello, World!"], "!dlroW ,olleH"),
+        ],
+    },
+    {
+        "id": "is_palindrome",
+        "title": "Check for a palindrome",
+        "keywords": [("palindrome",)],
+        "function_names": ["is_palindrome", "isPalindrome", "palindrome", "check_palindrome"],
+        "tests": [
+            (["racecar"], True),
+            (["hello"], False),
+            ([""], True),
+            (["a"], True),
+            (["abba"], True),
+            (["abca"], False),
+        ],
+    },
+    {
+        "id": "find_largest",
+        "title": "Largest number in an array",
+        "keywords": [("largest", "maximum", "max", "biggest"), ("array", "list", "numbers")],
+        "function_names": ["find_largest", "largest", "find_max", "max_number", "findLargest", "get_largest", "largest_number"],
+        "tests": [
+            ([[1, 5, 3]], 5),
+            ([[-7, -2, -9]], -2),
+            ([[42]], 42),
+            ([[3, 3, 3]], 3),
+            ([[0, 100, 99, -100]], 100),
+        ],
+    },
+    {
+        "id": "validate_email",
+        "title": "Validate an email address",
+        "keywords": [("email", "e-mail"), ("valid",)],
+        "function_names": ["validate_email", "is_valid_email", "isValidEmail", "valid_email", "validateEmail", "check_email"],
+        "tests": [
+            (["user@example.com"], True),
+            (["first.last@sub.example.org"], True),
+            (["no-at-sign.com"], False),
+            (["user@"], False),
+            (["@example.com"], False),
+            (["user@@example.com"], False),
+            ([""], False),
+        ],
+    },
+    {
+        "id": "fizzbuzz",
+        "title": "FizzBuzz",
+        "keywords": [("fizzbuzz", "fizz")],
+        "function_names": ["fizzbuzz", "fizz_buzz", "fizzBuzz"],
+        "tests": [
+            ([5], ["1", "2", "Fizz", "4", "Buzz"]),
+            ([15], ["1", "2", "Fizz", "4", "Buzz", "Fizz", "7", "8", "Fizz", "Buzz", "11", "Fizz", "13", "14", "FizzBuzz"]),
+            ([1], ["1"]),
+        ],
+    },
+    {
+        "id": "two_sum",
+        "title": "Two sum",
+        "keywords": [("two sum", "two numbers", "pair"), ("target", "sum", "add up")],
+        "function_names": ["two_sum", "twoSum", "find_pair", "two_sum_indices"],
+        "compare": "unordered",
+        "tests": [
+            ([[2, 7, 11, 15], 9], [0, 1]),
+            ([[3, 2, 4], 6], [1, 2]),
+            ([[3, 3], 6], [0, 1]),
+        ],
+    },
+]
+
+
+def _mentions(text: str, keyword: str) -> bool:
+    """Keyword at the start of a word, so plurals and suffixes still match"""
+    return re.search(r"\b" + re.escape(keyword), text) is not None
+
+
+def match_problem(question: str) -> Optional[Dict]:
+    """Catalogue entry whose keywords all appear in the question, or None"""
+    text = question.lower()
+    for problem in PROBLEMS:
+        if all(any(_mentions(text, keyword) for keyword in group) for group in problem["keywords"]):
+            return problem
+    return None
+
+
+def find_problem(questions: Iterable[str]) -> Optional[Dict]:
+    """First catalogue match among recent interviewer messages, newest first"""
+    for question in questions:
+        problem = match_problem(question)
+        if problem:
+            return problem
+    return None
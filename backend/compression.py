@@ -0,0 +1,281 @@
+"""
+Column compression - zstd with a dictionary trained on our own transcripts and feedback
+
+Compressed values are stored as text, "zstd:<dict id>:" followed by base85, so
+they fit the existing Text/JSON columns without a migration (see the
+CompressedText / CompressedJSON column types in models.py). Values without the
+prefix (rows written before compression, or when zstandard is not installed)
+are returned unchanged.
+
+Dictionaries are kept in the zstd_dictionaries table, so they survive
+redeploys on ephemeral disks, and also as files in ZSTD_DICT_DIR.
+
+Train a dictionary from the current database (from backend/):
+    python compression.py train [--size 65536] [--include-corpus]
+Copy dictionaries trained before they were stored in the database:
+    python compression.py upload
+Rewrite existing rows with the newest dictionary:
+    python compression.py recompress
+"""
+import argparse
+import base64
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from logger import get_logger
+
+logger = get_logger("compression")
+
+# zstandard is optional - without it values are stored uncompressed
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+ZSTD_DICT_DIR = os.getenv("ZSTD_DICT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "zstd_dicts"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "9"))
+# Shorter values aren't worth the prefix and base85 overhead
+ZSTD_MIN_BYTES = int(os.getenv("ZSTD_MIN_BYTES", "96"))
+COMPRESSION_ENABLED = os.getenv("COLUMN_COMPRESSION", "1") != "0"
+
+MARKER = "zstd:"
+DEFAULT_DICT_SIZE = 64 * 1024
+
+_codecs_lock = threading.Lock()
+_codecs: Optional[Tuple[int, Dict[int, "zstandard.ZstdCompressionDict"]]] = None
+
+
+def _db_dictionaries() -> List[bytes]:
+    """Stored dictionaries, oldest first; empty if the table can't be read"""
+    from db_config import SessionLocal
+    from models import ZstdDictionary
+
+    db = SessionLocal()
+    try:
+        return [data for (data,) in db.query(ZstdDictionary.data).order_by(ZstdDictionary.created_at)]
+    except Exception as e:
+        logger.warning("zstd_dictionary_load_failed", extra={"error": str(e)})
+        return []
+    finally:
+        db.close()
+
+
+def _load_dictionaries() -> Tuple[int, Dict[int, "zstandard.ZstdCompressionDict"]]:
+    """(id of the dictionary to write with, every known dictionary by id); id 0 means none"""
+    global _codecs
+    with _codecs_lock:
+        if _codecs is None:
+            dictionaries = {}
+            newest = (0.0, 0)
+            if os.path.isdir(ZSTD_DICT_DIR):
+                for name in os.listdir(ZSTD_DICT_DIR):
+                    if name.endswith(".dict"):
+                        path = os.path.join(ZSTD_DICT_DIR, name)
+                        with open(path, "rb") as f:
+                            dictionary = zstandard.ZstdCompressionDict(f.read())
+                        dictionaries[dictionary.dict_id()] = dictionary
+                        newest = max(newest, (os.path.getmtime(path), dictionary.dict_id()))
+            write_id = newest[1]
+            for data in _db_dictionaries():
+                dictionary = zstandard.ZstdCompressionDict(data)
+                dictionaries[dictionary.dict_id()] = dictionary
+                # The database is shared by every worker, so its newest dictionary wins over local files
+                write_id = dictionary.dict_id()
+            # Older dictionaries stay loaded for reading old rows
+            _codecs = (write_id, dictionaries)
+        return _codecs
+
+
+def reload_dictionaries():
+    """Pick up newly trained dictionaries"""
+    global _codecs
+    with _codecs_lock:
+        _codecs = None
+
+
+# zstd contexts are not thread-safe; keep one per thread
+_local = threading.local()
+
+
+def _compressor(dict_id: int, dictionary) -> "zstandard.ZstdCompressor":
+    compressors = getattr(_local, "compressors", None)
+    if compressors is None:
+        compressors = _local.compressors = {}
+    if dict_id not in compressors:
+        compressors[dict_id] = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary)
+    return compressors[dict_id]
+
+
+def _decompressor(dict_id: int, dictionary) -> "zstandard.ZstdDecompressor":
+    decompressors = getattr(_local, "decompressors", None)
+    if decompressors is None:
+        decompressors = _local.decompressors = {}
+    if dict_id not in decompressors:
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+    return decompressors[dict_id]
+
+
+def compress_text(text: str) -> str:
+    """Compressed, prefixed form of text, or text itself when compression doesn't pay off"""
+    raw = text.encode("utf-8")
+    if not COMPRESSION_ENABLED or not ZSTD_AVAILABLE or len(raw) < ZSTD_MIN_BYTES:
+        return text
+    dict_id, dictionaries = _load_dictionaries()
+    compressed = _compressor(dict_id, dictionaries.get(dict_id)).compress(raw)
+    encoded = f"{MARKER}{dict_id}:{base64.b85encode(compressed).decode('ascii')}"
+    return encoded if len(encoded) < len(text) else text
+
+
+def is_compressed(value) -> bool:
+    return isinstance(value, str) and value.startswith(MARKER)
+
+
+def decompress_text(value: str) -> str:
+    if not is_compressed(value):
+        return value
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstandard is required to read compressed columns (pip install zstandard)")
+    dict_id_text, payload = value[len(MARKER):].split(":", 1)
+    dict_id = int(dict_id_text)
+    dictionaries = _load_dictionaries()[1]
+    if dict_id and dict_id not in dictionaries:
+        # Trained since this worker loaded its dictionaries
+        reload_dictionaries()
+        dictionaries = _load_dictionaries()[1]
+    if dict_id and dict_id not in dictionaries:
+        raise RuntimeError(f"zstd dictionary {dict_id} not found in zstd_dictionaries or {ZSTD_DICT_DIR}")
+    data = _decompressor(dict_id, dictionaries.get(dict_id)).decompress(base64.b85decode(payload))
+    return data.decode("utf-8")
+
+
+def _database_samples(limit: int) -> List[bytes]:
+    from db_config import SessionLocal
+    from models import Interview, SessionSnapshot
+
+    samples = []
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Interview.detailed_feedback, Interview.detailed_analysis, Interview.video_analysis
+        ).order_by(Interview.id.desc()).limit(limit)
+        for detailed_feedback, detailed_analysis, video_analysis in query:
+            samples.extend(text.encode("utf-8") for text in (detailed_feedback, detailed_analysis) if text)
+            if video_analysis:
+                samples.append(json.dumps(video_analysis, default=str).encode("utf-8"))
+        snapshots = db.query(SessionSnapshot.conversation_history, SessionSnapshot.frame_analyses).limit(limit)
+        for conversation_history, frame_analyses in snapshots:
+            for document in (conversation_history, frame_analyses):
+                if document:
+                    samples.append(json.dumps(document, default=str).encode("utf-8"))
+    finally:
+        db.close()
+    return samples
+
+
+def _corpus_samples() -> List[bytes]:
+    """Recorded LLM feedback outputs shipped with the benchmarks"""
+    corpus_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "corpus", "feedback")
+    samples = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(".txt"):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                samples.append(f.read())
+    return samples
+
+
+def train_dictionary(samples: List[bytes], size: int = DEFAULT_DICT_SIZE) -> "zstandard.ZstdCompressionDict":
+    return zstandard.train_dictionary(size, samples, level=ZSTD_LEVEL)
+
+
+def save_dictionary(dictionary, directory: Optional[str] = ZSTD_DICT_DIR) -> Optional[str]:
+    """Store a dictionary in the database (and as a file in directory, if given); returns the file path"""
+    from db_config import SessionLocal
+    from models import ZstdDictionary
+
+    db = SessionLocal()
+    try:
+        if db.get(ZstdDictionary, dictionary.dict_id()) is None:
+            db.add(ZstdDictionary(dict_id=dictionary.dict_id(), data=dictionary.as_bytes()))
+            db.commit()
+    finally:
+        db.close()
+
+    path = None
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{dictionary.dict_id()}.dict")
+        with open(path, "wb") as f:
+            f.write(dictionary.as_bytes())
+    reload_dictionaries()
+    return path
+
+
+def upload_dictionaries(directory: str = ZSTD_DICT_DIR) -> int:
+    """Store every .dict file in directory in the database, oldest first; returns how many"""
+    paths = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".dict")),
+        key=os.path.getmtime
+    ) if os.path.isdir(directory) else []
+    for path in paths:
+        with open(path, "rb") as f:
+            save_dictionary(zstandard.ZstdCompressionDict(f.read()), directory=None)
+    return len(paths)
+
+
+def recompress_rows(batch_size: int = 200) -> int:
+    """Rewrite compressible columns of every stored interview with the current dictionary"""
+    from sqlalchemy.orm.attributes import flag_modified
+    from db_config import SessionLocal
+    from models import Interview
+
+    rewritten = 0
+    db = SessionLocal()
+    try:
+        ids = [interview_id for (interview_id,) in db.query(Interview.id).order_by(Interview.id)]
+        for start in range(0, len(ids), batch_size):
+            batch = db.query(Interview).filter(Interview.id.in_(ids[start:start + batch_size])).all()
+            for interview in batch:
+                for column in ("detailed_feedback", "detailed_analysis", "video_analysis"):
+                    flag_modified(interview, column)
+            db.commit()
+            db.expunge_all()
+            rewritten += len(batch)
+    finally:
+        db.close()
+    return rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="train a dictionary from stored transcripts and feedback")
+    train.add_argument("--size", type=int, default=DEFAULT_DICT_SIZE, help="dictionary size in bytes")
+    train.add_argument("--limit", type=int, default=5000, help="most recent interviews to sample")
+    train.add_argument("--include-corpus", action="store_true", help="also sample benchmarks/corpus/feedback")
+    commands.add_parser("upload", help=f"store the .dict files in {ZSTD_DICT_DIR} in the database")
+    commands.add_parser("recompress", help="rewrite stored interviews with the newest dictionary")
+    args = parser.parse_args()
+
+    if not ZSTD_AVAILABLE:
+        parser.exit(1, "zstandard is not installed (pip install zstandard)\n")
+
+    if args.command == "train":
+        samples = _database_samples(args.limit)
+        if args.include_corpus:
+            samples.extend(_corpus_samples())
+        if len(samples) < 8:
+            parser.exit(1, f"Only {len(samples)} samples found - complete a few interviews first\n")
+        dictionary = train_dictionary(samples, args.size)
+        path = save_dictionary(dictionary)
+        print(f"[OK] Trained dictionary {dictionary.dict_id()} from {len(samples)} samples -> zstd_dictionaries, {path}")
+    elif args.command == "upload":
+        print(f"[OK] Stored {upload_dictionaries()} dictionaries from {ZSTD_DICT_DIR} in the database")
+    else:
+        print(f"[OK] Recompressed {recompress_rows()} interviews with dictionary {_load_dictionaries()[0]}")
+
+
+if __name__ == "__main__":
+    main()
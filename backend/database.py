@@ -1,19 +1,46 @@
 """
-Simple file-based database for user management and interview history
-For production, replace with PostgreSQL/MySQL
+Simple embedded database for user management and interview history (local/offline mode)
+Backed by SQLite with an index per email; for production use the SQLAlchemy models
 """
 import json
 import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 import hashlib
 
 DATA_DIR = "data"
+DB_FILE = os.path.join(DATA_DIR, "local.db")
+
+# Legacy JSON files, imported with migrate_json_db.py
 USERS_FILE = os.path.join(DATA_DIR, "users.json")
 INTERVIEWS_FILE = os.path.join(DATA_DIR, "interviews.json")
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    name TEXT,
+    phone TEXT,
+    created_at TEXT NOT NULL,
+    interview_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id TEXT UNIQUE,
+    user_email TEXT NOT NULL,
+    session_data TEXT,
+    feedback TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interviews_user_created ON interviews (user_email, created_at DESC);
+"""
+
+USER_COLUMNS = "user_id, email, name, phone, created_at, interview_count"
 
 def load_json(filepath: str) -> Dict:
     """Load JSON file or return empty dict"""
@@ -22,108 +49,200 @@ def load_json(filepath: str) -> Dict:
             return json.load(f)
     return {}
 
-def save_json(filepath: str, data: Dict):
-    """Save data to JSON file"""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-
 def hash_password(password: str) -> str:
     """Simple password hashing (use bcrypt in production)"""
     return hashlib.sha256(password.encode()).hexdigest()
 
+def _user_row_to_dict(row: sqlite3.Row) -> Dict:
+    return {key: row[key] for key in row.keys()}
+
+def _interview_row_to_dict(row: sqlite3.Row) -> Dict:
+    return {
+        "interview_id": row["interview_id"],
+        "user_email": row["user_email"],
+        "session_data": json.loads(row["session_data"]) if row["session_data"] else {},
+        "feedback": json.loads(row["feedback"]) if row["feedback"] else {},
+        "created_at": row["created_at"]
+    }
+
 class Database:
-    def __init__(self):
-        self.users = load_json(USERS_FILE)
-        self.interviews = load_json(INTERVIEWS_FILE)
-    
-    def save(self):
-        """Save all data to files"""
-        save_json(USERS_FILE, self.users)
-        save_json(INTERVIEWS_FILE, self.interviews)
-    
+    def __init__(self, db_file: str = DB_FILE):
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # One connection shared by request threads; sqlite3 needs calls serialized
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT/ROLLBACK; every write is atomic"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
     # User operations
     def create_user(self, email: str, password: str, name: str, phone: str = "") -> Dict:
         """Create a new user"""
-        if email in self.users:
-            raise ValueError("User already exists")
-        
-        user_id = f"user_{len(self.users) + 1}"
-        self.users[email] = {
-            "user_id": user_id,
-            "email": email,
-            "password": hash_password(password),
-            "name": name,
-            "phone": phone,
-            "created_at": datetime.now().isoformat(),
-            "interview_count": 0
-        }
-        self.save()
-        return {k: v for k, v in self.users[email].items() if k != 'password'}
-    
+        with self._transaction() as conn:
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO users (email, password, name, phone, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (email, hash_password(password), name, phone, datetime.now().isoformat())
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("User already exists")
+            # Ids come from the row id, so concurrent creates can't collide
+            conn.execute("UPDATE users SET user_id = ? WHERE id = ?", (f"user_{cursor.lastrowid}", cursor.lastrowid))
+        return self.get_user(email)
+
     def authenticate_user(self, email: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user data"""
-        if email not in self.users:
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT password, {USER_COLUMNS} FROM users WHERE email = ?", (email,)
+            ).fetchone()
+        if row is None or row["password"] != hash_password(password):
             return None
-        
-        user = self.users[email]
-        if user['password'] == hash_password(password):
-            return {k: v for k, v in user.items() if k != 'password'}
-        return None
-    
+        user = _user_row_to_dict(row)
+        user.pop("password")
+        return user
+
     def get_user(self, email: str) -> Optional[Dict]:
         """Get user by email"""
-        if email in self.users:
-            return {k: v for k, v in self.users[email].items() if k != 'password'}
-        return None
-    
+        with self._lock:
+            row = self.conn.execute(f"SELECT {USER_COLUMNS} FROM users WHERE email = ?", (email,)).fetchone()
+        return _user_row_to_dict(row) if row else None
+
     def update_user(self, email: str, updates: Dict) -> Dict:
         """Update user profile"""
-        if email not in self.users:
-            raise ValueError("User not found")
-        
         # Don't allow updating email or password through this method
         allowed_fields = ['name', 'phone']
-        for field in allowed_fields:
-            if field in updates:
-                self.users[email][field] = updates[field]
-        
-        self.save()
-        return {k: v for k, v in self.users[email].items() if k != 'password'}
-    
+        fields = [field for field in allowed_fields if field in updates]
+
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone() is None:
+                raise ValueError("User not found")
+            if fields:
+                assignments = ", ".join(f"{field} = ?" for field in fields)
+                conn.execute(
+                    f"UPDATE users SET {assignments} WHERE email = ?",
+                    [updates[field] for field in fields] + [email]
+                )
+        return self.get_user(email)
+
     # Interview operations
     def save_interview(self, user_email: str, session_data: Dict, feedback: Dict) -> str:
         """Save interview and feedback"""
-        interview_id = f"interview_{len(self.interviews) + 1}"
-        
-        self.interviews[interview_id] = {
-            "interview_id": interview_id,
-            "user_email": user_email,
-            "session_data": session_data,
-            "feedback": feedback,
-            "created_at": datetime.now().isoformat()
-        }
-        
-        # Update user interview count
-        if user_email in self.users:
-            self.users[user_email]['interview_count'] = self.users[user_email].get('interview_count', 0) + 1
-        
-        self.save()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO interviews (user_email, session_data, feedback, created_at) VALUES (?, ?, ?, ?)",
+                (user_email, json.dumps(session_data), json.dumps(feedback), datetime.now().isoformat())
+            )
+            interview_id = f"interview_{cursor.lastrowid}"
+            conn.execute("UPDATE interviews SET interview_id = ? WHERE id = ?", (interview_id, cursor.lastrowid))
+
+            # Update user interview count
+            conn.execute("UPDATE users SET interview_count = interview_count + 1 WHERE email = ?", (user_email,))
         return interview_id
-    
+
     def get_user_interviews(self, user_email: str) -> List[Dict]:
-        """Get all interviews for a user"""
-        user_interviews = []
-        for interview_id, interview in self.interviews.items():
-            if interview['user_email'] == user_email:
-                user_interviews.append(interview)
-        
-        # Sort by date, newest first
-        user_interviews.sort(key=lambda x: x['created_at'], reverse=True)
-        return user_interviews
-    
+        """Get all interviews for a user, newest first (served from the email index)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM interviews WHERE user_email = ? ORDER BY created_at DESC", (user_email,)
+            ).fetchall()
+        return [_interview_row_to_dict(row) for row in rows]
+
     def get_interview(self, interview_id: str) -> Optional[Dict]:
         """Get specific interview by ID"""
-        return self.interviews.get(interview_id)
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM interviews WHERE interview_id = ?", (interview_id,)).fetchone()
+        return _interview_row_to_dict(row) if row else None
+
+    # Migration
+    def import_json(self, users: Dict, interviews: Dict) -> Dict:
+        """Import the legacy users.json/interviews.json layout, keeping existing ids where possible"""
+        imported = {"users": 0, "interviews": 0, "skipped": 0}
+        with self._transaction() as conn:
+            for email, user in users.items():
+                if conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone():
+                    imported["skipped"] += 1
+                    continue
+                row_id = self._free_legacy_id(conn, "users", user.get("user_id"), "user_")
+                cursor = conn.execute(
+                    "INSERT INTO users (id, email, password, name, phone, created_at, interview_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        row_id, email, user.get("password", ""), user.get("name", ""),
+                        user.get("phone", ""), user.get("created_at") or datetime.now().isoformat(),
+                        user.get("interview_count", 0)
+                    )
+                )
+                conn.execute("UPDATE users SET user_id = ? WHERE id = ?", (f"user_{cursor.lastrowid}", cursor.lastrowid))
+                imported["users"] += 1
+
+            for key, interview in interviews.items():
+                legacy_id = interview.get("interview_id", key)
+                already_imported = conn.execute(
+                    "SELECT 1 FROM interviews WHERE user_email = ? AND created_at = ?",
+                    (interview["user_email"], interview.get("created_at"))
+                ).fetchone()
+                if already_imported:
+                    imported["skipped"] += 1
+                    continue
+                row_id = self._free_legacy_id(conn, "interviews", legacy_id, "interview_")
+                cursor = conn.execute(
+                    "INSERT INTO interviews (id, user_email, session_data, feedback, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        row_id, interview["user_email"],
+                        json.dumps(interview.get("session_data", {})), json.dumps(interview.get("feedback", {})),
+                        interview.get("created_at") or datetime.now().isoformat()
+                    )
+                )
+                conn.execute("UPDATE interviews SET interview_id = ? WHERE id = ?", (f"interview_{cursor.lastrowid}", cursor.lastrowid))
+                imported["interviews"] += 1
+        return imported
+
+    @staticmethod
+    def _free_legacy_id(conn: sqlite3.Connection, table: str, legacy_id: Optional[str], prefix: str) -> Optional[int]:
+        """Row id to reuse for a legacy 'user_N'/'interview_N' id, or None to allocate a new one.
+
+        Legacy ids were len()+1 and could repeat; repeats get a fresh id.
+        """
+        if not legacy_id or not legacy_id.startswith(prefix) or not legacy_id[len(prefix):].isdigit():
+            return None
+        row_id = int(legacy_id[len(prefix):])
+        if conn.execute(f"SELECT 1 FROM {table} WHERE id = ?", (row_id,)).fetchone():
+            return None
+        return row_id
+
+# Shared instance on DB_FILE, opened on first use so importing this module
+# (e.g. migrate_json_db.py --db other.sqlite) does not create the default file
+_db = None
+_db_lock = threading.Lock()
+
+def get_database() -> Database:
+    """Get or create the shared Database on DB_FILE"""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = Database()
+    return _db
 
-# Global database instance
-db = Database()
+def __getattr__(name: str):
+    # Keeps `from database import db` working, lazily
+    if name == "db":
+        return get_database()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
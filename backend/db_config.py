@@ -4,6 +4,7 @@ Database configuration and session management
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from models import Base
+from metrics import instrument_engine, track_db_session
 import os
 
 # Database URL - using SQLite for simplicity (change to PostgreSQL for production)
@@ -15,6 +16,8 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
 
+instrument_engine(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -25,8 +28,9 @@ def init_db():
 
 def get_db():
     """Dependency for getting database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    with track_db_session():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
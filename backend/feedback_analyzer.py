@@ -1,17 +1,26 @@
 """
 Feedback Analyzer - Analyzes interview performance and provides detailed feedback
 """
+import importlib.util
 import os
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
 from datetime import datetime
 import json
+import math
 
-# OpenAI is optional - only used as fallback
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from code_history import change_log, final_versions
+from interview_agent import configure_gemini, get_groq_client
+from local_llm import local_llm
+from logger import get_logger
+from metrics import track_llm_call
+
+logger = get_logger("feedback_analyzer")
+
+# OpenAI is optional - only used as fallback, and only imported when first used
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 # Lazy initialization of OpenAI client
 _feedback_client = None
@@ -26,13 +35,95 @@ def get_openai_client():
         if not api_key:
             return None  # Return None instead of raising error
         try:
+            from openai import OpenAI
             _feedback_client = OpenAI(api_key=api_key)
         except Exception as e:
-            print(f"Warning: Could not initialize OpenAI client: {e}")
+            logger.warning("openai_client_init_failed", extra={"error": str(e)})
             return None
     return _feedback_client
 
 
+# How long /end waits for the last turn scores before aggregating
+TURN_SCORE_WAIT_SECONDS = 8.0
+MAX_NARRATIVE_NOTES = 15
+
+SCORE_FIELDS = ("overall_score", "communication_score", "technical_score", "preparation_score")
+LIST_FIELDS = ("strengths", "areas_for_improvement", "recommendations")
+
+FEEDBACK_JSON_SCHEMA = json.dumps({
+    "overall_score": "integer 1-10",
+    "strengths": ["string"],
+    "areas_for_improvement": ["string"],
+    "communication_score": "integer 1-10",
+    "technical_score": "integer 1-10",
+    "preparation_score": "integer 1-10",
+    "detailed_analysis": "string (2-3 paragraphs)",
+    "recommendations": ["string"]
+}, indent=2)
+
+# Compiled once for the legacy text fallback parser
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_SCORE_LINE_RE = re.compile(
+    r"^[#*\s]*(OVERALL|COMMUNICATION|TECHNICAL|PREPARATION)\s+SCORE[*\s]*:[*\[\s]*(\d+(?:\.\d+)?)",
+    re.IGNORECASE
+)
+_SECTION_LINE_RE = re.compile(
+    r"^[#*\s]*(STRENGTHS|AREAS\s+FOR\s+IMPROVEMENT|IMPROVEMENTS?|DETAILED\s+ANALYSIS|RECOMMENDATIONS)[*\s]*(?::[*\s]*(.*))?$",
+    re.IGNORECASE
+)
+_BULLET_LINE_RE = re.compile(r"^(?:[-*\u2022]|\d+[.)])\s*(.+)$")
+
+_SECTION_KEYS = {
+    "STRENGTHS": "strengths",
+    "DETAILED ANALYSIS": "detailed_analysis",
+    "RECOMMENDATIONS": "recommendations",
+}
+
+
+class NarrativeFeedback(BaseModel):
+    """Written part of the feedback (used on its own when scores were precomputed)"""
+    strengths: List[str] = []
+    areas_for_improvement: List[str] = []
+    detailed_analysis: str = ""
+    recommendations: List[str] = []
+    
+    @field_validator("strengths", "areas_for_improvement", "recommendations", mode="before")
+    @classmethod
+    def _drop_empty_items(cls, value):
+        if isinstance(value, list):
+            return [str(item).strip() for item in value if str(item).strip()]
+        return value
+
+
+class StructuredFeedback(NarrativeFeedback):
+    """Schema the feedback LLM is asked to return (validated once per interview)"""
+    overall_score: int = Field(ge=1, le=10)
+    communication_score: int = Field(ge=1, le=10)
+    technical_score: int = Field(ge=1, le=10)
+    preparation_score: int = Field(ge=1, le=10)
+    
+    @field_validator("overall_score", "communication_score", "technical_score", "preparation_score", mode="before")
+    @classmethod
+    def _clamp_score(cls, value):
+        """Accept '8', 8.5 or '8/10' and clamp to 1-10.
+
+        Anything else (null, bools, lists, objects, NaN) raises ValueError, which
+        pydantic reports as a ValidationError - a TypeError would escape it.
+        """
+        if isinstance(value, str):
+            match = _NUMBER_RE.search(value)
+            if not match:
+                raise ValueError(f"No score in {value!r}")
+            value = match.group(0)
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Score must be a number, got {type(value).__name__}")
+        number = float(value)
+        if not math.isfinite(number):
+            raise ValueError(f"Score must be finite, got {value!r}")
+        return max(1, min(10, int(round(number))))
+
+
 class FeedbackAnalyzer:
     def __init__(self, interview_agent=None, video_analyzer=None):
         self.interview_agent = interview_agent
@@ -52,65 +143,18 @@ class FeedbackAnalyzer:
         # Extract conversation context
         role = session.get("role", "unknown")
         
-        # Include code submissions in feedback context
-        code_submissions_text = ""
-        if hasattr(self.interview_agent, 'code_submissions') and session_id in self.interview_agent.code_submissions:
-            code_subs = self.interview_agent.code_submissions[session_id]
-            if code_subs:
-                code_submissions_text = f"\n\nCode Submissions ({len(code_subs)} total):\n"
-                for i, sub in enumerate(code_subs, 1):
-                    code_submissions_text += f"\nSubmission {i} ({sub.get('language', 'unknown')}):\n{sub.get('code', '')}\n"
+        # Per-turn scores computed during the interview (see AnswerScorer)
+        turn_summary = None
+        answer_scorer = getattr(self.interview_agent, "answer_scorer", None)
+        if answer_scorer:
+            answer_scorer.wait_for_session(session_id, timeout=TURN_SCORE_WAIT_SECONDS)
+            turn_summary = answer_scorer.aggregate(session_id)
         
-        full_conversation = "\n\n".join([
-            f"{'Interviewer' if msg['role'] == 'assistant' else 'Candidate'}: {msg['content']}"
-            for msg in conversation_history
-        ]) + code_submissions_text
-        
-        # Analyze using LLM (try Groq first, then Gemini)
-        feedback_prompt = self._build_feedback_prompt(full_conversation, role)
-        
-        try:
-            # Try Groq first
-            from groq import Groq
-            groq_api_key = os.getenv("GROQ_API_KEY", "")
-            if groq_api_key:
-                try:
-                    groq_client = Groq(api_key=groq_api_key)
-                    response = groq_client.chat.completions.create(
-                        model="llama-3.3-70b-versatile",
-                        messages=[
-                            {"role": "system", "content": "You are an expert interview coach providing constructive feedback on interview performance."},
-                            {"role": "user", "content": feedback_prompt}
-                        ],
-                        temperature=0.7,
-                        max_tokens=800
-                    )
-                    feedback_text = response.choices[0].message.content.strip()
-                    print("[INFO] Feedback generated using Groq")
-                except Exception as groq_error:
-                    print(f"[WARNING] Groq feedback failed: {groq_error}")
-                    # Try Gemini as fallback
-                    gemini_api_key = os.getenv("GEMINI_API_KEY", "")
-                    if gemini_api_key:
-                        import google.generativeai as genai
-                        genai.configure(api_key=gemini_api_key)
-                        model = genai.GenerativeModel('gemini-pro')
-                        
-                        prompt = f"You are an expert interview coach providing constructive feedback on interview performance.\n\n{feedback_prompt}"
-                        response = model.generate_content(prompt)
-                        feedback_text = response.text.strip()
-                        print("[INFO] Feedback generated using Gemini")
-                    else:
-                        raise groq_error
-            else:
-                raise ValueError("No API key configured for feedback generation")
-                
-        except Exception as e:
-            print(f"[ERROR] Error generating feedback: {e}")
-            feedback_text = self._generate_fallback_feedback(conversation_history)
-        
-        # Parse structured feedback
-        structured_feedback = self._parse_feedback(feedback_text, conversation_history)
+        if turn_summary:
+            structured_feedback = self._aggregate_feedback(session_id, role, turn_summary, conversation_history)
+            feedback_text = self._render_feedback_text(structured_feedback)
+        else:
+            structured_feedback, feedback_text = self._full_transcript_feedback(session_id, role, conversation_history)
         
         # Add video analysis if available
         video_analysis_summary = None
@@ -129,7 +173,7 @@ class FeedbackAnalyzer:
                     elif video_analysis_summary.get("average_confidence") == "high":
                         structured_feedback["strengths"].append("Displayed confidence through body language")
             except Exception as e:
-                print(f"Error getting video analysis: {e}")
+                logger.warning("video_summary_failed", extra={"session_id": session_id, "error": str(e)})
         
         # Ensure arrays are populated from fallback if empty
         if not structured_feedback.get("strengths"):
@@ -154,6 +198,148 @@ class FeedbackAnalyzer:
             "video_analysis": video_analysis_summary
         }
     
+    def _aggregate_feedback(self, session_id: str, role: str, turn_summary: Dict, history: List[Dict]) -> Dict:
+        """Combine precomputed turn scores with a short LLM narrative"""
+        code_count = len(getattr(self.interview_agent, "code_submissions", {}).get(session_id, []))
+        narrative_prompt = self._build_narrative_prompt(role, turn_summary, code_count)
+        
+        narrative = None
+        try:
+            narrative_text = self._generate_feedback_text(narrative_prompt, max_tokens=500)
+            match = _JSON_OBJECT_RE.search(narrative_text)
+            if match:
+                narrative = NarrativeFeedback.model_validate_json(match.group(0)).model_dump()
+        except ValidationError as e:
+            logger.warning("feedback_narrative_invalid", extra={"session_id": session_id, "errors": e.error_count()})
+        except Exception as e:
+            logger.warning("feedback_narrative_failed", extra={"session_id": session_id, "error": str(e)})
+        
+        if narrative is None:
+            narrative = self._parse_text_feedback(self._generate_fallback_feedback(history))
+        
+        return {
+            "overall_score": turn_summary["overall_score"],
+            "communication_score": turn_summary["communication_score"],
+            "technical_score": turn_summary["technical_score"],
+            "preparation_score": turn_summary["preparation_score"],
+            "strengths": narrative["strengths"],
+            "areas_for_improvement": narrative["areas_for_improvement"],
+            "detailed_analysis": narrative["detailed_analysis"],
+            "recommendations": narrative["recommendations"]
+        }
+    
+    def _full_transcript_feedback(self, session_id: str, role: str, conversation_history: List[Dict]):
+        """Evaluate the whole transcript in one call (used when no turn scores exist)"""
+        # Include code in feedback context: the final version per language plus a change log
+        code_submissions_text = ""
+        if hasattr(self.interview_agent, 'code_submissions') and session_id in self.interview_agent.code_submissions:
+            code_subs = self.interview_agent.code_submissions[session_id]
+            if code_subs:
+                code_submissions_text = f"\n\nCode Submissions ({len(code_subs)} total):\n"
+                code_submissions_text += "\n".join(f"- {entry}" for entry in change_log(code_subs)) + "\n"
+                for language, final_code in final_versions(code_subs).items():
+                    code_submissions_text += f"\nFinal version ({language}):\n{final_code}\n"
+        
+        full_conversation = "\n\n".join([
+            f"{'Interviewer' if msg['role'] == 'assistant' else 'Candidate'}: {msg['content']}"
+            for msg in conversation_history
+        ]) + code_submissions_text
+        
+        feedback_prompt = self._build_feedback_prompt(full_conversation, role)
+        try:
+            feedback_text = self._generate_feedback_text(feedback_prompt, max_tokens=800)
+        except Exception as e:
+            logger.warning("feedback_generation_failed", extra={"session_id": session_id, "error": str(e)})
+            feedback_text = self._generate_fallback_feedback(conversation_history)
+        
+        structured_feedback = self._parse_feedback(feedback_text, conversation_history)
+        if structured_feedback.pop("format") == "json":
+            # Keep stored/displayed feedback human-readable when the LLM answered in JSON
+            feedback_text = self._render_feedback_text(structured_feedback)
+        return structured_feedback, feedback_text
+    
+    def _generate_feedback_text(self, feedback_prompt: str, max_tokens: int) -> str:
+        """Call the feedback LLM in JSON mode (Groq, then Gemini, then the local model)"""
+        try:
+            return self._generate_cloud_feedback_text(feedback_prompt, max_tokens)
+        except Exception as cloud_error:
+            local_text = local_llm.chat([
+                {"role": "system", "content": "You are an expert interview coach providing constructive feedback on interview performance."},
+                {"role": "user", "content": feedback_prompt}
+            ], temperature=0.7, max_tokens=max_tokens, json_mode=True)
+            if not local_text:
+                raise cloud_error
+            logger.info("feedback_generated", extra={"provider": "local", "model": local_llm.model_name})
+            return local_text
+    
+    def _generate_cloud_feedback_text(self, feedback_prompt: str, max_tokens: int) -> str:
+        """Call the cloud feedback LLM in JSON mode (tries Groq first, then Gemini)"""
+        groq_api_key = os.getenv("GROQ_API_KEY", "")
+        if not groq_api_key:
+            raise ValueError("No API key configured for feedback generation")
+        
+        try:
+            # Shared with the interview agent, so its connection pool is already warm
+            groq_client = get_groq_client()
+            with track_llm_call("groq", "llama-3.3-70b-versatile") as call:
+                response = groq_client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[
+                        {"role": "system", "content": "You are an expert interview coach providing constructive feedback on interview performance."},
+                        {"role": "user", "content": feedback_prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"}
+                )
+                usage = getattr(response, "usage", None)
+                if usage:
+                    call.record_usage(usage.prompt_tokens, usage.completion_tokens)
+            logger.info("feedback_generated", extra={"provider": "groq"})
+            return response.choices[0].message.content.strip()
+        except Exception as groq_error:
+            logger.warning("feedback_provider_failed", extra={"provider": "groq", "error": str(groq_error)})
+            # Try Gemini as fallback
+            gemini_api_key = os.getenv("GEMINI_API_KEY", "")
+            if not gemini_api_key:
+                raise groq_error
+            genai = configure_gemini(gemini_api_key)
+            model = genai.GenerativeModel('gemini-pro')
+            
+            prompt = f"You are an expert interview coach providing constructive feedback on interview performance.\n\n{feedback_prompt}"
+            with track_llm_call("gemini", "gemini-pro") as call:
+                response = model.generate_content(
+                    prompt,
+                    generation_config={"response_mime_type": "application/json"}
+                )
+                usage = getattr(response, "usage_metadata", None)
+                if usage:
+                    call.record_usage(usage.prompt_token_count, usage.candidates_token_count)
+            logger.info("feedback_generated", extra={"provider": "gemini"})
+            return response.text.strip()
+    
+    def _build_narrative_prompt(self, role: str, turn_summary: Dict, code_count: int) -> str:
+        """Build a short, length-independent prompt from per-turn notes"""
+        notes = turn_summary["notes"][-MAX_NARRATIVE_NOTES:]
+        notes_text = "\n".join(f"- {note}" for note in notes) or "- (no notes recorded)"
+        return f"""You are writing the final feedback for a mock interview for a {role} position.
+The candidate's answers were already graded one by one. Do NOT re-score them.
+
+Scores (1-10) across {turn_summary["turn_count"]} graded responses:
+- Communication: {turn_summary["communication_score"]}
+- Technical: {turn_summary["technical_score"]}
+- Preparation: {turn_summary["preparation_score"]}
+Code submissions: {code_count}
+
+Observations recorded after each answer:
+{notes_text}
+
+Respond with ONLY a JSON object:
+{{"strengths": ["3-4 specific strengths, referencing the observations"],
+ "areas_for_improvement": ["3-4 specific weaknesses"],
+ "detailed_analysis": "1-2 short paragraphs consistent with the scores",
+ "recommendations": ["3-4 concrete, actionable recommendations"]}}"""
+    
     def _build_feedback_prompt(self, conversation: str, role: str) -> str:
         """Build prompt for feedback analysis"""
         return f"""You are an expert interview coach analyzing a REAL mock interview for a {role} position. Provide DETAILED, SPECIFIC, and HONEST feedback based on the candidate's ACTUAL performance.
@@ -177,41 +363,48 @@ Scoring Guidelines:
 - 3-4: Below average - vague answers, poor communication
 - 1-2: Poor - minimal effort, unclear responses
 
-Please provide detailed feedback in this EXACT format:
-
-OVERALL SCORE: [Honest score 1-10 based on actual performance]
+Respond with ONLY a JSON object (no markdown, no commentary) matching this schema:
+{FEEDBACK_JSON_SCHEMA}
 
-STRENGTHS:
-- [Specific strength with QUOTE or example from conversation]
-- [Another strength with actual reference]
-- [Third strength with specific example]
-- [Fourth strength if applicable]
-
-AREAS FOR IMPROVEMENT:
-- [Specific weakness with example of what they said/didn't say]
-- [Another area with reference to their actual response]
-- [Third area with specific example]
-- [Fourth area if applicable]
-
-COMMUNICATION SCORE: [1-10 - clarity, articulation, structure]
-TECHNICAL SCORE: [1-10 - knowledge, problem-solving, expertise]
-PREPARATION SCORE: [1-10 - examples, depth, readiness]
-
-DETAILED ANALYSIS:
-[2-3 paragraphs analyzing their overall performance, referencing specific moments from the interview]
-
-RECOMMENDATIONS:
-- [Specific, actionable recommendation based on their performance]
-- [Another recommendation with concrete steps]
-- [Third recommendation]
-- [Fourth recommendation if needed]
+- strengths: 3-4 specific strengths, each with a QUOTE or example from the conversation
+- areas_for_improvement: 3-4 specific weaknesses, each referencing what they said/didn't say
+- communication_score: clarity, articulation, structure
+- technical_score: knowledge, problem-solving, expertise
+- preparation_score: examples, depth, readiness
+- detailed_analysis: 2-3 paragraphs analyzing their overall performance, referencing specific moments
+- recommendations: 3-4 specific, actionable recommendations with concrete steps
 
 REMEMBER: Be HONEST and SPECIFIC. Use the full scoring range. Reference actual quotes and examples!"""
     
     def _parse_feedback(self, feedback_text: str, history: List[Dict]) -> Dict:
-        """Parse feedback text into structured format"""
+        """Parse LLM feedback: validate JSON first, fall back to the legacy text format"""
+        structured = self._parse_json_feedback(feedback_text)
+        if structured is not None:
+            structured["format"] = "json"
+        else:
+            structured = self._parse_text_feedback(feedback_text)
+            structured["format"] = "text"
+        
+        missing_scores = structured.pop("missing_scores", [])
+        if missing_scores:
+            logger.warning("feedback_scores_missing", extra={"scores": missing_scores, "default": 5})
+        return structured
+    
+    def _parse_json_feedback(self, feedback_text: str) -> Optional[Dict]:
+        """Validate a JSON feedback response against StructuredFeedback"""
+        match = _JSON_OBJECT_RE.search(feedback_text)
+        if not match:
+            return None
+        try:
+            return StructuredFeedback.model_validate_json(match.group(0)).model_dump()
+        except ValidationError as e:
+            logger.warning("feedback_json_invalid", extra={"errors": e.error_count(), "fallback": "text"})
+            return None
+    
+    def _parse_text_feedback(self, feedback_text: str) -> Dict:
+        """Single-pass parser for the legacy 'SECTION:' text format"""
         structured = {
-            "overall_score": 5,  # Changed default from 7 to 5 (true average)
+            "overall_score": 5,
             "strengths": [],
             "areas_for_improvement": [],
             "recommendations": [],
@@ -220,84 +413,65 @@ REMEMBER: Be HONEST and SPECIFIC. Use the full scoring range. Reference actual q
             "preparation_score": 5,
             "detailed_analysis": ""
         }
-        
-        lines = feedback_text.split("\n")
+        found_scores = set()
         current_section = None
         detailed_analysis_lines = []
         
-        for line in lines:
+        for line in feedback_text.splitlines():
             line = line.strip()
             if not line:
                 continue
             
-            # Parse scores - extract just the number
-            if "OVERALL SCORE:" in line.upper():
-                try:
-                    score_str = line.split(":")[-1].strip()
-                    # Extract first number found
-                    import re
-                    numbers = re.findall(r'\d+', score_str)
-                    if numbers:
-                        score = int(numbers[0])
-                        structured["overall_score"] = max(1, min(10, score))  # Clamp between 1-10
-                except:
-                    pass
-            
-            elif "COMMUNICATION SCORE:" in line.upper():
-                try:
-                    score_str = line.split(":")[-1].strip()
-                    import re
-                    numbers = re.findall(r'\d+', score_str)
-                    if numbers:
-                        score = int(numbers[0])
-                        structured["communication_score"] = max(1, min(10, score))
-                except:
-                    pass
-            
-            elif "TECHNICAL SCORE:" in line.upper():
-                try:
-                    score_str = line.split(":")[-1].strip()
-                    import re
-                    numbers = re.findall(r'\d+', score_str)
-                    if numbers:
-                        score = int(numbers[0])
-                        structured["technical_score"] = max(1, min(10, score))
-                except:
-                    pass
+            score_match = _SCORE_LINE_RE.match(line)
+            if score_match:
+                key = f"{score_match.group(1).lower()}_score"
+                structured[key] = max(1, min(10, int(round(float(score_match.group(2))))))
+                found_scores.add(key)
+                continue
             
-            elif "PREPARATION SCORE:" in line.upper():
-                try:
-                    score_str = line.split(":")[-1].strip()
-                    import re
-                    numbers = re.findall(r'\d+', score_str)
-                    if numbers:
-                        score = int(numbers[0])
-                        structured["preparation_score"] = max(1, min(10, score))
-                except:
-                    pass
+            section_match = _SECTION_LINE_RE.match(line)
+            if section_match:
+                header = " ".join(section_match.group(1).upper().split())
+                current_section = _SECTION_KEYS.get(header, "areas_for_improvement")
+                inline_text = (section_match.group(2) or "").strip()
+                if inline_text and current_section == "detailed_analysis":
+                    detailed_analysis_lines.append(inline_text)
+                continue
             
-            # Parse sections
-            elif "STRENGTHS:" in line.upper():
-                current_section = "strengths"
-            elif "AREAS FOR IMPROVEMENT:" in line.upper() or "IMPROVEMENT:" in line.upper():
-                current_section = "areas_for_improvement"
-            elif "DETAILED ANALYSIS:" in line.upper():
-                current_section = "detailed_analysis"
-            elif "RECOMMENDATIONS:" in line.upper():
-                current_section = "recommendations"
-            elif line.startswith("-") and current_section in ["strengths", "areas_for_improvement", "recommendations"]:
-                item = line[1:].strip()
-                if item:
-                    structured[current_section].append(item)
-            elif current_section == "detailed_analysis" and not line.startswith("RECOMMENDATIONS:"):
+            if current_section == "detailed_analysis":
                 detailed_analysis_lines.append(line)
+            elif current_section in LIST_FIELDS:
+                bullet_match = _BULLET_LINE_RE.match(line)
+                if bullet_match:
+                    structured[current_section].append(bullet_match.group(1).strip())
         
-        # Join detailed analysis
-        if detailed_analysis_lines:
-            structured["detailed_analysis"] = "\n".join(detailed_analysis_lines).strip()
-        
+        structured["detailed_analysis"] = "\n".join(detailed_analysis_lines).strip()
+        structured["missing_scores"] = [key for key in SCORE_FIELDS if key not in found_scores]
         return structured
     
+    def _render_feedback_text(self, structured: Dict) -> str:
+        """Render structured feedback in the readable text layout shown in reports"""
+        def bullets(items: List[str]) -> str:
+            return "\n".join(f"- {item}" for item in items)
+        
+        return f"""OVERALL SCORE: {structured["overall_score"]}
+
+STRENGTHS:
+{bullets(structured["strengths"])}
+
+AREAS FOR IMPROVEMENT:
+{bullets(structured["areas_for_improvement"])}
+
+COMMUNICATION SCORE: {structured["communication_score"]}
+TECHNICAL SCORE: {structured["technical_score"]}
+PREPARATION SCORE: {structured["preparation_score"]}
+
+DETAILED ANALYSIS:
+{structured["detailed_analysis"]}
+
+RECOMMENDATIONS:
+{bullets(structured["recommendations"])}"""
+    
     def _generate_fallback_feedback(self, history: List[Dict]) -> str:
         """Generate basic feedback if LLM call fails"""
         turn_count = len([msg for msg in history if msg["role"] == "user"])
@@ -0,0 +1,104 @@
+"""
+Video frame admission - bounds vision concurrency and tells clients when to send the next frame
+"""
+import math
+import os
+import threading
+import time
+from typing import Dict
+
+# Frames analyzed at once across all sessions in this worker
+VISION_MAX_CONCURRENCY = int(os.getenv("VISION_MAX_CONCURRENCY", "4"))
+# Frames a single session may have in analysis at once
+FRAMES_IN_FLIGHT_PER_SESSION = 1
+
+FRAME_MIN_INTERVAL_MS = int(os.getenv("FRAME_MIN_INTERVAL_MS", "3000"))
+FRAME_DEFAULT_INTERVAL_MS = 5000
+FRAME_MAX_INTERVAL_MS = int(os.getenv("FRAME_MAX_INTERVAL_MS", "30000"))
+
+# Weight of the newest latency sample in the moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+
+class FrameBudgetExceeded(Exception):
+    """Raised when a frame arrives while its session (or the worker) is over budget"""
+
+    def __init__(self, retry_after_ms: int):
+        super().__init__(f"Frame analysis busy, retry after {retry_after_ms} ms")
+        self.retry_after_ms = retry_after_ms
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after_ms / 1000))
+
+
+class FrameScheduler:
+    """Per-session frame admission plus a worker-wide cap on concurrent vision calls.
+
+    Each session gets at most FRAMES_IN_FLIGHT_PER_SESSION frames in analysis; the
+    next-frame hint grows with that session's recent vision latency and with how
+    busy the worker is, so clients slow down before they would be shed.
+    """
+
+    def __init__(self, max_concurrency: int = VISION_MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self.in_flight: Dict[str, int] = {}
+        self.latency_ewma_ms: Dict[str, float] = {}
+        self.total_in_flight = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, session_id: str) -> float:
+        """Admit a frame or raise FrameBudgetExceeded; returns the start time to pass to release()"""
+        with self.lock:
+            session_in_flight = self.in_flight.get(session_id, 0)
+            if session_in_flight >= FRAMES_IN_FLIGHT_PER_SESSION or self.total_in_flight >= self.max_concurrency:
+                raise FrameBudgetExceeded(self._next_frame_after_ms(session_id))
+            self.in_flight[session_id] = session_in_flight + 1
+            self.total_in_flight += 1
+        return time.perf_counter()
+
+    def release(self, session_id: str, started_at: float) -> int:
+        """Record the frame's latency and return the next-frame hint in milliseconds"""
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        with self.lock:
+            self._free_slot(session_id)
+            previous = self.latency_ewma_ms.get(session_id)
+            if previous is None:
+                self.latency_ewma_ms[session_id] = latency_ms
+            else:
+                self.latency_ewma_ms[session_id] = LATENCY_EWMA_ALPHA * latency_ms + (1 - LATENCY_EWMA_ALPHA) * previous
+            return self._next_frame_after_ms(session_id)
+
+    def cancel(self, session_id: str):
+        """Give back a slot for a frame that was admitted but never analyzed"""
+        with self.lock:
+            self._free_slot(session_id)
+
+    def _free_slot(self, session_id: str):
+        """Drop one in-flight frame; called under the lock"""
+        self.total_in_flight = max(0, self.total_in_flight - 1)
+        remaining = self.in_flight.get(session_id, 1) - 1
+        if remaining > 0:
+            self.in_flight[session_id] = remaining
+        else:
+            self.in_flight.pop(session_id, None)
+
+    def next_frame_after_ms(self, session_id: str) -> int:
+        with self.lock:
+            return self._next_frame_after_ms(session_id)
+
+    def _next_frame_after_ms(self, session_id: str) -> int:
+        """Hint computed under the lock"""
+        latency_ms = self.latency_ewma_ms.get(session_id)
+        # Keep each session's share of a vision slot at or below ~50%
+        base_ms = FRAME_DEFAULT_INTERVAL_MS if latency_ms is None else max(FRAME_MIN_INTERVAL_MS, 2 * latency_ms)
+        # Stretch the interval as the worker's vision slots fill up
+        load = self.total_in_flight / self.max_concurrency
+        interval_ms = base_ms * (1 + load)
+        if self.in_flight.get(session_id):
+            interval_ms += latency_ms or FRAME_DEFAULT_INTERVAL_MS
+        return int(min(FRAME_MAX_INTERVAL_MS, interval_ms))
+
+    def clear_session(self, session_id: str):
+        with self.lock:
+            self.latency_ewma_ms.pop(session_id, None)
@@ -2,12 +2,32 @@
 Interview Agent - Core logic for conducting mock interviews
 """
 import os
-import uuid
+import re
 from typing import Dict, List, Optional
 from datetime import datetime
-from groq import Groq
 import json
 
+from answer_scorer import AnswerScorer
+from code_analysis import analyze_code, format_findings, syntax_error_review
+from code_sandbox import run_submission, format_execution_report
+from code_history import (
+    MIN_DELTA_SIMILARITY, make_delta, line_changes, previous_version, similarity, submission_code, unified_diff
+)
+from code_review_cache import ReviewCache, execution_outcome, question_key, CODE_REVIEW_CACHE_ENABLED
+from coding_problems import find_problem
+from local_llm import local_llm
+from question_memory import question_memory
+from sharding import new_session_id
+from logger import get_logger
+from metrics import track_llm_call
+
+logger = get_logger("interview_agent")
+
+DEFAULT_LLM_MODEL = "llama-3.3-70b-versatile"
+
+# Separates the cacheable code review from the follow-up question in review replies
+REVIEW_FOLLOW_UP_MARKER = re.compile(r"\s*\**NEXT QUESTION:?\**:?\s*", re.IGNORECASE)
+
 # Lazy initialization of Groq client
 _client = None
 
@@ -18,9 +38,27 @@ def get_groq_client():
         api_key = os.getenv("GROQ_API_KEY", "")
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable is not set")
+        # Imported here so the SDK loads in the startup warm-up, not at import time
+        from groq import Groq
         _client = Groq(api_key=api_key)
     return _client
 
+def configure_gemini(api_key: str):
+    """Configure the Gemini SDK and return the google.generativeai module.
+
+    genai.configure is process-wide, so every Gemini caller goes through here;
+    configuring without the endpoint would reset it for the video analyzer too.
+    """
+    import google.generativeai as genai
+
+    # GEMINI_API_ENDPOINT points the client at another host (e.g. benchmarks/mock_llm_server.py)
+    api_endpoint = os.getenv("GEMINI_API_ENDPOINT", "")
+    if api_endpoint:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": api_endpoint})
+    else:
+        genai.configure(api_key=api_key)
+    return genai
+
 # Interview role configurations
 ROLE_CONFIGS = {
     "sales": {
@@ -222,18 +260,29 @@ ROLE_CONFIGS = {
 }
 
 
+def _avoid_section(asked_before: Optional[List[str]]) -> str:
+    """Prompt section listing questions from the candidate's earlier sessions"""
+    if not asked_before:
+        return ""
+    return ("\n\nAlready asked in the candidate's previous practice sessions - do NOT repeat these or close rewordings; "
+            "choose a different topic or angle:\n" + "\n".join(f"- {question}" for question in asked_before))
+
+
 class InterviewAgent:
     def __init__(self):
         self.sessions: Dict[str, Dict] = {}
         self.conversation_history: Dict[str, List[Dict]] = {}
         self.code_submissions: Dict[str, List[Dict]] = {}  # session_id -> list of code submissions
+        self.answer_scorer = AnswerScorer(self._call_llm)
+        self.review_cache = ReviewCache()
     
-    def start_interview(self, role: str, user_name: str = "Candidate", voice_gender: str = "female", interview_round: str = "technical", duration_minutes: int = 30, resume_text: Optional[str] = None) -> Dict:
+    def start_interview(self, role: str, user_name: str = "Candidate", voice_gender: str = "female", interview_round: str = "technical", duration_minutes: int = 30, resume_text: Optional[str] = None, resume_digest: Optional[str] = None, user_id: Optional[int] = None) -> Dict:
         """Initialize a new interview session"""
         if role not in ROLE_CONFIGS:
             raise ValueError(f"Invalid role: {role}. Available roles: {list(ROLE_CONFIGS.keys())}")
         
-        session_id = str(uuid.uuid4())
+        # Embeds this worker's shard so session_router.py can route follow-up calls here
+        session_id = new_session_id()
         config = ROLE_CONFIGS[role]
         
         # Validate voice_gender
@@ -261,6 +310,7 @@ class InterviewAgent:
         # Create session
         session = {
             "session_id": session_id,
+            "user_id": user_id,
             "role": role,
             "role_name": config["name"],
             "user_name": user_name,
@@ -269,6 +319,9 @@ class InterviewAgent:
             "duration_minutes": duration_minutes,
             "target_questions": target_questions[duration_minutes],
             "resume_text": resume_text,
+            "resume_digest": resume_digest,
+            # Resume context for the system prompt, computed once per session
+            "resume_context": resume_digest or (resume_text[:800] if resume_text else None),
             "started_at": datetime.now().isoformat(),
             "status": "active",
             "question_count": 0,
@@ -277,12 +330,18 @@ class InterviewAgent:
         
         self.sessions[session_id] = session
         self.conversation_history[session_id] = []
+        # Past questions load now, so turns only pay for the in-memory lookup
+        question_memory.preload(user_id)
+        
+        # Opening questions of the candidate's earlier sessions - every one is a candidate repeat, so no similarity floor
+        opening_context = f"{config['name']} {interview_round} opening question: background, experience\n{session['resume_context'] or ''}"
+        asked_before = question_memory.similar(session, opening_context, min_similarity=0.0)
         
         # Generate greeting and first question
         round_type = "technical" if interview_round == "technical" else "HR"
         greeting_messages = [
             {"role": "system", "content": f"You are a professional, friendly interviewer conducting a {round_type} round {config['name']} interview. Be warm and conversational."},
-            {"role": "user", "content": self._build_greeting_prompt(role, config, user_name, interview_round, resume_text)}
+            {"role": "user", "content": self._build_greeting_prompt(role, config, user_name, interview_round, resume_text, resume_digest, asked_before)}
         ]
         first_question = self._call_llm(greeting_messages, temperature=0.8, max_tokens=150).strip()
         
@@ -298,6 +357,7 @@ class InterviewAgent:
         
         session["greeting"] = greeting
         session["first_question"] = first_question
+        question_memory.remember(session, first_question)
         
         return session
     
@@ -310,6 +370,9 @@ class InterviewAgent:
         if session["status"] != "active":
             raise ValueError(f"Session {session_id} is not active")
         
+        # Question being answered, for per-turn scoring
+        question = self._last_assistant_message(session_id)
+        
         # Store user message
         self.conversation_history[session_id].append({
             "role": "user",
@@ -336,11 +399,15 @@ class InterviewAgent:
             "content": interviewer_response,
             "timestamp": datetime.now().isoformat()
         })
+        question_memory.remember(session, interviewer_response)
         
         # Update session stats
         session["conversation_turns"] += 1
         session["question_count"] += 1
         
+        # Score this answer in the background so /end only has to aggregate
+        self.answer_scorer.schedule(session_id, question, user_message, kind="answer", role_name=config["name"])
+        
         # Check if interview should continue based on target questions
         target_questions = session.get("target_questions", 12)
         should_continue = session["question_count"] < target_questions
@@ -358,9 +425,10 @@ class InterviewAgent:
         if session_id in self.sessions:
             self.sessions[session_id]["status"] = "ended"
             self.sessions[session_id]["ended_at"] = datetime.now().isoformat()
+            self.answer_scorer.clear_session(session_id)
     
-    def submit_code(self, session_id: str, code: str, language: str = "text") -> Dict:
-        """Submit code for review and get interviewer feedback"""
+    def submit_code(self, session_id: str, code: str, language: str = "text", analysis: Optional[Dict] = None) -> Dict:
+        """Submit code for review and get interviewer feedback (analysis: precomputed analyze_code result)"""
         if session_id not in self.sessions:
             raise ValueError(f"Session {session_id} not found")
         
@@ -372,31 +440,81 @@ class InterviewAgent:
         if session_id not in self.code_submissions:
             self.code_submissions[session_id] = []
         
+        if analysis is None:
+            analysis = analyze_code(code, language)
+        syntax_error = analysis is not None and analysis["syntax_error"] is not None
+        
+        problem = find_problem(self._recent_assistant_messages(session_id))
+        
+        # Run the code against the problem's tests first - correctness comes from execution, not tokens
+        execution = None
+        if not syntax_error:
+            execution = run_submission(problem, code, language)
+        
         code_submission = {
-            "code": code,
             "language": language,
             "timestamp": datetime.now().isoformat()
         }
+        # Resubmissions are stored (and reviewed) as a delta against the previous version
+        submissions = self.code_submissions[session_id]
+        base_index = previous_version(submissions, language)
+        previous_code = submission_code(submissions, base_index) if base_index is not None else None
+        revision_diff = None
+        if previous_code is not None and similarity(previous_code, code) >= MIN_DELTA_SIMILARITY:
+            code_submission["base"] = base_index
+            code_submission["delta"] = make_delta(previous_code, code)
+            code_submission["changes"] = line_changes(previous_code, code)
+            revision_diff = unified_diff(previous_code, code)
+        else:
+            code_submission["code"] = code
+        if analysis is not None:
+            code_submission["analysis"] = analysis
+        if execution is not None:
+            code_submission["execution"] = execution
         self.code_submissions[session_id].append(code_submission)
         
-        # Generate code review prompt
         role = session["role"]
         config = ROLE_CONFIGS[role]
-        review_prompt = self._build_code_review_prompt(session, config, code, language)
-        
-        # Get interviewer response about the code (allow more tokens for code review)
-        review_response = self._call_llm([{
-            "role": "system",
-            "content": f"You are an experienced technical interviewer conducting an ONGOING mock interview for the {config['name']} position. Review code submissions briefly, then continue the interview with another question. This is NOT the end of the interview. Speak directly to the candidate (use 'you'), not about them (don't say 'the candidate')."
-        }, {
-            "role": "user",
-            "content": review_prompt
-        }], temperature=0.7, max_tokens=300)
+        question = self._last_assistant_message(session_id)
+        q_key = question_key(problem["id"] if problem else None, question)
+        outcome = execution_outcome(execution)
+        cached_review = None
+        if syntax_error:
+            # Instant, deterministic feedback - no LLM call needed to point out a parse error
+            review_response = syntax_error_review(analysis, language)
+        elif CODE_REVIEW_CACHE_ENABLED and (cached_review := self.review_cache.lookup(code, language, q_key, outcome)):
+            # Equivalent code for the same question was reviewed before; only the follow-up is new
+            review_response = f"{cached_review} {self._generate_follow_up(config, question, cached_review)}"
+        else:
+            review_prompt = self._build_code_review_prompt(
+                session, config, code, language, execution, analysis, revision_diff, code_submission.get("changes")
+            )
+            
+            # Get interviewer response about the code (allow more tokens for code review)
+            raw_response = self._call_llm([{
+                "role": "system",
+                "content": f"You are an experienced technical interviewer conducting an ONGOING mock interview for the {config['name']} position. Review code submissions briefly, then continue the interview with another question. This is NOT the end of the interview. Speak directly to the candidate (use 'you'), not about them (don't say 'the candidate')."
+            }, {
+                "role": "user",
+                "content": review_prompt
+            }], temperature=0.7, max_tokens=300)
+            
+            review_part, follow_up = self._split_review(raw_response)
+            if follow_up:
+                review_response = f"{review_part} {follow_up}"
+                if CODE_REVIEW_CACHE_ENABLED:
+                    self.review_cache.store(code, language, q_key, outcome, review_part)
+            else:
+                review_response = raw_response
         
-        # Store code and review in conversation history
+        # Store code and review in conversation history (revisions as a diff)
+        if revision_diff is not None:
+            code_message = f"[Code Submission in {language} - revision of submission {base_index + 1}]\n\n```diff\n{revision_diff or '(no changes)'}\n```"
+        else:
+            code_message = f"[Code Submission in {language}]\n\n```{language}\n{code}\n```"
         self.conversation_history[session_id].append({
             "role": "user",
-            "content": f"[Code Submission in {language}]\n\n```{language}\n{code}\n```",
+            "content": code_message,
             "timestamp": datetime.now().isoformat(),
             "isCode": True
         })
@@ -407,22 +525,88 @@ class InterviewAgent:
             "timestamp": datetime.now().isoformat()
         })
         
+        if not syntax_error:
+            self.answer_scorer.schedule(session_id, question, f"[{language}]\n{code}", kind="code", role_name=config["name"])
+            question_memory.remember(session, review_response)
+        
         return {
             "review": review_response,
             "session_id": session_id,
-            "submission_count": len(self.code_submissions[session_id])
+            "submission_count": len(self.code_submissions[session_id]),
+            "analysis": analysis,
+            "execution": execution,
+            "cached_review": bool(cached_review)
         }
     
-    def _build_code_review_prompt(self, session: Dict, config: Dict, code: str, language: str) -> str:
-        """Build prompt for code review"""
+    def _split_review(self, response: str):
+        """Split a code review reply into (review, follow-up question); follow-up is None if unmarked"""
+        marker = REVIEW_FOLLOW_UP_MARKER.search(response)
+        if not marker:
+            return response.strip(), None
+        review_part = response[:marker.start()].strip()
+        follow_up = response[marker.end():].strip()
+        if not review_part or not follow_up:
+            return response.replace(marker.group(0), " ").strip(), None
+        return review_part, follow_up
+    
+    def _generate_follow_up(self, config: Dict, question: str, review: str) -> str:
+        """Fresh follow-up question after a cached code review"""
+        return self._call_llm([{
+            "role": "system",
+            "content": f"You are an experienced technical interviewer conducting an ONGOING mock interview for the {config['name']} position. Speak directly to the candidate (use 'you')."
+        }, {
+            "role": "user",
+            "content": f"""You asked: {question}
+
+The candidate submitted code and you just told them: {review}
+
+Now ask ONE follow-up interview question (1-2 sentences) to continue the interview. Reply with only the question."""
+        }], temperature=0.9, max_tokens=100).strip()
+    
+    def _last_assistant_message(self, session_id: str) -> str:
+        """Most recent interviewer message (the question currently being answered)"""
+        for msg in reversed(self.conversation_history.get(session_id, [])):
+            if msg["role"] == "assistant":
+                return msg["content"]
+        return ""
+    
+    def _recent_assistant_messages(self, session_id: str, limit: int = 4) -> List[str]:
+        """Last few interviewer messages, newest first (the coding question may be a few turns back)"""
+        messages = [msg["content"] for msg in reversed(self.conversation_history.get(session_id, [])) if msg["role"] == "assistant"]
+        return messages[:limit]
+    
+    def _build_code_review_prompt(self, session: Dict, config: Dict, code: str, language: str,
+                                  execution: Optional[Dict] = None, analysis: Optional[Dict] = None,
+                                  revision_diff: Optional[str] = None, changes: Optional[str] = None) -> str:
+        """Build prompt for code review (revision_diff: unified diff against the previous version)"""
         role = session["role"]
         user_name = session["user_name"]
         
-        return f"""The candidate has submitted the following code in {language}:
+        execution_text = ""
+        if analysis is not None:
+            execution_text += f"\n{format_findings(analysis)}\n"
+        if execution is not None:
+            execution_text += f"""
+{format_execution_report(execution)}
+Base your correctness comments on these results rather than re-checking the logic by hand.
+"""
+        
+        if revision_diff is not None:
+            # Only what changed, with a few lines of context - the earlier version was already reviewed
+            submission_text = f"""The candidate has revised their previous {language} submission ({changes}). Changes as a unified diff:
+
+```diff
+{revision_diff or "(no changes)"}
+```"""
+        else:
+            submission_text = f"""The candidate has submitted the following code in {language}:
 
 ```{language}
 {code}
-```
+```"""
+        
+        return f"""{submission_text}
+{execution_text}
 
 Please review this code submission as part of an ONGOING {config['name']} interview. Consider:
 - Code correctness and logic
@@ -431,7 +615,7 @@ Please review this code submission as part of an ONGOING {config['name']} interv
 - Readability and maintainability
 - Edge cases handling
 
-Provide constructive feedback in 2-3 sentences. Then ask a follow-up question to CONTINUE the interview.
+Provide constructive feedback in 2-3 sentences. Then, on a new line starting with "NEXT QUESTION:", ask a follow-up question to CONTINUE the interview.
 
 IMPORTANT: 
 - This is NOT the end of the interview
@@ -439,7 +623,9 @@ IMPORTANT:
 - Keep the conversation going naturally
 - Don't give final feedback or say "candidate" - you're talking TO them, not ABOUT them
 
-Example: "Good work on [aspect]. However, [improvement]. Now, let me ask you about [next topic]..."""
+Example:
+Good work on [aspect]. However, [improvement].
+NEXT QUESTION: Now, let me ask you about [next topic]..."""
     
     def get_interview_status(self, session_id: str) -> Dict:
         """Get current status of interview session"""
@@ -451,8 +637,8 @@ Example: "Good work on [aspect]. However, [improvement]. Now, let me ask you abo
         session["code_submission_count"] = len(self.code_submissions.get(session_id, []))
         return session
     
-    def _build_greeting_prompt(self, role: str, config: Dict, user_name: str, interview_round: str, resume_text: Optional[str] = None) -> str:
-        """Build prompt for interview greeting and first question"""
+    def _build_greeting_prompt(self, role: str, config: Dict, user_name: str, interview_round: str, resume_text: Optional[str] = None, resume_digest: Optional[str] = None, asked_before: Optional[List[str]] = None) -> str:
+        """Build prompt for interview greeting and first question (asked_before: past questions to avoid)"""
         
         round_context = ""
         if interview_round == "technical":
@@ -460,8 +646,8 @@ Example: "Good work on [aspect]. However, [improvement]. Now, let me ask you abo
         else:
             round_context = "This is an HR round. Focus on behavioral questions, soft skills, culture fit, work experience, and career goals."
         
-        if resume_text:
-            resume_summary = resume_text[:1000] if len(resume_text) > 1000 else resume_text
+        if resume_text or resume_digest:
+            resume_summary = resume_digest or resume_text[:1000]
             base_prompt = f"""You are starting a {config['name']} {interview_round} interview with {user_name}.
 
 Their resume: {resume_summary}
@@ -492,7 +678,7 @@ Example: "Could you start by telling me a bit about yourself and what interests
 
 Keep it conversational. One question only."""
         
-        return base_prompt
+        return base_prompt + _avoid_section(asked_before)
     
     def _build_conversation_messages(self, session: Dict, config: Dict, user_message: str) -> List[Dict]:
         """Build conversation messages for OpenAI API"""
@@ -501,7 +687,7 @@ Keep it conversational. One question only."""
         interview_round = session.get("interview_round", "technical")
         duration_minutes = session.get("duration_minutes", 30)
         target_questions = session.get("target_questions", 12)
-        resume_text = session.get("resume_text")
+        resume_context = session.get("resume_context")
         history = self.conversation_history[session["session_id"]]
         question_count = session['question_count']
         code_submission_count = len(self.code_submissions.get(session["session_id"], []))
@@ -580,12 +766,11 @@ Keep it simple and practical."""
 
 REMINDER: The candidate hasn't used the code editor yet. Encourage them to write code for the technical question."""
         
-        if resume_text:
-            resume_summary = resume_text[:800] if len(resume_text) > 800 else resume_text
+        if resume_context:
             system_content += f"""
 
 IMPORTANT - Candidate's Resume:
-{resume_summary}
+{resume_context}
 
 Mix resume-based questions with role-specific questions:
 - Ask about their specific experiences mentioned in the resume
@@ -593,6 +778,10 @@ Mix resume-based questions with role-specific questions:
 - Ask how their background relates to this {config['name']} role
 - Alternate between resume questions and general interview questions"""
         
+        # Questions from the candidate's earlier sessions closest to where this conversation is heading
+        last_question = history[-2]["content"] if len(history) >= 2 else ""
+        system_content += _avoid_section(question_memory.similar(session, f"{last_question}\n{user_message}"))
+        
         # Start with system message
         messages = [{"role": "system", "content": system_content}]
         
@@ -636,40 +825,37 @@ Mix resume-based questions with role-specific questions:
         return guidance.get(role, "- Ask relevant questions for this role")
     
     
-    def _call_llm(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 200) -> str:
+    def _call_llm(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 200, model: str = DEFAULT_LLM_MODEL) -> str:
         """Call LLM API with conversation messages (tries Groq first, then Gemini as fallback)"""
         try:
             client = get_groq_client()
             
-            # Debug: Print the last user message
-            user_messages = [m for m in messages if m["role"] == "user"]
-            if user_messages:
-                print(f"\n[DEBUG] Last user message: {user_messages[-1]['content'][:100]}...")
-            
             # Try Groq first
             try:
-                response = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                with track_llm_call("groq", model) as call:
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+                    usage = getattr(response, "usage", None)
+                    if usage:
+                        call.record_usage(usage.prompt_tokens, usage.completion_tokens)
                 
                 ai_response = response.choices[0].message.content.strip()
-                print(f"[DEBUG] Groq AI response: {ai_response[:100]}...")
+                logger.debug("llm_response", extra={"provider": "groq", "model": model, "chars": len(ai_response)})
                 return ai_response
                 
             except Exception as groq_error:
-                print(f"[WARNING] Groq API failed: {groq_error}")
-                print("[INFO] Trying Gemini as fallback...")
+                logger.warning("groq_failed", extra={"model": model, "error": str(groq_error)})
                 
                 # Try Gemini as fallback
                 gemini_api_key = os.getenv("GEMINI_API_KEY", "")
                 if gemini_api_key:
                     try:
-                        import google.generativeai as genai
-                        genai.configure(api_key=gemini_api_key)
-                        model = genai.GenerativeModel('gemini-pro')
+                        genai = configure_gemini(gemini_api_key)
+                        gemini_model = genai.GenerativeModel('gemini-pro')
                         
                         # Convert messages to Gemini format
                         prompt = ""
@@ -683,21 +869,29 @@ Mix resume-based questions with role-specific questions:
                         
                         prompt += "Assistant:"
                         
-                        response = model.generate_content(prompt)
+                        with track_llm_call("gemini", "gemini-pro") as call:
+                            response = gemini_model.generate_content(prompt)
+                            usage = getattr(response, "usage_metadata", None)
+                            if usage:
+                                call.record_usage(usage.prompt_token_count, usage.candidates_token_count)
+                        
                         ai_response = response.text.strip()
-                        print(f"[DEBUG] Gemini AI response: {ai_response[:100]}...")
+                        logger.debug("llm_response", extra={"provider": "gemini", "model": "gemini-pro", "chars": len(ai_response)})
                         return ai_response
                         
                     except Exception as gemini_error:
-                        print(f"[ERROR] Gemini also failed: {gemini_error}")
+                        logger.error("gemini_failed", extra={"error": str(gemini_error)})
                         raise groq_error  # Raise original error
                 else:
                     raise groq_error
             
         except Exception as e:
-            print(f"[ERROR] All LLM APIs failed: {e}")
-            import traceback
-            traceback.print_exc()
+            # Local CPU model keeps interviews going through cloud outages (and offline)
+            local_response = local_llm.chat(messages, temperature=temperature, max_tokens=max_tokens)
+            if local_response:
+                logger.warning("cloud_llm_failed_used_local", extra={"model": local_llm.model_name, "error": str(e)})
+                return local_response
+            
+            logger.error("all_llm_providers_failed", exc_info=True, extra={"error": str(e)})
             # Fallback response if all APIs fail
             return "That's interesting. Can you elaborate on that? What specific experience do you have in this area?"
-
@@ -0,0 +1,255 @@
+"""
+Interview export - streams the interviews table into Parquet or Arrow files for analytics
+
+Rows are read through a server-side cursor and written one fixed-size row group
+at a time, so memory stays flat however large the table is. Only scalar columns
+are exported (scores, role, round, duration, timestamps); the compressed
+feedback columns never leave the database.
+
+Incremental exports continue from a named watermark on completed_at that is
+advanced only after the file has been fully written. completed_at is set before
+the row commits, so a slow transaction can commit a row older than the
+watermark; each run therefore re-reads EXPORT_WATERMARK_OVERLAP_SECONDS behind
+the watermark and skips the ids already exported in that window (kept in
+export_watermark_ids).
+
+From backend/:
+    python interview_export.py --format parquet --incremental
+    python interview_export.py --format arrow --out exports/all.arrow --full
+"""
+import argparse
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from logger import get_logger
+
+# pyarrow is optional - only needed by whoever runs exports
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = get_logger("interview_export")
+
+EXPORT_DIR = os.getenv("INTERVIEW_EXPORT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports"))
+# Rows per row group (Parquet) / record batch (Arrow), and per cursor fetch
+EXPORT_ROW_GROUP_SIZE = int(os.getenv("INTERVIEW_EXPORT_ROW_GROUP_SIZE", "10000"))
+DEFAULT_WATERMARK = "analytics"
+# How far behind the watermark each incremental run looks again for late-committed rows
+EXPORT_WATERMARK_OVERLAP_SECONDS = float(os.getenv("EXPORT_WATERMARK_OVERLAP_SECONDS", "300"))
+
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# (column name, arrow type name) - everything except the free-text and compressed columns
+EXPORT_COLUMNS = (
+    ("id", "int64"),
+    ("user_id", "int64"),
+    ("session_id", "string"),
+    ("role", "string"),
+    ("interview_round", "string"),
+    ("duration_minutes", "int32"),
+    ("overall_score", "int32"),
+    ("communication_score", "int32"),
+    ("technical_score", "int32"),
+    ("preparation_score", "int32"),
+    ("created_at", "timestamp"),
+    ("completed_at", "timestamp"),
+)
+
+
+def export_schema() -> "pyarrow.Schema":
+    types = {
+        "int64": pyarrow.int64(), "int32": pyarrow.int32(),
+        "string": pyarrow.string(), "timestamp": pyarrow.timestamp("us"),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def get_watermark(db, name: str = DEFAULT_WATERMARK) -> Tuple[Optional[datetime], int]:
+    """(completed_at, id) of the last exported row, or (None, 0) before the first export"""
+    from models import ExportWatermark
+
+    watermark = db.query(ExportWatermark).filter(ExportWatermark.name == name).first()
+    if watermark is None:
+        return None, 0
+    return watermark.completed_at, watermark.last_id or 0
+
+
+def _exported_ids(db, name: str, since: datetime) -> Set[int]:
+    """Ids already exported under this watermark with completed_at >= since"""
+    from models import ExportWatermarkId
+
+    return {
+        interview_id for (interview_id,) in db.query(ExportWatermarkId.interview_id)
+        .filter(ExportWatermarkId.name == name, ExportWatermarkId.completed_at >= since)
+    }
+
+
+def _set_watermark(db, name: str, completed_at: datetime, last_id: int, rows: int, recent):
+    """Advance the watermark and replace its overlap window with recent [(id, completed_at)]"""
+    from models import ExportWatermark, ExportWatermarkId
+
+    watermark = db.query(ExportWatermark).filter(ExportWatermark.name == name).first()
+    if watermark is None:
+        watermark = ExportWatermark(name=name, rows_exported=0)
+        db.add(watermark)
+    watermark.completed_at = max(completed_at, watermark.completed_at or completed_at)
+    watermark.last_id = last_id
+    watermark.rows_exported = (watermark.rows_exported or 0) + rows
+    watermark.updated_at = datetime.utcnow()
+
+    window_start = watermark.completed_at - timedelta(seconds=EXPORT_WATERMARK_OVERLAP_SECONDS)
+    db.query(ExportWatermarkId).filter(
+        ExportWatermarkId.name == name, ExportWatermarkId.completed_at < window_start
+    ).delete(synchronize_session=False)
+    db.add_all(
+        ExportWatermarkId(name=name, interview_id=interview_id, completed_at=row_completed_at)
+        for interview_id, row_completed_at in recent if row_completed_at >= window_start
+    )
+    db.commit()
+
+
+def _select_rows(since: Optional[datetime], batch_size: int):
+    from sqlalchemy import select
+    from models import Interview
+
+    columns = [getattr(Interview, name) for name, _ in EXPORT_COLUMNS]
+    query = select(*columns).where(Interview.completed_at.isnot(None)).order_by(Interview.completed_at, Interview.id)
+    if since is not None:
+        query = query.where(Interview.completed_at >= since)
+    # stream_results asks the driver for a server-side cursor (named cursor on PostgreSQL)
+    return query.execution_options(stream_results=True, yield_per=batch_size)
+
+
+class _Writer:
+    """One row group per write, to a Parquet or Arrow IPC file"""
+
+    def __init__(self, path: str, fmt: str, schema: "pyarrow.Schema", row_group_size: int):
+        self.fmt = fmt
+        self.row_group_size = row_group_size
+        if fmt == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(path, schema, compression="zstd")
+        else:
+            self.writer = pyarrow.ipc.new_file(path, schema)
+
+    def write(self, batch: "pyarrow.RecordBatch"):
+        if self.fmt == "parquet":
+            self.writer.write_table(pyarrow.Table.from_batches([batch]), row_group_size=self.row_group_size)
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+def export_interviews(
+    out_path: Optional[str] = None,
+    fmt: str = "parquet",
+    incremental: bool = True,
+    watermark: str = DEFAULT_WATERMARK,
+    row_group_size: int = EXPORT_ROW_GROUP_SIZE
+) -> Dict:
+    """Write interviews (all, or those not yet exported under the watermark) to out_path.
+
+    The file is written under a temporary name and renamed when complete; the
+    watermark moves to the last exported row afterwards. Returns a summary with
+    the path, row and row-group counts.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for exports (pip install pyarrow)")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(EXPORT_FORMATS)})")
+    if out_path is None:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        kind = "incremental" if incremental else "full"
+        out_path = os.path.join(EXPORT_DIR, f"interviews-{kind}-{stamp}{EXPORT_FORMATS[fmt]}")
+
+    from db_config import SessionLocal
+
+    schema = export_schema()
+    names = [name for name, _ in EXPORT_COLUMNS]
+    tmp_path = out_path + ".part"
+    rows = row_groups = 0
+    last_completed_at, last_id = None, 0
+    # Exported (id, completed_at) within the overlap window of the newest row so far
+    recent = deque()
+    overlap = timedelta(seconds=EXPORT_WATERMARK_OVERLAP_SECONDS)
+
+    db = SessionLocal()
+    try:
+        since = get_watermark(db, watermark)[0] if incremental else None
+        window_start = since - overlap if since is not None else None
+        exported = _exported_ids(db, watermark, window_start) if window_start is not None else set()
+        writer = _Writer(tmp_path, fmt, schema, row_group_size)
+        try:
+            result = db.execute(_select_rows(window_start, row_group_size))
+            # partitions() hands back yield_per rows at a time from the open cursor
+            for partition in result.partitions():
+                partition = [row for row in partition if row.id not in exported]
+                if not partition:
+                    continue
+                columns = list(zip(*partition))
+                batch = pyarrow.RecordBatch.from_arrays(
+                    [pyarrow.array(values, type=schema.field(name).type) for name, values in zip(names, columns)],
+                    schema=schema
+                )
+                writer.write(batch)
+                rows += len(partition)
+                row_groups += 1
+                last_row = partition[-1]
+                last_completed_at, last_id = last_row.completed_at, last_row.id
+                recent.extend((row.id, row.completed_at) for row in partition)
+                while recent[0][1] < last_completed_at - overlap:
+                    recent.popleft()
+        finally:
+            writer.close()
+        os.replace(tmp_path, out_path)
+
+        if rows:
+            _set_watermark(db, watermark, last_completed_at, last_id, rows, recent)
+        logger.info("interviews_exported", extra={
+            "path": out_path, "format": fmt, "rows": rows, "row_groups": row_groups, "watermark": watermark
+        })
+        return {
+            "path": out_path,
+            "format": fmt,
+            "rows": rows,
+            "row_groups": row_groups,
+            "since": since.isoformat() if since else None,
+            "watermark": last_completed_at.isoformat() if last_completed_at else (since.isoformat() if since else None),
+        }
+    except Exception:
+        db.rollback()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--out", help=f"output file (default: a timestamped file in {EXPORT_DIR})")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", dest="incremental", action="store_true", default=True,
+                      help="only interviews not exported under the watermark yet (default)")
+    mode.add_argument("--full", dest="incremental", action="store_false", help="export every interview")
+    parser.add_argument("--watermark", default=DEFAULT_WATERMARK, help="watermark name, one per consumer")
+    parser.add_argument("--row-group-size", type=int, default=EXPORT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        parser.exit(1, "pyarrow is not installed (pip install pyarrow)\n")
+    summary = export_interviews(args.out, args.format, args.incremental, args.watermark, max(1, args.row_group_size))
+    print(f"[OK] Exported {summary['rows']} interviews in {summary['row_groups']} row groups -> {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,37 @@
 """
 Protected interview routes - linked to authenticated users
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import asyncio
+import json
+import os
+from contextlib import nullcontext
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Request, WebSocket, WebSocketDisconnect, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-import PyPDF2
-import io
 
 from models import User, Interview
-from db_config import get_db
-from auth import get_current_user
+from db_config import get_db, SessionLocal
+from auth import get_current_user, authenticate_token
 from interview_agent import InterviewAgent
 from feedback_analyzer import FeedbackAnalyzer
 from video_analyzer import VideoAnalyzer
+from resume_parser import read_upload_limited, parse_resume_bytes, ResumeParseError
+from logger import get_logger
+from metrics import ACTIVE_SESSIONS, track_frame_in_flight
+from resume_cache import resume_sha256, get_cached_resume, get_user_resume, store_resume, compute_and_store_digest
+from frame_scheduler import FrameScheduler, FrameBudgetExceeded
+from session_store import begin_drain, is_draining, snapshot_sessions, restore_session
+from rate_limiter import (
+    RateLimiter, RateLimitExceeded, MAX_QUEUE_SECONDS, VISION_FRAME_TOKENS,
+    estimate_message_tokens, estimate_code_review_tokens
+)
+from request_coalescer import RequestCoalescer
+from code_analysis import analyze_code
+from score_distributions import score_distributions, SCORE_FIELDS
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 
@@ -22,6 +39,46 @@ router = APIRouter(prefix="/api/interview", tags=["interview"])
 interview_agent = InterviewAgent()
 video_analyzer = VideoAnalyzer(interview_agent=interview_agent)
 feedback_analyzer = FeedbackAnalyzer(interview_agent=interview_agent, video_analyzer=video_analyzer)
+frame_scheduler = FrameScheduler()
+rate_limiter = RateLimiter()
+request_coalescer = RequestCoalescer()
+
+logger = get_logger("interview_routes")
+
+# Raw frame uploads (/video-frame/binary)
+FRAME_MIME_TYPES = {"image/jpeg", "image/webp", "image/png"}
+MAX_FRAME_BYTES = int(os.getenv("FRAME_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# Application close codes for the session WebSocket
+WS_CLOSE_UNAUTHORIZED = 4401
+WS_CLOSE_FORBIDDEN = 4403
+
+# Evaluated at scrape time only
+ACTIVE_SESSIONS.set_function(
+    lambda: sum(1 for session in list(interview_agent.sessions.values()) if session.get("status") == "active")
+)
+
+def _ensure_session(session_id: str):
+    """Rehydrate a session snapshotted by a worker that has since shut down"""
+    if session_id not in interview_agent.sessions:
+        restore_session(interview_agent, video_analyzer, session_id)
+
+async def _admit(session_id: str, pool: str, cost: int, max_wait: float = MAX_QUEUE_SECONDS):
+    """Charge estimated tokens to the user, session and global buckets (429 when over budget)"""
+    session = interview_agent.sessions.get(session_id, {})
+    try:
+        await rate_limiter.admit(pool, cost, user_id=session.get("user_id"), session_id=session_id, max_wait=max_wait)
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail={"message": str(e), "retry_after_ms": e.retry_after_ms},
+            headers={"Retry-After": str(e.retry_after_seconds)}
+        )
+
+def drain_sessions() -> int:
+    """Refuse new interviews and snapshot live ones (application shutdown)"""
+    begin_drain()
+    return snapshot_sessions(interview_agent, video_analyzer)
 
 # Request models
 class InterviewStartRequest(BaseModel):
@@ -30,6 +87,7 @@ class InterviewStartRequest(BaseModel):
     duration_minutes: Optional[int] = 30
     voice_gender: Optional[str] = "female"
     resume_text: Optional[str] = None
+    resume_hash: Optional[str] = None
 
 class MessageRequest(BaseModel):
     message: str
@@ -62,64 +120,93 @@ async def get_available_roles():
 
 @router.post("/resume/parse")
 async def parse_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """Parse PDF resume and extract text"""
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
-    contents = await file.read()
-    
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
-        resume_text = ""
-        
-        for page in pdf_reader.pages:
-            resume_text += page.extract_text() + "\n"
-        
-        resume_text = resume_text.strip()
-        
-        if not resume_text or len(resume_text) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract meaningful text from PDF"
-            )
-        
-        if len(resume_text) > 8000:
-            resume_text = resume_text[:8000] + "\n[... resume truncated ...]"
-        
+        contents = await read_upload_limited(file)
+    except ResumeParseError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    # Same file uploaded before - skip parsing entirely
+    resume_hash = resume_sha256(contents)
+    cached = get_cached_resume(db, resume_hash, current_user.id)
+    if cached:
+        if not cached.resume_digest:
+            background_tasks.add_task(compute_and_store_digest, resume_hash, interview_agent._call_llm)
         return {
-            "resume_text": resume_text,
+            "resume_text": cached.resume_text,
+            "resume_hash": resume_hash,
             "file_name": file.filename,
-            "text_length": len(resume_text)
+            "text_length": len(cached.resume_text),
+            "cached": True
         }
+    
+    try:
+        resume_text = await parse_resume_bytes(contents)
+    except ResumeParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {str(e)}")
+    
+    if not resume_text or len(resume_text) < 50:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract meaningful text from PDF"
+        )
+    
+    store_resume(db, resume_hash, resume_text, current_user.id)
+    background_tasks.add_task(compute_and_store_digest, resume_hash, interview_agent._call_llm)
+    
+    return {
+        "resume_text": resume_text,
+        "resume_hash": resume_hash,
+        "file_name": file.filename,
+        "text_length": len(resume_text),
+        "cached": False
+    }
 
 @router.post("/start")
 async def start_interview(
     request: InterviewStartRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """Start a new interview session"""
+    if is_draining():
+        raise HTTPException(
+            status_code=503,
+            detail="Server is restarting, please try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    
     try:
+        # Use the precomputed digest when the resume was parsed by us - only for a resume this user uploaded
+        resume_text = request.resume_text
+        resume_digest = None
+        if request.resume_hash:
+            cached_resume = get_user_resume(db, request.resume_hash, current_user.id)
+            if cached_resume:
+                resume_text = resume_text or cached_resume.resume_text
+                resume_digest = cached_resume.resume_digest
+        
         session = interview_agent.start_interview(
             role=request.role,
             user_name=current_user.full_name,
             voice_gender=request.voice_gender,
             interview_round=request.interview_round,
             duration_minutes=request.duration_minutes,
-            resume_text=request.resume_text
+            resume_text=resume_text,
+            resume_digest=resume_digest,
+            user_id=current_user.id
         )
         
-        # Store user_id in session for later linking
-        if session["session_id"] not in interview_agent.conversation_history:
-            interview_agent.conversation_history[session["session_id"]] = []
-        
-        # Add user_id to session metadata
-        session["user_id"] = current_user.id
-        
         return {
             "session_id": session["session_id"],
             "role": session["role"],
@@ -133,22 +220,48 @@ async def start_interview(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _handle_message(session_id: str, message: str, is_voice: bool, idempotency_key: Optional[str] = None,
+                          turn_lock: Optional[asyncio.Lock] = None) -> dict:
+    """Interviewer reply to a candidate message (shared by HTTP and the session WebSocket).
+    
+    Duplicates - same idempotency key, or the same text while the first is in flight - share one reply.
+    turn_lock, if given, is held only by the call that actually reaches the LLM.
+    """
+    _ensure_session(session_id)
+    
+    async def reply():
+        async with turn_lock or nullcontext():
+            session = interview_agent.sessions.get(session_id, {})
+            history = interview_agent.conversation_history.get(session_id, [])
+            await _admit(session_id, "llm", estimate_message_tokens(session, history, message))
+            return await run_in_threadpool(interview_agent.process_message, session_id, message, is_voice)
+    
+    return await request_coalescer.run(session_id, "message", {"message": message.strip()}, idempotency_key, reply)
+
 @router.post("/message")
 async def process_message(
     request: MessageRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None)
 ):
     """Process user message and get AI response"""
     try:
-        response = interview_agent.process_message(
-            request.session_id,
-            request.message,
-            request.is_voice
-        )
-        return response
+        return await _handle_message(request.session_id, request.message, request.is_voice, idempotency_key)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _save_interview(db: Session, interview_record: Interview) -> dict:
+    """Save a finished interview and count it into its cohort's histograms; returns its percentiles"""
+    db.add(interview_record)
+    # Same transaction as the interview row, so a histogram rebuild sees both or neither
+    scores = {field: getattr(interview_record, field) for field in SCORE_FIELDS}
+    score_distributions.record(db, interview_record.role, interview_record.interview_round, scores)
+    db.commit()
+    db.refresh(interview_record)
+    return score_distributions.percentiles(interview_record.role, interview_record.interview_round, scores)
+
 @router.post("/end")
 async def end_interview(
     request: InterviewEndRequest,
@@ -157,17 +270,14 @@ async def end_interview(
 ):
     """End interview and save feedback to database"""
     try:
-        # Generate feedback
-        print(f"[DEBUG] Generating feedback for session: {request.session_id}")
-        feedback = feedback_analyzer.analyze_interview(request.session_id)
-        print(f"[DEBUG] Feedback generated successfully")
+        # Generate feedback off the event loop - it waits for pending answer scores and calls the LLM
+        _ensure_session(request.session_id)
+        feedback = await run_in_threadpool(feedback_analyzer.analyze_interview, request.session_id)
         
         # Get session info
         session_info = interview_agent.sessions.get(request.session_id, {})
-        print(f"[DEBUG] Session info: {session_info}")
         
         # Save to database
-        print(f"[DEBUG] Creating interview record...")
         interview_record = Interview(
             user_id=current_user.id,
             session_id=request.session_id,
@@ -187,26 +297,28 @@ async def end_interview(
             completed_at=datetime.utcnow()
         )
         
-        print(f"[DEBUG] Adding to database...")
-        db.add(interview_record)
-        print(f"[DEBUG] Committing...")
-        db.commit()
-        print(f"[DEBUG] Refreshing...")
-        db.refresh(interview_record)
-        print(f"[DEBUG] Interview saved with ID: {interview_record.id}")
+        # Blocking DB work (and a histogram swap's lock wait) stays off the event loop
+        percentiles = await run_in_threadpool(_save_interview, db, interview_record)
+        logger.info("interview_saved", extra={
+            "session_id": request.session_id,
+            "interview_id": interview_record.id,
+            "overall_score": interview_record.overall_score
+        })
         
         # Clean up session
         interview_agent.end_interview(request.session_id)
+        frame_scheduler.clear_session(request.session_id)
+        request_coalescer.clear_session(request.session_id)
         
         return {
             **feedback,
             "interview_id": interview_record.id,
+            "percentiles": percentiles,
+            "cohort": {"role": interview_record.role, "interview_round": interview_record.interview_round},
             "saved": True
         }
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Failed to end interview: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        logger.error("end_interview_failed", exc_info=True, extra={"session_id": request.session_id})
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -217,64 +329,275 @@ async def get_interview_status(
 ):
     """Get current interview status"""
     try:
+        _ensure_session(session_id)
         status = interview_agent.get_interview_status(session_id)
         return status
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+def _current_question(session_id: str) -> str:
+    """Latest interviewer message for the session, used as vision prompt context"""
+    for msg in reversed(interview_agent.conversation_history.get(session_id, [])):
+        if msg["role"] == "assistant":
+            return msg["content"][:200]
+    return ""
+
+async def _analyze_admitted_frame(session_id: str, analyze, *args) -> dict:
+    """Run a vision call under the frame scheduler's budget.
+
+    The response carries next_frame_after_ms; frames sent while the session
+    (or the worker) is over its vision budget get a 429 with Retry-After.
+    """
+    _ensure_session(session_id)
+    session = interview_agent.sessions.get(session_id, {})
+    try:
+        started_at = frame_scheduler.acquire(session_id)
+        try:
+            # Frames are sampled, never queued - a throttled frame is simply skipped
+            await rate_limiter.admit("vision", VISION_FRAME_TOKENS, user_id=session.get("user_id"),
+                                     session_id=session_id, max_wait=0)
+        except BaseException:
+            # Throttled, or the socket closed and cancelled this task - give the slot back either way
+            frame_scheduler.cancel(session_id)
+            raise
+    except (FrameBudgetExceeded, RateLimitExceeded) as e:
+        raise HTTPException(
+            status_code=429,
+            detail={"message": str(e), "next_frame_after_ms": e.retry_after_ms},
+            headers={"Retry-After": str(e.retry_after_seconds)}
+        )
+    
+    try:
+        # Vision calls block for seconds - keep them off the event loop
+        with track_frame_in_flight():
+            analysis = await run_in_threadpool(analyze, session_id, *args)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Also runs on CancelledError (socket closed mid-analysis), or the session stays throttled for good
+        next_frame_after_ms = frame_scheduler.release(session_id, started_at)
+    
+    return {
+        "session_id": session_id,
+        "analysis": analysis,
+        "next_frame_after_ms": next_frame_after_ms,
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.post("/video-frame")
 async def analyze_video_frame(
     request: VideoFrameRequest,
     current_user: User = Depends(get_current_user)
 ):
-    """Analyze a video frame from the candidate's webcam"""
-    try:
-        current_question = ""
-        if request.session_id in interview_agent.conversation_history:
-            history = interview_agent.conversation_history[request.session_id]
-            for msg in reversed(history):
-                if msg["role"] == "assistant":
-                    current_question = msg["content"][:200]
-                    break
-        
-        analysis = video_analyzer.analyze_frame(
-            request.session_id,
-            request.image_base64,
-            current_question or request.current_question
-        )
-        
-        return {
-            "session_id": request.session_id,
-            "analysis": analysis,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Analyze a base64-encoded video frame from the candidate's webcam"""
+    return await _analyze_admitted_frame(
+        request.session_id,
+        video_analyzer.analyze_frame,
+        request.image_base64,
+        _current_question(request.session_id) or request.current_question
+    )
+
+@router.post("/video-frame/binary")
+async def analyze_binary_video_frame(
+    request: Request,
+    session_id: str,
+    current_question: Optional[str] = "",
+    current_user: User = Depends(get_current_user)
+):
+    """Analyze a video frame sent as a raw image/jpeg, image/webp or image/png body"""
+    mime_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if mime_type not in FRAME_MIME_TYPES:
+        raise HTTPException(status_code=415, detail=f"Frame must be one of: {', '.join(sorted(FRAME_MIME_TYPES))}")
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FRAME_BYTES:
+        raise HTTPException(status_code=413, detail=f"Frame exceeds {MAX_FRAME_BYTES} bytes")
+    
+    # Collect the body chunks and join once - the image is never decoded here
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_FRAME_BYTES:
+            raise HTTPException(status_code=413, detail=f"Frame exceeds {MAX_FRAME_BYTES} bytes")
+        chunks.append(chunk)
+    if not received:
+        raise HTTPException(status_code=400, detail="Empty frame")
+    image_bytes = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    
+    return await _analyze_admitted_frame(
+        session_id,
+        video_analyzer.analyze_frame_bytes,
+        image_bytes,
+        mime_type,
+        _current_question(session_id) or current_question
+    )
+
+async def _handle_code_submission(session_id: str, code: str, language: str, idempotency_key: Optional[str] = None,
+                                  turn_lock: Optional[asyncio.Lock] = None) -> dict:
+    """Review a code submission (shared by HTTP and the session WebSocket); duplicates share one review"""
+    _ensure_session(session_id)
+    
+    async def review():
+        async with turn_lock or nullcontext():
+            analysis = await run_in_threadpool(analyze_code, code, language)
+            # Syntax errors are answered locally, so they cost no LLM tokens
+            if analysis is None or analysis["syntax_error"] is None:
+                await _admit(session_id, "llm", estimate_code_review_tokens(code))
+            result = await run_in_threadpool(interview_agent.submit_code, session_id, code, language, analysis)
+            
+            if session_id in interview_agent.conversation_history:
+                history = interview_agent.conversation_history[session_id]
+                last_message = history[-1] if history else None
+                if last_message and last_message["role"] == "assistant":
+                    return {
+                        "session_id": session_id,
+                        "review": last_message["content"],
+                        "submission_count": result["submission_count"],
+                        "analysis": result.get("analysis"),
+                        "execution": result.get("execution"),
+                        "cached_review": result.get("cached_review", False),
+                        "timestamp": datetime.now().isoformat()
+                    }
+            
+            return result
+    
+    payload = {"code": code.strip(), "language": language}
+    return await request_coalescer.run(session_id, "code", payload, idempotency_key, review)
 
 @router.post("/code-submission")
 async def submit_code(
     request: CodeSubmissionRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None)
 ):
     """Submit code for review during interview"""
     try:
-        result = interview_agent.submit_code(
-            request.session_id,
-            request.code,
-            request.language
-        )
-        
-        if request.session_id in interview_agent.conversation_history:
-            history = interview_agent.conversation_history[request.session_id]
-            last_message = history[-1] if history else None
-            if last_message and last_message["role"] == "assistant":
-                return {
-                    "session_id": request.session_id,
-                    "review": last_message["content"],
-                    "submission_count": result["submission_count"],
-                    "timestamp": datetime.now().isoformat()
-                }
-        
-        return result
+        return await _handle_code_submission(request.session_id, request.code, request.language, idempotency_key)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _frame_mime_type(image_bytes: bytes) -> str:
+    """Sniff the image type of a binary WebSocket frame"""
+    if image_bytes.startswith(b"\x89PNG"):
+        return "image/png"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+@router.websocket("/ws/{session_id}")
+async def interview_socket(websocket: WebSocket, session_id: str, token: str = ""):
+    """One authenticated channel per interview session.
+    
+    The token is checked once at the handshake. Client events are JSON text
+    ({"type": "message" | "code" | "status", "id": ...}) or binary webcam
+    frames; the server answers with "reply", "code_review", "frame_analysis",
+    "frame_throttled", "status" and "error" events, echoing the client "id".
+    """
+    db = SessionLocal()
+    try:
+        user = authenticate_token(token, db)
+    except HTTPException:
+        await websocket.close(code=WS_CLOSE_UNAUTHORIZED)
+        return
+    finally:
+        db.close()
+    
+    _ensure_session(session_id)
+    session = interview_agent.sessions.get(session_id)
+    if session is None or session.get("user_id") != user.id:
+        await websocket.close(code=WS_CLOSE_FORBIDDEN)
+        return
+    
+    await websocket.accept()
+    logger.info("session_socket_opened", extra={"session_id": session_id, "user_id": user.id})
+    
+    send_lock = asyncio.Lock()
+    # Messages and code submissions change the conversation - run them one at a time, in order
+    turn_lock = asyncio.Lock()
+    tasks = set()
+    
+    async def send(event: dict):
+        try:
+            async with send_lock:
+                await websocket.send_json(jsonable_encoder(event))
+        except Exception:
+            # Client went away mid-send; the receive loop notices the disconnect
+            pass
+    
+    async def send_status(request_id=None):
+        await send({**interview_agent.get_interview_status(session_id), "type": "status", "id": request_id})
+    
+    async def handle(event: dict):
+        event_type = event.get("type")
+        request_id = event.get("id")
+        try:
+            if event_type == "message":
+                result = await _handle_message(
+                    session_id, event.get("message", ""), bool(event.get("is_voice")), event.get("idempotency_key"),
+                    turn_lock=turn_lock
+                )
+                await send({**result, "type": "reply", "id": request_id})
+                await send_status()
+            elif event_type == "code":
+                result = await _handle_code_submission(
+                    session_id, event.get("code", ""), event.get("language", "text"), event.get("idempotency_key"),
+                    turn_lock=turn_lock
+                )
+                await send({**result, "type": "code_review", "id": request_id})
+                await send_status()
+            elif event_type == "frame":
+                image_bytes = event["image"]
+                if len(image_bytes) > MAX_FRAME_BYTES:
+                    raise ValueError(f"Frame exceeds {MAX_FRAME_BYTES} bytes")
+                try:
+                    result = await _analyze_admitted_frame(
+                        session_id,
+                        video_analyzer.analyze_frame_bytes,
+                        image_bytes,
+                        _frame_mime_type(image_bytes),
+                        _current_question(session_id)
+                    )
+                except HTTPException as e:
+                    if e.status_code != 429:
+                        raise
+                    await send({**e.detail, "type": "frame_throttled"})
+                    return
+                await send({**result, "type": "frame_analysis"})
+            elif event_type == "status":
+                await send_status(request_id)
+            else:
+                raise ValueError(f"Unknown event type: {event_type}")
+        except Exception as e:
+            status = e.status_code if isinstance(e, HTTPException) else 500
+            message = e.detail if isinstance(e, HTTPException) else str(e)
+            await send({"type": "error", "id": request_id, "request_type": event_type, "status": status, "message": message})
+    
+    try:
+        while True:
+            packet = await websocket.receive()
+            if packet["type"] == "websocket.disconnect":
+                break
+            if packet.get("bytes") is not None:
+                event = {"type": "frame", "image": packet["bytes"]}
+            else:
+                try:
+                    event = json.loads(packet.get("text") or "")
+                except ValueError:
+                    await send({"type": "error", "message": "Events must be JSON objects"})
+                    continue
+                if not isinstance(event, dict):
+                    await send({"type": "error", "message": "Events must be JSON objects"})
+                    continue
+            # Frames are analyzed while replies are generated - don't block the receive loop
+            task = asyncio.create_task(handle(event))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        logger.info("session_socket_closed", extra={"session_id": session_id})
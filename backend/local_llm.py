@@ -0,0 +1,112 @@
+"""
+Local LLM provider - a quantised GGUF model on CPU via llama-cpp-python, used when the cloud providers fail
+
+Optional: without llama-cpp-python installed or LOCAL_LLM_MODEL_PATH set, every
+call returns None and callers keep their previous fallback behaviour.
+"""
+import importlib.util
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from logger import get_logger
+from metrics import track_llm_call
+
+logger = get_logger("local_llm")
+
+LLAMA_CPP_AVAILABLE = importlib.util.find_spec("llama_cpp") is not None
+
+# Path to a GGUF file, e.g. a Q4_K_M build of a 1-3B instruct model
+LOCAL_LLM_MODEL_PATH = os.getenv("LOCAL_LLM_MODEL_PATH", "")
+# Model instances loaded at once; each decodes one request at a time
+LOCAL_LLM_WORKERS = int(os.getenv("LOCAL_LLM_WORKERS", "2"))
+LOCAL_LLM_CONTEXT = int(os.getenv("LOCAL_LLM_CONTEXT", "4096"))
+# Prompt tokens evaluated per forward pass
+LOCAL_LLM_BATCH = int(os.getenv("LOCAL_LLM_BATCH", "512"))
+# CPU threads per instance; by default the cores are split between the instances
+LOCAL_LLM_THREADS = int(os.getenv("LOCAL_LLM_THREADS", "0")) or max(1, (os.cpu_count() or 2) // max(1, LOCAL_LLM_WORKERS))
+# Longest a request waits for a free instance before giving up
+LOCAL_LLM_QUEUE_SECONDS = float(os.getenv("LOCAL_LLM_QUEUE_SECONDS", "30"))
+
+
+class LocalLLM:
+    """A fixed pool of preloaded llama.cpp instances behind a queue.
+
+    llama.cpp contexts are not thread-safe, so each request borrows a whole
+    instance. The weights are mmapped, so extra instances mostly cost KV cache,
+    not another copy of the model.
+    """
+
+    def __init__(self, model_path: str = LOCAL_LLM_MODEL_PATH, workers: int = LOCAL_LLM_WORKERS):
+        self.model_path = model_path
+        self.workers = max(1, workers)
+        self.model_name = os.path.basename(model_path) or "local"
+        self.instances: "queue.Queue" = queue.Queue()
+        self.loaded = False
+        self.load_error: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return LLAMA_CPP_AVAILABLE and bool(self.model_path)
+
+    def load(self) -> bool:
+        """Load every instance up front (called from the startup warm-up)"""
+        if not self.enabled():
+            return False
+        with self.lock:
+            if self.loaded or self.load_error:
+                return self.loaded
+            try:
+                from llama_cpp import Llama
+                for _ in range(self.workers):
+                    self.instances.put(Llama(
+                        model_path=self.model_path,
+                        n_ctx=LOCAL_LLM_CONTEXT,
+                        n_batch=LOCAL_LLM_BATCH,
+                        n_threads=LOCAL_LLM_THREADS,
+                        use_mmap=True,
+                        verbose=False
+                    ))
+            except Exception as e:
+                # Don't retry a broken model file on every request
+                self.load_error = str(e)
+                logger.error("local_llm_load_failed", extra={"model": self.model_path, "error": self.load_error})
+                return False
+            self.loaded = True
+        logger.info("local_llm_loaded", extra={
+            "model": self.model_name, "workers": self.workers, "threads": LOCAL_LLM_THREADS
+        })
+        return True
+
+    def chat(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 200,
+             json_mode: bool = False) -> Optional[str]:
+        """Complete a chat conversation; None if the local model is unavailable or busy"""
+        if not self.load():
+            return None
+        try:
+            llm = self.instances.get(timeout=LOCAL_LLM_QUEUE_SECONDS)
+        except queue.Empty:
+            logger.warning("local_llm_busy", extra={"workers": self.workers})
+            return None
+        try:
+            kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+            with track_llm_call("local", self.model_name) as call:
+                response = llm.create_chat_completion(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs
+                )
+                usage = response.get("usage")
+                if usage:
+                    call.record_usage(usage["prompt_tokens"], usage["completion_tokens"])
+            return response["choices"][0]["message"]["content"].strip()
+        except Exception as e:
+            logger.error("local_llm_failed", extra={"model": self.model_name, "error": str(e)})
+            return None
+        finally:
+            self.instances.put(llm)
+
+
+local_llm = LocalLLM()
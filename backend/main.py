@@ -2,10 +2,11 @@
 Eightfold.ai Interview Practice Partner
 Main FastAPI application entry point
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -20,9 +21,16 @@ else:
 
 # Import routes
 from auth_routes import router as auth_router
-from interview_routes import router as interview_router
+from interview_routes import router as interview_router, drain_sessions
 from reports_routes import router as reports_router
+from admin_routes import router as admin_router
 from db_config import init_db
+from resume_parser import shutdown_parse_executor, ResumeUploadLimit
+from code_sandbox import shutdown_sandbox_pool
+from session_store import install_drain_handler
+from logger import shutdown_logging
+from warmup import start_warmup
+from metrics import HTTP_REQUEST_LATENCY, route_template, render_metrics
 
 app = FastAPI(
     title="Interview Practice Partner API",
@@ -30,6 +38,10 @@ app = FastAPI(
     version="2.0.0"
 )
 
+# Oversized resume uploads get a 413 before the multipart parser spools them.
+# Added before CORS so the rejection still carries the CORS headers.
+app.add_middleware(ResumeUploadLimit)
+
 # CORS middleware for frontend communication - MUST be before routes
 # Allow both local development and production URLs
 allowed_origins = [
@@ -51,16 +63,43 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Request latency histogram, labelled by route template rather than raw path
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_LATENCY.labels(
+            request.method, route_template(request), str(status_code)
+        ).observe(time.perf_counter() - start)
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
     init_db()
+    # SIGTERM starts the drain (503 on new /start) before uvicorn stops accepting connections
+    install_drain_handler()
+    # Provider SDKs load off the request path, after the server is already accepting traffic
+    start_warmup()
     print("[OK] Application started successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Hand live interviews over to the next worker before this one exits
+    drain_sessions()
+    shutdown_parse_executor()
+    shutdown_sandbox_pool()
+    shutdown_logging()
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(interview_router)
 app.include_router(reports_router)
+app.include_router(admin_router)
 
 @app.get("/")
 async def root():
@@ -71,6 +110,12 @@ async def root():
         "features": ["authentication", "interview_history", "reports"]
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
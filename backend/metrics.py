@@ -0,0 +1,189 @@
+"""
+Prometheus metrics - latency histograms, token counters and live gauges
+"""
+import time
+from contextlib import contextmanager
+
+# prometheus_client is optional - metrics become no-ops without it
+try:
+    from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def dec(self, *args, **kwargs):
+        pass
+
+    def set(self, *args, **kwargs):
+        pass
+
+    def set_function(self, *args, **kwargs):
+        pass
+
+
+if not PROMETHEUS_AVAILABLE:
+    Counter = Gauge = Histogram = _NoopMetric
+
+    def generate_latest(*args, **kwargs) -> bytes:
+        return b"# prometheus_client not installed\n"
+
+
+# Buckets sized for LLM / vision calls, which take from ~100ms to tens of seconds
+SLOW_CALL_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+FAST_CALL_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=SLOW_CALL_BUCKETS
+)
+LLM_REQUEST_LATENCY = Histogram(
+    "llm_request_duration_seconds", "LLM completion latency",
+    ["provider", "model", "outcome"], buckets=SLOW_CALL_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "LLM tokens sent and received",
+    ["provider", "model", "direction"]
+)
+VISION_REQUEST_LATENCY = Histogram(
+    "vision_request_duration_seconds", "Vision model latency per analyzed frame",
+    ["provider", "outcome"], buckets=SLOW_CALL_BUCKETS
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Database statement execution time",
+    ["operation"], buckets=FAST_CALL_BUCKETS
+)
+DB_SESSION_DURATION = Histogram(
+    "db_session_duration_seconds", "Time a request held a database session",
+    buckets=FAST_CALL_BUCKETS
+)
+ACTIVE_SESSIONS = Gauge("interview_active_sessions", "Interview sessions currently active in this worker")
+FRAME_QUEUE_DEPTH = Gauge("video_frame_queue_depth", "Video frames currently being analyzed in this worker")
+COALESCED_REQUESTS = Counter(
+    "coalesced_requests_total", "Duplicate requests served from an in-flight or cached result",
+    ["kind"]
+)
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total", "Admission control decisions",
+    ["pool", "outcome"]
+)
+CODE_REVIEW_CACHE = Counter(
+    "code_review_cache_total", "Code review cache lookups",
+    ["outcome"]
+)
+
+
+class LLMCallTimer:
+    """Times one LLM call; the caller reports token usage from the response"""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._start = 0.0
+
+    def record_usage(self, prompt_tokens, completion_tokens):
+        if prompt_tokens:
+            LLM_TOKENS.labels(self.provider, self.model, "in").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(self.provider, self.model, "out").inc(completion_tokens)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        outcome = "error" if exc_type else "ok"
+        LLM_REQUEST_LATENCY.labels(self.provider, self.model, outcome).observe(time.perf_counter() - self._start)
+        return False
+
+
+def track_llm_call(provider: str, model: str) -> LLMCallTimer:
+    """Context manager timing an LLM call: `with track_llm_call("groq", model) as call:`"""
+    return LLMCallTimer(provider, model)
+
+
+@contextmanager
+def track_vision_call(provider: str):
+    """Time a vision model call"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        VISION_REQUEST_LATENCY.labels(provider, outcome).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_frame_in_flight():
+    """Count a frame as queued/in analysis for the frame-queue-depth gauge"""
+    FRAME_QUEUE_DEPTH.inc()
+    try:
+        yield
+    finally:
+        FRAME_QUEUE_DEPTH.dec()
+
+
+@contextmanager
+def track_db_session():
+    """Time how long a request holds a database session"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_SESSION_DURATION.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine):
+    """Record per-statement execution time for a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start_time"].pop()
+        operation = statement.lstrip().split(" ", 1)[0].upper() or "UNKNOWN"
+        DB_QUERY_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+def route_template(request) -> str:
+    """Route path template for a request (keeps session ids out of metric labels)"""
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
+    from starlette.routing import Match
+    for candidate in request.app.routes:
+        match, _ = candidate.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(candidate, "path", "unmatched")
+    return "unmatched"
+
+
+def render_metrics():
+    """Return (body, content_type) for the /metrics endpoint"""
+    return generate_latest(), CONTENT_TYPE_LATEST
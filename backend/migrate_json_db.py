@@ -0,0 +1,41 @@
+"""
+Import the legacy JSON files (data/users.json, data/interviews.json) into the
+embedded SQLite store used by database.py
+
+Usage:
+    python migrate_json_db.py [--users data/users.json] [--interviews data/interviews.json] [--db data/local.db]
+"""
+import argparse
+import os
+
+from database import Database, DB_FILE, USERS_FILE, INTERVIEWS_FILE, load_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy JSON user/interview files into SQLite")
+    parser.add_argument("--users", default=USERS_FILE)
+    parser.add_argument("--interviews", default=INTERVIEWS_FILE)
+    parser.add_argument("--db", default=DB_FILE)
+    args = parser.parse_args()
+
+    users = load_json(args.users)
+    interviews = load_json(args.interviews)
+    if not users and not interviews:
+        print(f"[INFO] Nothing to import ({args.users}, {args.interviews} missing or empty)")
+        return
+
+    database = Database(args.db)
+    try:
+        result = database.import_json(users, interviews)
+    finally:
+        database.close()
+
+    print(f"[OK] Imported {result['users']} users and {result['interviews']} interviews into {args.db} "
+          f"({result['skipped']} already present)")
+    for path in (args.users, args.interviews):
+        if os.path.exists(path):
+            print(f"[INFO] {path} can be archived; it is no longer read")
+
+
+if __name__ == "__main__":
+    main()
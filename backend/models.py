@@ -1,13 +1,50 @@
 """
 Database models for user authentication and interview history
 """
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, Text, JSON, ForeignKey, Boolean, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
+import json
+
+from compression import compress_text, decompress_text, is_compressed
 
 Base = declarative_base()
 
+
+class CompressedText(TypeDecorator):
+    """Text stored zstd-compressed (see compression.py); plain legacy values read back unchanged"""
+    
+    impl = Text
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress_text(value)
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else decompress_text(value)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON document stored as one compressed string when that is smaller"""
+    
+    impl = JSON
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        text = json.dumps(value, default=str)
+        compressed = compress_text(text)
+        return compressed if compressed is not text else value
+    
+    def process_result_value(self, value, dialect):
+        if is_compressed(value):
+            return json.loads(decompress_text(value))
+        return value
+
+
 class User(Base):
     __tablename__ = "users"
     
@@ -44,11 +81,11 @@ class Interview(Base):
     strengths = Column(JSON, nullable=True)
     areas_for_improvement = Column(JSON, nullable=True)
     recommendations = Column(JSON, nullable=True)
-    detailed_analysis = Column(Text, nullable=True)
-    detailed_feedback = Column(Text, nullable=True)
+    detailed_analysis = Column(CompressedText, nullable=True)
+    detailed_feedback = Column(CompressedText, nullable=True)
     
     # Video analysis
-    video_analysis = Column(JSON, nullable=True)
+    video_analysis = Column(CompressedJSON, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -56,3 +93,114 @@ class Interview(Base):
     
     # Relationship
     user = relationship("User", back_populates="interviews")
+
+class ResumeCache(Base):
+    __tablename__ = "resume_cache"
+    
+    # SHA-256 of the uploaded PDF bytes
+    sha256 = Column(String(64), primary_key=True)
+    
+    resume_text = Column(Text, nullable=False)
+    resume_digest = Column(Text, nullable=True)  # Compact LLM summary, filled in after parsing
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+class ResumeUpload(Base):
+    __tablename__ = "resume_uploads"
+    
+    # Users who uploaded each cached resume; /start only reuses a resume_hash the caller uploaded
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sha256 = Column(String(64), ForeignKey("resume_cache.sha256"), primary_key=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SessionSnapshot(Base):
+    __tablename__ = "session_snapshots"
+    
+    # Live interview state written on worker shutdown, restored on first access afterwards
+    session_id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    session = Column(JSON, nullable=False)
+    conversation_history = Column(CompressedJSON, nullable=True)
+    code_submissions = Column(JSON, nullable=True)
+    turn_scores = Column(JSON, nullable=True)
+    frame_analyses = Column(CompressedJSON, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    
+    # "user:<id>", "session:<id>" or "global:<pool>"
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)  # Negative while callers hold reservations
+    updated_at = Column(Float, nullable=False)  # time.time() of the last refill
+
+class CodeReviewCache(Base):
+    __tablename__ = "code_review_cache"
+    
+    # SHA-256 of (language, question key, normalized code)
+    key = Column(String(64), primary_key=True)
+    language = Column(String, nullable=False)
+    question_key = Column(String, nullable=False)  # Catalogue problem id, or a hash of the question text
+    
+    review = Column(Text, nullable=False)  # Review part only; follow-up questions are never cached
+    hits = Column(Integer, default=0)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+class ExportWatermark(Base):
+    __tablename__ = "export_watermarks"
+    
+    # One per export consumer (see interview_export.py)
+    name = Column(String, primary_key=True)
+    completed_at = Column(DateTime, nullable=True)  # completed_at of the last exported interview
+    last_id = Column(Integer, default=0)  # Its id
+    rows_exported = Column(Integer, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ExportWatermarkId(Base):
+    __tablename__ = "export_watermark_ids"
+    
+    # Interviews exported within the overlap window behind a watermark, so re-reading it skips them
+    name = Column(String, primary_key=True)
+    interview_id = Column(Integer, primary_key=True)
+    completed_at = Column(DateTime, nullable=False, index=True)
+
+class ScoreHistogramBin(Base):
+    __tablename__ = "score_histogram_bins"
+    
+    # Number of (role, round) interviews with this score - see score_distributions.py
+    role = Column(String, primary_key=True)
+    interview_round = Column(String, primary_key=True)
+    metric = Column(String, primary_key=True)  # overall_score / communication_score / technical_score / preparation_score
+    score = Column(Integer, primary_key=True)  # 0-10
+    count = Column(Integer, nullable=False, default=0)
+
+class AskedQuestion(Base):
+    __tablename__ = "asked_questions"
+    
+    # Interviewer questions per user, for avoiding repeats across sessions (see question_memory.py)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    session_id = Column(String, nullable=False)
+    role = Column(String, nullable=True)
+    interview_round = Column(String, nullable=True)
+    
+    question = Column(Text, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 hashing-vectoriser embedding
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class ZstdDictionary(Base):
+    __tablename__ = "zstd_dictionaries"
+    
+    # Trained compression dictionaries (see compression.py); rows written with one need it to be read
+    dict_id = Column(BigInteger, primary_key=True, autoincrement=False)  # zstd dictionary id (unsigned 32-bit)
+    data = Column(LargeBinary, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
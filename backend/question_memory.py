@@ -0,0 +1,214 @@
+"""
+Question memory - remembers what each user was asked in earlier sessions so the interviewer can avoid repeats
+
+Questions are embedded with a signed hashing vectoriser (words and word
+bigrams, no model to download) and kept per user as one float32 matrix, so a
+lookup is a single matrix-vector product. Vectors are persisted in the
+asked_questions table and (re)loaded whenever one of the user's interviews
+starts, so questions asked through other workers are picked up.
+"""
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from logger import get_logger
+
+logger = get_logger("question_memory")
+
+QUESTION_MEMORY_ENABLED = os.getenv("QUESTION_MEMORY_ENABLED", "1") != "0"
+QUESTION_MEMORY_DIM = int(os.getenv("QUESTION_MEMORY_DIM", "1024"))
+# Most recent questions kept per user
+QUESTION_MEMORY_MAX_PER_USER = int(os.getenv("QUESTION_MEMORY_MAX_PER_USER", "500"))
+# Users whose index stays in this worker's memory
+QUESTION_MEMORY_USERS = int(os.getenv("QUESTION_MEMORY_USERS", "1024"))
+# Past questions listed in the prompt, and how close they must be to the conversation
+QUESTION_MEMORY_AVOID_COUNT = int(os.getenv("QUESTION_MEMORY_AVOID_COUNT", "5"))
+QUESTION_MEMORY_MIN_SIMILARITY = float(os.getenv("QUESTION_MEMORY_MIN_SIMILARITY", "0.15"))
+
+MAX_QUESTION_CHARS = 300
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "can", "could", "did", "do", "does", "for", "from", "have",
+    "how", "i", "if", "in", "is", "it", "me", "of", "on", "or", "so", "that", "the", "this", "to", "was",
+    "we", "what", "when", "where", "which", "who", "why", "with", "would", "you", "your", "tell", "about",
+    "share", "walk", "through", "describe", "explain", "let", "s", "great", "thanks", "thank", "now",
+}
+
+
+def extract_question(message: str) -> str:
+    """The question part of an interviewer reply (its last sentences ending in '?')"""
+    sentences = [sentence.strip() for sentence in _SENTENCE_RE.split(message.strip()) if sentence.strip()]
+    questions = [sentence for sentence in sentences if sentence.endswith("?")]
+    text = " ".join(questions[-2:]) if questions else (sentences[-1] if sentences else "")
+    return text[:MAX_QUESTION_CHARS]
+
+
+def embed(text: str, dim: int = QUESTION_MEMORY_DIM) -> np.ndarray:
+    """L2-normalised signed feature hash of a text's content words and word bigrams"""
+    words = [word for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS]
+    features = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in features:
+        # crc32 rather than hash(): stable across processes, so stored vectors stay valid
+        hashed = zlib.crc32(feature.encode("utf-8"))
+        vector[hashed % dim] += 1.0 if hashed & 0x80000000 else -1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class _UserIndex:
+    """One user's past questions: rows of a float32 matrix plus their metadata"""
+
+    def __init__(self, dim: int):
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self.questions: List[str] = []
+        self.session_ids: List[str] = []
+        self.cohorts: List[str] = []  # "role/round"
+
+    def add(self, vectors: np.ndarray, questions: List[str], session_ids: List[str], cohorts: List[str]):
+        self.matrix = np.vstack([self.matrix, vectors])[-QUESTION_MEMORY_MAX_PER_USER:]
+        self.questions = (self.questions + questions)[-QUESTION_MEMORY_MAX_PER_USER:]
+        self.session_ids = (self.session_ids + session_ids)[-QUESTION_MEMORY_MAX_PER_USER:]
+        self.cohorts = (self.cohorts + cohorts)[-QUESTION_MEMORY_MAX_PER_USER:]
+
+
+class QuestionMemory:
+    """Per-user brute-force similarity index over previously asked questions"""
+
+    def __init__(self, dim: int = QUESTION_MEMORY_DIM, max_users: int = QUESTION_MEMORY_USERS, use_db: bool = True):
+        self.dim = dim
+        self.max_users = max(1, max_users)
+        self.use_db = use_db
+        self.indexes: "OrderedDict[int, _UserIndex]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _index(self, user_id: int, refresh: bool = False) -> _UserIndex:
+        refresh = refresh and self.use_db
+        with self.lock:
+            index = self.indexes.get(user_id)
+            if index is not None and not refresh:
+                self.indexes.move_to_end(user_id)
+                return index
+        index = _UserIndex(self.dim)
+        if self.use_db:
+            self._db_load(user_id, index)
+        with self.lock:
+            if refresh:
+                self.indexes[user_id] = index
+            else:
+                # Another thread may have loaded it meanwhile; keep the first
+                index = self.indexes.setdefault(user_id, index)
+            self.indexes.move_to_end(user_id)
+            while len(self.indexes) > self.max_users:
+                self.indexes.popitem(last=False)
+        return index
+
+    def preload(self, user_id: Optional[int]):
+        """(Re)load a user's index from the database ahead of their first turn.
+
+        Always reloads: the user's previous sessions may have run on other
+        workers, whose questions this worker's cached index doesn't have.
+        """
+        if QUESTION_MEMORY_ENABLED and user_id is not None:
+            self._index(user_id, refresh=True)
+
+    def remember(self, session: Dict, message: str):
+        """Record the question in an interviewer reply for the session's user"""
+        user_id = session.get("user_id")
+        question = extract_question(message)
+        if not QUESTION_MEMORY_ENABLED or user_id is None or not question:
+            return
+        vector = embed(question, self.dim)
+        cohort = f"{session.get('role')}/{session.get('interview_round')}"
+        index = self._index(user_id)
+        with self.lock:
+            index.add(vector[None, :], [question], [session["session_id"]], [cohort])
+        if self.use_db:
+            self._db_add(user_id, session, question, vector)
+
+    def similar(self, session: Dict, context: str, limit: int = QUESTION_MEMORY_AVOID_COUNT,
+                min_similarity: float = QUESTION_MEMORY_MIN_SIMILARITY) -> List[str]:
+        """Past questions from this user's other sessions (same role and round) closest to context"""
+        user_id = session.get("user_id")
+        if not QUESTION_MEMORY_ENABLED or user_id is None or limit <= 0:
+            return []
+        index = self._index(user_id)
+        cohort = f"{session.get('role')}/{session.get('interview_round')}"
+        with self.lock:
+            matrix, questions = index.matrix, index.questions
+            eligible = np.fromiter(
+                (c == cohort and s != session["session_id"] for c, s in zip(index.cohorts, index.session_ids)),
+                dtype=bool, count=len(questions)
+            )
+        if not eligible.any():
+            return []
+
+        scores = matrix @ embed(context, self.dim)
+        scores[~eligible] = -1.0
+        top = np.argpartition(-scores, limit - 1)[:limit] if len(scores) > limit else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for row in top:
+            if scores[row] < min_similarity:
+                break
+            if questions[row] not in results:
+                results.append(questions[row])
+        return results
+
+    def _db_load(self, user_id: int, index: _UserIndex):
+        from db_config import SessionLocal
+        from models import AskedQuestion
+
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                AskedQuestion.question, AskedQuestion.vector, AskedQuestion.session_id,
+                AskedQuestion.role, AskedQuestion.interview_round
+            ).filter(AskedQuestion.user_id == user_id)\
+                .order_by(AskedQuestion.id.desc())\
+                .limit(QUESTION_MEMORY_MAX_PER_USER)\
+                .all()
+        except Exception as e:
+            logger.warning("question_memory_load_failed", extra={"user_id": user_id, "error": str(e)})
+            return
+        finally:
+            db.close()
+
+        rows.reverse()
+        if rows:
+            index.add(
+                # Rows stored with another QUESTION_MEMORY_DIM are re-embedded rather than dropped
+                np.vstack([
+                    vector if len(vector) == self.dim else embed(row.question, self.dim)
+                    for row, vector in ((row, np.frombuffer(row.vector, dtype=np.float32)) for row in rows)
+                ]),
+                [row.question for row in rows], [row.session_id for row in rows],
+                [f"{row.role}/{row.interview_round}" for row in rows]
+            )
+
+    def _db_add(self, user_id: int, session: Dict, question: str, vector: np.ndarray):
+        from db_config import SessionLocal
+        from models import AskedQuestion
+
+        db = SessionLocal()
+        try:
+            db.add(AskedQuestion(
+                user_id=user_id, session_id=session["session_id"], role=session.get("role"),
+                interview_round=session.get("interview_round"), question=question, vector=vector.tobytes()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("question_memory_store_failed", extra={"user_id": user_id, "error": str(e)})
+        finally:
+            db.close()
+
+
+question_memory = QuestionMemory()
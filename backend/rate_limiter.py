@@ -0,0 +1,212 @@
+"""
+Admission control - token buckets per user, per session and globally, charged in estimated LLM tokens
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from metrics import RATE_LIMIT_DECISIONS
+
+# "memory" keeps buckets in this worker, so N workers admit N times the limits;
+# run several workers (session_router.py, uvicorn --workers) with "db", which shares them
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+
+USER_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_USER_TOKENS_PER_MINUTE", "20000"))
+SESSION_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_SESSION_TOKENS_PER_MINUTE", "12000"))
+GLOBAL_LLM_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE", "250000"))
+GLOBAL_VISION_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_GLOBAL_VISION_TOKENS_PER_MINUTE", "100000"))
+
+# Longest a request may wait for tokens before it is rejected with 429
+MAX_QUEUE_SECONDS = float(os.getenv("RATE_LIMIT_MAX_QUEUE_SECONDS", "5"))
+
+# Per-minute buckets are full again after a minute idle; older entries carry no state
+IDLE_BUCKET_SECONDS = 600
+
+# Rough token costs used for admission (estimates, not billing)
+CHARS_PER_TOKEN = 4
+INTERVIEW_SYSTEM_PROMPT_TOKENS = 450
+REPLY_MAX_TOKENS = 150
+TURN_SCORING_TOKENS = 600
+CODE_REVIEW_PROMPT_TOKENS = 350
+CODE_REVIEW_MAX_TOKENS = 300
+VISION_FRAME_TOKENS = 760  # image + analysis prompt + reply
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than the queue allows"""
+
+    def __init__(self, retry_after: float, bucket: str):
+        super().__init__(f"Rate limit reached ({bucket.split(':', 1)[0]}), retry in {retry_after:.1f}s")
+        self.bucket = bucket
+        self.retry_after_ms = int(retry_after * 1000)
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after_ms / 1000))
+
+
+class BucketSpec(NamedTuple):
+    key: str
+    capacity: float
+    refill_per_second: float
+
+
+def per_minute_bucket(key: str, tokens_per_minute: int) -> BucketSpec:
+    """Bucket that bursts up to one minute's allowance"""
+    return BucketSpec(key, float(tokens_per_minute), tokens_per_minute / 60.0)
+
+
+def plan_reservation(states: Dict[str, Tuple[float, float]], specs: List[BucketSpec], cost: float,
+                     now: float, max_wait: float) -> Tuple[Dict[str, Tuple[float, float]], float]:
+    """Refill each bucket, charge the cost to all of them and return (new states, seconds to wait).
+
+    Buckets may go negative: that debt is a reservation, so later callers wait
+    behind earlier ones (first come, first served) instead of racing for refills.
+    Raises RateLimitExceeded, without charging, if the wait would exceed max_wait.
+    """
+    new_states = {}
+    wait = 0.0
+    limiting_bucket = ""
+    for spec in specs:
+        tokens, updated_at = states.get(spec.key, (spec.capacity, now))
+        tokens = min(spec.capacity, tokens + max(0.0, now - updated_at) * spec.refill_per_second)
+        # A single request larger than the bucket would never fit otherwise
+        remaining = tokens - min(cost, spec.capacity)
+        if remaining < 0 and -remaining / spec.refill_per_second > wait:
+            wait = -remaining / spec.refill_per_second
+            limiting_bucket = spec.key
+        new_states[spec.key] = (remaining, now)
+
+    if wait > max_wait:
+        raise RateLimitExceeded(wait, limiting_bucket)
+    return new_states, wait
+
+
+class MemoryBucketStore:
+    """Buckets for a single worker process"""
+
+    blocking = False
+
+    def __init__(self):
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self.lock = threading.Lock()
+        self._last_prune = time.time()
+
+    def reserve(self, specs: List[BucketSpec], cost: float, max_wait: float) -> float:
+        now = time.time()
+        with self.lock:
+            new_states, wait = plan_reservation(self.buckets, specs, cost, now, max_wait)
+            self.buckets.update(new_states)
+            if now - self._last_prune > IDLE_BUCKET_SECONDS:
+                self._prune(now)
+        return wait
+
+    def _prune(self, now: float):
+        self.buckets = {
+            key: state for key, state in self.buckets.items()
+            if now - state[1] < IDLE_BUCKET_SECONDS
+        }
+        self._last_prune = now
+
+
+class DatabaseBucketStore:
+    """Buckets in the rate_limit_buckets table, shared by every worker using the database.
+
+    On PostgreSQL the bucket rows are locked with SELECT ... FOR UPDATE. SQLite
+    ignores FOR UPDATE, so there the transaction starts with BEGIN IMMEDIATE:
+    it takes the database write lock before reading, and concurrent reservations
+    queue on the busy timeout instead of charging the same refill twice.
+    """
+
+    # reserve() holds row locks across a round trip - keep it off the event loop
+    blocking = True
+
+    def reserve(self, specs: List[BucketSpec], cost: float, max_wait: float) -> float:
+        from sqlalchemy import text
+        from sqlalchemy.exc import IntegrityError
+        from db_config import SessionLocal
+        from models import RateLimitBucket
+
+        keys = [spec.key for spec in specs]
+        # A second attempt covers two workers creating the same new bucket at once
+        for attempt in range(2):
+            db = SessionLocal()
+            try:
+                if db.get_bind().dialect.name == "sqlite":
+                    db.execute(text("BEGIN IMMEDIATE"))
+                rows = {
+                    row.key: row for row in
+                    db.query(RateLimitBucket).filter(RateLimitBucket.key.in_(keys)).with_for_update()
+                }
+                states = {key: (row.tokens, row.updated_at) for key, row in rows.items()}
+                new_states, wait = plan_reservation(states, specs, cost, time.time(), max_wait)
+                for key, (tokens, updated_at) in new_states.items():
+                    if key in rows:
+                        rows[key].tokens = tokens
+                        rows[key].updated_at = updated_at
+                    else:
+                        db.add(RateLimitBucket(key=key, tokens=tokens, updated_at=updated_at))
+                db.commit()
+                return wait
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+
+class RateLimiter:
+    """Admits LLM and vision work against per-user, per-session and global token buckets"""
+
+    def __init__(self, store=None):
+        if store is None:
+            store = DatabaseBucketStore() if RATE_LIMIT_BACKEND == "db" else MemoryBucketStore()
+        self.store = store
+
+    def bucket_specs(self, pool: str, user_id: Optional[int], session_id: Optional[str]) -> List[BucketSpec]:
+        global_tokens = GLOBAL_VISION_TOKENS_PER_MINUTE if pool == "vision" else GLOBAL_LLM_TOKENS_PER_MINUTE
+        specs = [per_minute_bucket(f"global:{pool}", global_tokens)]
+        if user_id is not None:
+            specs.append(per_minute_bucket(f"user:{user_id}", USER_TOKENS_PER_MINUTE))
+        if session_id:
+            specs.append(per_minute_bucket(f"session:{session_id}", SESSION_TOKENS_PER_MINUTE))
+        return specs
+
+    async def admit(self, pool: str, cost: int, user_id: Optional[int] = None,
+                    session_id: Optional[str] = None, max_wait: float = MAX_QUEUE_SECONDS):
+        """Reserve tokens, waiting up to max_wait for them; raises RateLimitExceeded otherwise"""
+        try:
+            specs = self.bucket_specs(pool, user_id, session_id)
+            if getattr(self.store, "blocking", False):
+                wait = await run_in_threadpool(self.store.reserve, specs, cost, max_wait)
+            else:
+                wait = self.store.reserve(specs, cost, max_wait)
+        except RateLimitExceeded:
+            RATE_LIMIT_DECISIONS.labels(pool, "rejected").inc()
+            raise
+        if wait > 0:
+            RATE_LIMIT_DECISIONS.labels(pool, "queued").inc()
+            await asyncio.sleep(wait)
+        else:
+            RATE_LIMIT_DECISIONS.labels(pool, "admitted").inc()
+
+
+def estimate_message_tokens(session: Dict, history: List[Dict], message: str) -> int:
+    """Interviewer reply plus background turn scoring, sized like _build_conversation_messages"""
+    context_chars = len(message) + len(session.get("resume_context") or "")
+    context_chars += sum(len(msg["content"]) for msg in history[-10:])
+    return INTERVIEW_SYSTEM_PROMPT_TOKENS + context_chars // CHARS_PER_TOKEN + REPLY_MAX_TOKENS + TURN_SCORING_TOKENS
+
+
+def estimate_code_review_tokens(code: str) -> int:
+    """Code review call plus background turn scoring"""
+    return CODE_REVIEW_PROMPT_TOKENS + len(code) // CHARS_PER_TOKEN + CODE_REVIEW_MAX_TOKENS + TURN_SCORING_TOKENS
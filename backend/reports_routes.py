@@ -1,16 +1,36 @@
 """
 Reports routes - interview history and detailed reports
 """
+import csv
+import io
+import json
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import desc, select
+from typing import Iterator, List, Optional
 from pydantic import BaseModel
 
 from models import User, Interview
-from db_config import get_db
+from db_config import get_db, SessionLocal
 from auth import get_current_user
 
+# Columns needed for lists and stats (everything except the compressed text/JSON columns)
+SUMMARY_COLUMNS = (
+    Interview.id, Interview.session_id, Interview.role, Interview.interview_round,
+    Interview.duration_minutes, Interview.overall_score, Interview.communication_score,
+    Interview.technical_score, Interview.preparation_score, Interview.completed_at
+)
+
+# Everything in a detailed report, for the full-history download
+DETAIL_COLUMNS = SUMMARY_COLUMNS + (
+    Interview.strengths, Interview.areas_for_improvement, Interview.recommendations,
+    Interview.detailed_analysis, Interview.detailed_feedback, Interview.video_analysis
+)
+EXPORT_FETCH_SIZE = 100
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 
 # Response models
@@ -58,7 +78,9 @@ async def get_interview_history(
     offset: Optional[int] = 0
 ):
     """Get user's interview history"""
+    # Only the summary columns - the compressed feedback columns are decompressed on the detail page
     interviews = db.query(Interview)\
+        .options(load_only(*SUMMARY_COLUMNS))\
         .filter(Interview.user_id == current_user.id)\
         .order_by(desc(Interview.completed_at))\
         .limit(limit)\
@@ -81,20 +103,8 @@ async def get_interview_history(
         for interview in interviews
     ]
 
-@router.get("/{interview_id}", response_model=InterviewDetail)
-async def get_interview_detail(
-    interview_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get detailed interview report"""
-    interview = db.query(Interview)\
-        .filter(Interview.id == interview_id, Interview.user_id == current_user.id)\
-        .first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
-    
+def _detail_dict(interview) -> dict:
+    """Report fields of an Interview (or a row of DETAIL_COLUMNS)"""
     return {
         "id": interview.id,
         "session_id": interview.session_id,
@@ -114,6 +124,68 @@ async def get_interview_detail(
         "completed_at": interview.completed_at.isoformat()
     }
 
+def _stream_reports(user_id: int, fmt: str) -> Iterator[str]:
+    """One NDJSON line / CSV row per interview, read through a server-side cursor"""
+    # Own session: the request's session is closed once the route returns, before the body is sent
+    db = SessionLocal()
+    try:
+        query = select(*DETAIL_COLUMNS)\
+            .where(Interview.user_id == user_id)\
+            .order_by(desc(Interview.completed_at))\
+            .execution_options(stream_results=True, yield_per=EXPORT_FETCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        header_written = False
+        for row in db.execute(query):
+            report = _detail_dict(row)
+            if fmt == "ndjson":
+                yield json.dumps(report, default=str) + "\n"
+                continue
+            if not header_written:
+                writer.writerow(report.keys())
+                header_written = True
+            writer.writerow(
+                json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+                for value in report.values()
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    finally:
+        db.close()
+
+@router.get("/export")
+async def export_interview_history(
+    format: str = "ndjson",
+    current_user: User = Depends(get_current_user)
+):
+    """Download every interview report as NDJSON or CSV, streamed row by row"""
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    filename = f"interview-reports-{datetime.utcnow():%Y%m%d}.{format}"
+    # A plain generator is iterated in the threadpool, so the blocking DB reads stay off the event loop
+    return StreamingResponse(
+        _stream_reports(current_user.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/{interview_id}", response_model=InterviewDetail)
+async def get_interview_detail(
+    interview_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get detailed interview report"""
+    interview = db.query(Interview)\
+        .filter(Interview.id == interview_id, Interview.user_id == current_user.id)\
+        .first()
+    
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    return _detail_dict(interview)
+
 @router.get("/stats/summary")
 async def get_user_stats(
     current_user: User = Depends(get_current_user),
@@ -121,6 +193,7 @@ async def get_user_stats(
 ):
     """Get user statistics summary"""
     interviews = db.query(Interview)\
+        .options(load_only(*SUMMARY_COLUMNS))\
         .filter(Interview.user_id == current_user.id)\
         .all()
     
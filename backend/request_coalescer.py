@@ -0,0 +1,74 @@
+"""
+Request coalescing - duplicate messages and code submissions share one LLM call
+"""
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from metrics import COALESCED_REQUESTS
+
+# Completed results kept per session for idempotency-key replays
+MAX_RESULTS_PER_SESSION = 32
+
+
+class RequestCoalescer:
+    """Single-flight per session: identical in-flight requests await the same task.
+
+    Requests carrying an idempotency key also keep their result (bounded per
+    session), so a retry after completion gets the original response instead
+    of appending a second turn to the conversation.
+    """
+
+    def __init__(self, max_results_per_session: int = MAX_RESULTS_PER_SESSION):
+        self.max_results_per_session = max_results_per_session
+        self.entries: Dict[str, "OrderedDict[str, asyncio.Task]"] = {}
+
+    async def run(self, session_id: str, kind: str, payload: Dict, idempotency_key: Optional[str],
+                  factory: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Return the result of factory(), sharing it with duplicate requests"""
+        body = json.dumps(payload, sort_keys=True).encode()
+        body_key = f"{kind}:body:{hashlib.sha256(body).hexdigest()}"
+        # Keyed requests match on their key first (completed or not), then on the in-flight body like unkeyed ones
+        keys = ([f"{kind}:key:{idempotency_key}"] if idempotency_key else []) + [body_key]
+
+        entries = self.entries.setdefault(session_id, OrderedDict())
+        task = None
+        for key in keys:
+            task = entries.get(key)
+            if task is not None:
+                entries.move_to_end(key)
+                COALESCED_REQUESTS.labels(kind).inc()
+                if idempotency_key and key == body_key:
+                    # Joined another request's call; a later retry with our own key replays the same result
+                    entries[keys[0]] = task
+                    task.add_done_callback(lambda done: self._settle(session_id, keys[0], done, keep=True))
+                break
+        if task is None:
+            # A task of its own, so the call finishes (and is cached) even if the first caller disconnects
+            task = asyncio.ensure_future(factory())
+            for key in keys:
+                entries[key] = task
+                # Only the idempotency key outlives the call; body matches are in-flight only
+                task.add_done_callback(lambda done, key=key: self._settle(session_id, key, done, keep=key != body_key))
+        return await asyncio.shield(task)
+
+    def _settle(self, session_id: str, key: str, task: asyncio.Task, keep: bool):
+        entries = self.entries.get(session_id)
+        if entries is None:
+            return
+        # Failures are never cached - a retry should run again
+        failed = task.cancelled() or task.exception() is not None
+        if failed or not keep:
+            if entries.get(key) is task:
+                entries.pop(key)
+            return
+        while len(entries) > self.max_results_per_session:
+            oldest_key, oldest = next(iter(entries.items()))
+            if not oldest.done():
+                break
+            entries.pop(oldest_key)
+
+    def clear_session(self, session_id: str):
+        self.entries.pop(session_id, None)
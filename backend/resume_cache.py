@@ -0,0 +1,137 @@
+"""
+Resume Cache - Content-addressed storage of parsed resumes and their digests
+"""
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from logger import get_logger
+from models import ResumeCache, ResumeUpload
+
+logger = get_logger("resume_cache")
+
+DIGEST_INPUT_CHARS = 4000
+DIGEST_MAX_ITEMS = 8
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def resume_sha256(contents: bytes) -> str:
+    """Content address of an uploaded resume"""
+    return hashlib.sha256(contents).hexdigest()
+
+
+def _link_upload(db: Session, sha256: str, user_id: int):
+    """Record that user_id uploaded this resume (no-op if already recorded)"""
+    if db.get(ResumeUpload, (user_id, sha256)) is None:
+        db.add(ResumeUpload(user_id=user_id, sha256=sha256))
+
+
+def get_cached_resume(db: Session, sha256: str, user_id: int) -> Optional[ResumeCache]:
+    """Look up a previously parsed resume by the hash of an upload.
+
+    Only call this with a hash computed from bytes the user just uploaded;
+    the upload is linked to them so /start can reuse it.
+    """
+    entry = db.query(ResumeCache).filter(ResumeCache.sha256 == sha256).first()
+    if entry:
+        entry.last_used_at = datetime.utcnow()
+        _link_upload(db, sha256, user_id)
+        try:
+            db.commit()
+        except Exception:
+            # The same user uploaded the same resume concurrently - the link exists
+            db.rollback()
+    return entry
+
+
+def get_user_resume(db: Session, sha256: str, user_id: int) -> Optional[ResumeCache]:
+    """Look up a cached resume by a client-supplied hash, only if this user uploaded it"""
+    return (
+        db.query(ResumeCache)
+        .join(ResumeUpload, ResumeUpload.sha256 == ResumeCache.sha256)
+        .filter(ResumeCache.sha256 == sha256, ResumeUpload.user_id == user_id)
+        .first()
+    )
+
+
+def store_resume(db: Session, sha256: str, resume_text: str, user_id: int) -> ResumeCache:
+    """Store parsed resume text under its hash, linked to the uploading user"""
+    entry = ResumeCache(sha256=sha256, resume_text=resume_text)
+    db.add(entry)
+    db.add(ResumeUpload(user_id=user_id, sha256=sha256))
+    try:
+        db.commit()
+    except Exception:
+        # Another request stored the same resume concurrently
+        db.rollback()
+        entry = get_cached_resume(db, sha256, user_id)
+    return entry
+
+
+def _build_digest_prompt(resume_text: str) -> str:
+    """Build prompt asking for a compact structured resume summary"""
+    return f"""Summarize this resume for an interviewer. Respond with ONLY a JSON object in this exact shape:
+{{"skills": ["..."], "projects": ["short project description"], "roles": ["Job title at Company (years)"]}}
+
+Rules:
+- At most {DIGEST_MAX_ITEMS} items per list
+- Each item under 15 words
+- No commentary outside the JSON
+
+Resume:
+{resume_text[:DIGEST_INPUT_CHARS]}"""
+
+
+def format_digest(digest: Dict[str, List[str]]) -> str:
+    """Render a digest dict as the compact text injected into prompts"""
+    lines = []
+    for key, label in (("roles", "Roles"), ("skills", "Skills"), ("projects", "Projects")):
+        items = [str(item).strip() for item in digest.get(key, []) if str(item).strip()]
+        if items:
+            lines.append(f"{label}: " + "; ".join(items[:DIGEST_MAX_ITEMS]))
+    return "\n".join(lines)
+
+
+def generate_resume_digest(resume_text: str, call_llm: Callable[..., str]) -> Optional[str]:
+    """Ask the LLM for a compact skills/projects/roles digest of a resume"""
+    response = call_llm([
+        {"role": "system", "content": "You extract structured facts from resumes and reply with JSON only."},
+        {"role": "user", "content": _build_digest_prompt(resume_text)}
+    ], temperature=0.2, max_tokens=400)
+
+    match = _JSON_OBJECT_RE.search(response or "")
+    if not match:
+        return None
+    try:
+        digest = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(digest, dict):
+        return None
+    return format_digest(digest) or None
+
+
+def compute_and_store_digest(sha256: str, call_llm: Callable[..., str]):
+    """Background task: fill in the digest for a cached resume (runs once per hash)"""
+    from db_config import SessionLocal
+
+    db = SessionLocal()
+    try:
+        entry = db.query(ResumeCache).filter(ResumeCache.sha256 == sha256).first()
+        if entry is None or entry.resume_digest:
+            return
+        digest = generate_resume_digest(entry.resume_text, call_llm)
+        if digest:
+            entry.resume_digest = digest
+            db.commit()
+            logger.info("resume_digest_stored", extra={"sha256": sha256[:12], "chars": len(digest)})
+    except Exception as e:
+        db.rollback()
+        logger.warning("resume_digest_failed", extra={"sha256": sha256[:12], "error": str(e)})
+    finally:
+        db.close()
@@ -0,0 +1,223 @@
+"""
+Resume Parser - Bounded PDF text extraction in a separate process pool
+"""
+import asyncio
+import io
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+# Upload and extraction limits
+MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))  # 5MB, same as the frontend check
+MAX_RESUME_CHARS = 8000
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # Boundaries and part headers around the file
+
+# Per-job limits for the extraction worker
+PARSE_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSE_TIMEOUT", "10"))
+PARSE_MEMORY_LIMIT_BYTES = int(os.getenv("RESUME_PARSE_MEMORY_MB", "512")) * 1024 * 1024
+PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+PARSE_GRACE_SECONDS = 5  # Queueing and process start-up on top of the worker's own deadline
+
+TRUNCATION_MARKER = "\n[... resume truncated ...]"
+
+
+class ResumeParseError(Exception):
+    """Raised when a resume cannot be parsed within the configured limits"""
+
+
+def _parse_deadline_exceeded(signum, frame):
+    raise ResumeParseError("Resume took too long to parse")
+
+
+def _limit_worker_resources():
+    """Apply CPU-time and address-space limits to the extraction worker"""
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows - rely on the timeout only
+
+    cpu_seconds = int(PARSE_TIMEOUT_SECONDS) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (PARSE_MEMORY_LIMIT_BYTES, PARSE_MEMORY_LIMIT_BYTES))
+    except (ValueError, OSError):
+        pass  # Some platforms (e.g. macOS) refuse RLIMIT_AS
+
+
+def extract_pdf_text(contents: bytes, max_chars: int = MAX_RESUME_CHARS) -> str:
+    """Extract text from PDF bytes, stopping once max_chars have been collected.
+
+    Runs inside the worker process, so PyPDF2 is imported here rather than
+    by the web process. A wall-clock deadline fails just this job with
+    ResumeParseError; the worker exits normally, so a slow resume never takes
+    the rest of the pool down with it.
+    """
+    deadline = hasattr(signal, "setitimer")
+    if deadline:
+        signal.signal(signal.SIGALRM, _parse_deadline_exceeded)
+        signal.setitimer(signal.ITIMER_REAL, PARSE_TIMEOUT_SECONDS)
+    try:
+        return _extract_pdf_text(contents, max_chars)
+    finally:
+        if deadline:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _extract_pdf_text(contents: bytes, max_chars: int) -> str:
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
+    parts = []
+    collected = 0
+    truncated = False
+
+    for page in pdf_reader.pages:
+        page_text = page.extract_text() or ""
+        parts.append(page_text)
+        collected += len(page_text) + 1
+        if collected > max_chars:
+            truncated = True
+            break
+
+    resume_text = "\n".join(parts).strip()
+    if truncated or len(resume_text) > max_chars:
+        resume_text = resume_text[:max_chars] + TRUNCATION_MARKER
+    return resume_text
+
+
+# Lazy initialization of the process pool
+_executor = None
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Get or create the resume extraction process pool"""
+    global _executor
+    if _executor is None:
+        # One job per child so the rlimits apply per resume, not per worker lifetime.
+        # max_tasks_per_child cannot be combined with the 'fork' start method.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # Children fork from a server that already imported PyPDF2 (skipped if it is missing)
+            context.set_forkserver_preload(["resume_parser", "PyPDF2"])
+        _executor = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=context,
+            initializer=_limit_worker_resources,
+            max_tasks_per_child=1
+        )
+    return _executor
+
+def _warm_worker():
+    """No-op job: running it starts the fork server and its PyPDF2 preload"""
+
+def warm_parse_executor(timeout: float = 30.0):
+    """Start the extraction pool ahead of the first upload (called by the startup warm-up)"""
+    get_parse_executor().submit(_warm_worker).result(timeout=timeout)
+
+def _replace_broken_executor(broken: ProcessPoolExecutor):
+    """Drop a broken pool so the next request starts a fresh one.
+
+    Only the pool that actually broke is dropped; a concurrent request may
+    already have replaced it.
+    """
+    global _executor
+    if _executor is broken:
+        _executor = None
+    broken.shutdown(wait=False)
+
+def shutdown_parse_executor():
+    """Stop the worker processes (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def read_upload_limited(upload, max_bytes: int = MAX_RESUME_BYTES) -> bytes:
+    """Read an UploadFile in chunks, aborting as soon as max_bytes is exceeded"""
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise ResumeParseError(f"Resume file must be smaller than {max_bytes // (1024 * 1024)}MB")
+    return bytes(buffer)
+
+
+async def parse_resume_bytes(contents: bytes) -> str:
+    """Extract resume text off the event loop with time and memory limits"""
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor()
+    try:
+        future = loop.run_in_executor(executor, extract_pdf_text, contents, MAX_RESUME_CHARS)
+        # The worker enforces PARSE_TIMEOUT_SECONDS itself; this only bounds the wait
+        return await asyncio.wait_for(future, timeout=PARSE_TIMEOUT_SECONDS + PARSE_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        # Still queued behind other resumes - the job is cancelled, the pool is left alone
+        raise ResumeParseError("Resume took too long to parse")
+    except BrokenProcessPool:
+        # A worker was killed by its CPU or memory rlimit
+        _replace_broken_executor(executor)
+        raise ResumeParseError("Resume exceeded the parsing resource limits")
+    except MemoryError:
+        raise ResumeParseError("Resume exceeded the parsing resource limits")
+
+
+class ResumeUploadLimit:
+    """ASGI middleware that rejects oversized resume uploads before the multipart parser runs.
+
+    FastAPI spools the whole multipart body to disk before the route sees the
+    UploadFile, so read_upload_limited alone cannot stop a large upload. This
+    checks Content-Length up front and counts the streamed body for chunked
+    requests, answering 413 as soon as the cap is crossed.
+    """
+
+    def __init__(self, app, path_suffix: str = "/resume/parse",
+                 max_bytes: int = MAX_RESUME_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.path_suffix = path_suffix
+        self.max_bytes = max_bytes
+
+    async def _reject(self, scope, receive, send):
+        from starlette.responses import JSONResponse
+        detail = f"Resume file must be smaller than {MAX_RESUME_BYTES // (1024 * 1024)}MB"
+        await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].rstrip("/").endswith(self.path_suffix):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Answer now and let the parser see a disconnect instead of more data
+                    rejected = True
+                    await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
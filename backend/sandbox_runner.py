@@ -0,0 +1,244 @@
+"""
+Sandbox runner - executed as a child process by code_sandbox; runs one submission against its tests
+
+Started ahead of time so interpreter start-up is already paid: it isolates
+itself, then blocks on stdin for a single JSON job and writes a JSON result line.
+Only the standard library is used, since the child runs with -I.
+
+Isolation (Linux x86_64/aarch64 only) is all-or-nothing - if any step fails the
+job is refused, never run with less protection:
+  1. drop to an unprivileged uid when started as root
+  2. enter new user and network namespaces (no network interfaces)
+  3. a seccomp filter that refuses opening files, sockets, fork/exec and
+     signalling or tracing other processes
+Modules a submission may import are loaded before the filter goes on, since
+imports after it can't open files.
+"""
+import contextlib
+import ctypes
+import io
+import json
+import os
+import platform
+import sys
+import time
+import types
+
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+SANDBOX_UID = 65534  # nobody
+MAX_REPR_CHARS = 200
+MAX_ERROR_CHARS = 200
+
+# Loaded before the seccomp filter; anything else fails to import in a submission
+PRELOADED_MODULES = (
+    "array", "bisect", "collections", "copy", "dataclasses", "decimal", "enum", "fractions", "functools",
+    "heapq", "itertools", "json", "math", "operator", "random", "re", "statistics", "string", "typing",
+)
+
+PR_SET_NO_NEW_PRIVS = 38
+PR_SET_SECCOMP = 22
+SECCOMP_MODE_FILTER = 2
+SECCOMP_RET_KILL_PROCESS = 0x80000000
+SECCOMP_RET_ERRNO = 0x00050000
+SECCOMP_RET_ALLOW = 0x7FFF0000
+EPERM = 1
+X32_SYSCALL_BIT = 0x40000000
+
+# machine -> (audit arch, syscall numbers refused with EPERM)
+DENIED_SYSCALLS = {
+    "x86_64": (0xC000003E, {
+        "open": 2, "openat": 257, "openat2": 437, "creat": 85, "open_by_handle_at": 304,
+        "name_to_handle_at": 303, "socket": 41, "socketpair": 53, "connect": 42, "bind": 49, "listen": 50,
+        "accept": 43, "accept4": 288, "sendto": 44, "sendmsg": 46, "sendmmsg": 307, "clone": 56,
+        "clone3": 435, "fork": 57, "vfork": 58, "execve": 59, "execveat": 322, "ptrace": 101,
+        "process_vm_readv": 310, "process_vm_writev": 311, "kill": 62, "tkill": 200, "tgkill": 234,
+        "rt_sigqueueinfo": 129, "rt_tgsigqueueinfo": 297, "pidfd_open": 434, "pidfd_getfd": 438,
+        "pidfd_send_signal": 424, "unlink": 87, "unlinkat": 263, "rename": 82, "renameat": 264,
+        "renameat2": 316, "mkdir": 83, "mkdirat": 258, "rmdir": 84, "link": 86, "linkat": 265,
+        "symlink": 88, "symlinkat": 266, "chmod": 90, "fchmodat": 268, "chown": 92, "lchown": 94,
+        "fchownat": 260, "truncate": 76, "mount": 165, "umount2": 166, "pivot_root": 155, "chroot": 161,
+        "setns": 308, "unshare": 272, "bpf": 321, "perf_event_open": 298, "keyctl": 250, "add_key": 248,
+        "request_key": 249, "userfaultfd": 323, "io_uring_setup": 425, "io_uring_enter": 426,
+        "io_uring_register": 427,
+    }),
+    "aarch64": (0xC00000B7, {
+        "openat": 56, "openat2": 437, "open_by_handle_at": 265, "name_to_handle_at": 264, "socket": 198,
+        "socketpair": 199, "connect": 203, "bind": 200, "listen": 201, "accept": 202, "accept4": 242,
+        "sendto": 206, "sendmsg": 211, "sendmmsg": 269, "clone": 220, "clone3": 435, "execve": 221,
+        "execveat": 281, "ptrace": 117, "process_vm_readv": 270, "process_vm_writev": 271, "kill": 129,
+        "tkill": 130, "tgkill": 131, "rt_sigqueueinfo": 138, "rt_tgsigqueueinfo": 240, "pidfd_open": 434,
+        "pidfd_getfd": 438, "pidfd_send_signal": 424, "unlinkat": 35, "renameat": 38, "renameat2": 276,
+        "mkdirat": 34, "linkat": 37, "symlinkat": 36, "fchmodat": 53, "fchownat": 54, "truncate": 45,
+        "mount": 40, "umount2": 39, "pivot_root": 41, "chroot": 51, "setns": 268, "unshare": 97, "bpf": 280,
+        "perf_event_open": 241, "keyctl": 219, "add_key": 217, "request_key": 218, "userfaultfd": 282,
+        "io_uring_setup": 425, "io_uring_enter": 426, "io_uring_register": 427,
+    }),
+}
+
+
+class _SockFilter(ctypes.Structure):
+    _fields_ = [("code", ctypes.c_ushort), ("jt", ctypes.c_ubyte), ("jf", ctypes.c_ubyte), ("k", ctypes.c_uint)]
+
+
+class _SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.POINTER(_SockFilter))]
+
+
+def _seccomp_program(arch: int, denied, x32: bool) -> list:
+    """Classic BPF: kill on a foreign ABI, EPERM for denied syscalls, allow the rest"""
+    load_word, jump_eq, jump_ge, ret = 0x20, 0x15, 0x35, 0x06
+    program = [
+        (load_word, 0, 0, 4),  # seccomp_data.arch
+        (jump_eq, 1, 0, arch),
+        (ret, 0, 0, SECCOMP_RET_KILL_PROCESS),
+        (load_word, 0, 0, 0),  # seccomp_data.nr
+    ]
+    if x32:
+        program += [(jump_ge, 0, 1, X32_SYSCALL_BIT), (ret, 0, 0, SECCOMP_RET_ERRNO | EPERM)]
+    for number in sorted(set(denied)):
+        program += [(jump_eq, 0, 1, number), (ret, 0, 0, SECCOMP_RET_ERRNO | EPERM)]
+    program.append((ret, 0, 0, SECCOMP_RET_ALLOW))
+    return program
+
+
+def _isolate():
+    """Apply every isolation step; raises RuntimeError naming the one that failed"""
+    machine = platform.machine().lower()
+    if not sys.platform.startswith("linux") or machine not in DENIED_SYSCALLS:
+        raise RuntimeError(f"unsupported platform {sys.platform}/{machine}")
+    arch, denied = DENIED_SYSCALLS[machine]
+    libc = ctypes.CDLL(None, use_errno=True)
+
+    if os.getuid() == 0 or os.geteuid() == 0:
+        os.setgroups([])
+        os.setgid(SANDBOX_UID)
+        os.setuid(SANDBOX_UID)
+    if os.getuid() == 0 or os.geteuid() == 0:
+        raise RuntimeError("still running as root")
+
+    if libc.unshare(CLONE_NEWUSER | CLONE_NEWNET) != 0:
+        raise RuntimeError(f"unshare failed: {os.strerror(ctypes.get_errno())}")
+
+    program = _seccomp_program(arch, denied.values(), x32=machine == "x86_64")
+    filters = (_SockFilter * len(program))(*[_SockFilter(*instruction) for instruction in program])
+    if libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0) != 0:
+        raise RuntimeError(f"no_new_privs failed: {os.strerror(ctypes.get_errno())}")
+    if libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(_SockFprog(len(program), filters)), 0, 0) != 0:
+        raise RuntimeError(f"seccomp failed: {os.strerror(ctypes.get_errno())}")
+
+
+def _apply_limits(cpu_seconds: int, memory_bytes: int):
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    for limit, value in (
+        (resource.RLIMIT_AS, memory_bytes),
+        (resource.RLIMIT_FSIZE, 0),
+        (resource.RLIMIT_CORE, 0),
+    ):
+        resource.setrlimit(limit, (value, value))
+
+
+def _error_text(error: BaseException) -> str:
+    text = f"{type(error).__name__}: {error}"
+    return text if len(text) <= MAX_ERROR_CHARS else text[:MAX_ERROR_CHARS] + "..."
+
+
+def _short_repr(value) -> str:
+    text = repr(value)
+    return text if len(text) <= MAX_REPR_CHARS else text[:MAX_REPR_CHARS] + "..."
+
+
+def _normalize(value):
+    """Compare like JSON does, so tuples match lists"""
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _find_function(namespace: dict, names):
+    for name in names:
+        if callable(namespace.get(name)):
+            return namespace[name]
+    defined = [
+        value for value in namespace.values()
+        if isinstance(value, types.FunctionType) and value.__code__.co_filename == "<submission>"
+    ]
+    # Helpers are fine as long as one function is the obvious entry point
+    return defined[-1] if defined else None
+
+
+def run_job(job: dict) -> dict:
+    namespace = {"__name__": "__submission__"}
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            exec(compile(job["code"], "<submission>", "exec"), namespace)
+    except BaseException as e:
+        return {"error": _error_text(e), "error_type": type(e).__name__, "tests": []}
+
+    function = _find_function(namespace, job["function_names"])
+    if function is None:
+        return {"error": "No function found to test", "tests": []}
+
+    results = []
+    for args, expected in job["tests"]:
+        test_started = time.perf_counter()
+        error = error_type = None
+        actual = None
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                actual = function(*json.loads(json.dumps(args)))
+        except BaseException as e:
+            error, error_type = _error_text(e), type(e).__name__
+        elapsed_ms = (time.perf_counter() - test_started) * 1000
+
+        if error:
+            passed = False
+        elif job.get("compare") == "unordered" and isinstance(actual, (list, tuple)):
+            passed = sorted(_normalize(actual)) == sorted(expected)
+        else:
+            passed = _normalize(actual) == expected
+        results.append({
+            "args": _short_repr(args)[1:-1],
+            "expected": _short_repr(expected),
+            "actual": None if error else _short_repr(actual),
+            "passed": passed,
+            "error": error,
+            "error_type": error_type,
+            "ms": round(elapsed_ms, 3)
+        })
+    return {
+        "function": function.__name__,
+        "tests": results,
+        "total_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+
+def main():
+    cpu_seconds, memory_bytes = int(sys.argv[1]), int(sys.argv[2])
+    refused = None
+    try:
+        _apply_limits(cpu_seconds, memory_bytes)
+        for name in PRELOADED_MODULES:
+            __import__(name)
+        _isolate()
+    except Exception as e:
+        refused = f"Sandbox isolation unavailable: {e}"
+    output = sys.stdout
+
+    line = sys.stdin.readline()
+    if not line:
+        return  # Pool shut down before this worker was used
+    if refused:
+        result = {"isolated": False, "error": refused, "tests": []}
+    else:
+        result = run_job(json.loads(line))
+        result["isolated"] = True
+    output.write(json.dumps(result) + "\n")
+    output.flush()
+
+
+if __name__ == "__main__":
+    main()
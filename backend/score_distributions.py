@@ -0,0 +1,260 @@
+"""
+Score distributions - per-(role, round) score histograms for instant percentile ranking
+
+Each completed interview adds one to the matching bin of each score (an atomic
+UPDATE ... SET count = count + 1, safe across workers) in the transaction that
+saves the interview. Percentiles are read from a small per-worker table built
+from a cohort's bins, so a lookup is a single list index.
+
+Rebuild every histogram from the interviews table, e.g. nightly from cron
+(only the last --window-days are kept, so the cohort tracks how the LLM scores
+today rather than months ago). The recount runs without locks; only the final
+swap briefly locks the bins, and interviews completed meanwhile are counted
+exactly once:
+    python score_distributions.py rebuild [--window-days 180]
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from logger import get_logger
+
+logger = get_logger("score_distributions")
+
+SCORE_FIELDS = ("overall_score", "communication_score", "technical_score", "preparation_score")
+# Scores are integers 0-10 (0 only for interviews that failed to score)
+SCORE_BINS = 11
+
+# Cohorts smaller than this don't get a percentile
+SCORE_PERCENTILE_MIN_SAMPLES = int(os.getenv("SCORE_PERCENTILE_MIN_SAMPLES", "20"))
+# How long a worker reuses a cohort's table before re-reading it (other workers' interviews)
+SCORE_DISTRIBUTION_CACHE_SECONDS = float(os.getenv("SCORE_DISTRIBUTION_CACHE_SECONDS", "300"))
+# Interviews older than this are dropped by the nightly rebuild (0 keeps everything)
+SCORE_DISTRIBUTION_WINDOW_DAYS = int(os.getenv("SCORE_DISTRIBUTION_WINDOW_DAYS", "180"))
+REBUILD_FETCH_SIZE = 5000
+
+
+def _clamp(score) -> int:
+    return max(0, min(SCORE_BINS - 1, int(score or 0)))
+
+
+def _percentile_table(counts) -> Tuple[int, list]:
+    """(total, percentage of the cohort scoring strictly lower, for each possible score)"""
+    total = sum(counts)
+    table = []
+    below = 0
+    for count in counts:
+        table.append(round(100.0 * below / total, 1) if total else None)
+        below += count
+    return total, table
+
+
+class ScoreDistributions:
+    """Cached per-cohort percentile tables over the score_histogram_bins table"""
+
+    def __init__(self, cache_seconds: float = SCORE_DISTRIBUTION_CACHE_SECONDS):
+        self.cache_seconds = cache_seconds
+        self.tables: Dict[Tuple[str, str], Tuple[float, Dict[str, Tuple[int, list]]]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, db, role: str, interview_round: str, scores: Dict):
+        """Count one completed interview's scores in db's open transaction - the caller commits it
+        together with the interview row. Failures only cost the percentile (a savepoint is rolled back).
+        """
+        from sqlalchemy.exc import IntegrityError
+        from models import ScoreHistogramBin
+
+        try:
+            with db.begin_nested():
+                for metric in SCORE_FIELDS:
+                    key = dict(role=role, interview_round=interview_round, metric=metric, score=_clamp(scores.get(metric)))
+                    bin_query = db.query(ScoreHistogramBin).filter_by(**key)
+                    if bin_query.update({ScoreHistogramBin.count: ScoreHistogramBin.count + 1}, synchronize_session=False):
+                        continue
+                    try:
+                        with db.begin_nested():
+                            db.add(ScoreHistogramBin(count=1, **key))
+                    except IntegrityError:
+                        # Another worker created the bin first
+                        bin_query.update({ScoreHistogramBin.count: ScoreHistogramBin.count + 1}, synchronize_session=False)
+        except Exception as e:
+            logger.warning("score_histogram_update_failed", extra={"role": role, "error": str(e)})
+        with self.lock:
+            self.tables.pop((role, interview_round), None)
+
+    def _cohort(self, role: str, interview_round: str) -> Dict[str, Tuple[int, list]]:
+        key = (role, interview_round)
+        with self.lock:
+            cached = self.tables.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_seconds:
+                return cached[1]
+
+        from db_config import SessionLocal
+        from models import ScoreHistogramBin
+
+        counts = {metric: [0] * SCORE_BINS for metric in SCORE_FIELDS}
+        db = SessionLocal()
+        try:
+            bins = db.query(ScoreHistogramBin.metric, ScoreHistogramBin.score, ScoreHistogramBin.count)\
+                .filter(ScoreHistogramBin.role == role, ScoreHistogramBin.interview_round == interview_round)
+            for metric, score, count in bins:
+                if metric in counts:
+                    counts[metric][_clamp(score)] = count
+        finally:
+            db.close()
+
+        tables = {metric: _percentile_table(metric_counts) for metric, metric_counts in counts.items()}
+        with self.lock:
+            self.tables[key] = (time.monotonic(), tables)
+        return tables
+
+    def percentiles(self, role: str, interview_round: str, scores: Dict) -> Dict[str, Optional[Dict]]:
+        """Per score: share of the cohort scoring strictly lower, and the cohort-normalised score.
+
+        The normalised score is the percentile on the 0-10 scale, so a uniformly
+        harsher or more lenient scoring model leaves it unchanged. None for
+        cohorts below SCORE_PERCENTILE_MIN_SAMPLES.
+        """
+        try:
+            tables = self._cohort(role, interview_round)
+        except Exception as e:
+            logger.warning("score_histogram_read_failed", extra={"role": role, "error": str(e)})
+            return {metric: None for metric in SCORE_FIELDS}
+
+        result = {}
+        for metric in SCORE_FIELDS:
+            total, table = tables[metric]
+            if total < SCORE_PERCENTILE_MIN_SAMPLES:
+                result[metric] = None
+                continue
+            percentile = table[_clamp(scores.get(metric))]
+            result[metric] = {
+                "percentile": percentile,
+                "normalized_score": round(percentile / 10, 1),
+                "cohort_size": total
+            }
+        return result
+
+
+score_distributions = ScoreDistributions()
+
+
+def _current_bins(db) -> Dict[Tuple[str, str, str, int], int]:
+    from models import ScoreHistogramBin
+
+    return {
+        (role, interview_round, metric, score): count
+        for role, interview_round, metric, score, count in db.query(
+            ScoreHistogramBin.role, ScoreHistogramBin.interview_round, ScoreHistogramBin.metric,
+            ScoreHistogramBin.score, ScoreHistogramBin.count
+        )
+    }
+
+
+def rebuild_histograms(window_days: int = SCORE_DISTRIBUTION_WINDOW_DAYS) -> int:
+    """Recount every histogram from the interviews table with NumPy; returns interviews counted.
+
+    The recount runs without locks, in one read snapshot that also captures the
+    bins. The swap then locks the bins only briefly: new bins = recount plus
+    whatever record() added since the snapshot, so an interview saved during
+    the rebuild is counted exactly once.
+
+    SQLite: the snapshot is one read transaction. In the default rollback-journal
+    mode it holds a shared lock, so other connections' commits (e.g. /end) wait
+    for the recount and fail once SQLite's busy timeout (5 s) expires - run
+    rebuilds off-peak there, or use WAL mode (PRAGMA journal_mode=WAL), where
+    readers don't block writers.
+    """
+    import numpy as np
+    from sqlalchemy import select, text
+    from db_config import SessionLocal
+    from models import Interview, ScoreHistogramBin
+
+    cohorts: Dict[Tuple[str, str], "np.ndarray"] = {}
+    counted = 0
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        elif dialect == "sqlite":
+            # pysqlite only opens a transaction before writes; both reads need the same snapshot
+            db.execute(text("BEGIN"))
+        snapshot_bins = _current_bins(db)
+
+        query = select(Interview.role, Interview.interview_round, *[getattr(Interview, metric) for metric in SCORE_FIELDS])
+        if window_days > 0:
+            query = query.where(Interview.completed_at >= datetime.utcnow() - timedelta(days=window_days))
+        result = db.execute(query.execution_options(stream_results=True, yield_per=REBUILD_FETCH_SIZE))
+        for partition in result.partitions():
+            columns = list(zip(*partition))
+            keys = np.array([f"{role}\0{interview_round}" for role, interview_round in zip(columns[0], columns[1])])
+            scores = np.clip(np.array(columns[2:], dtype=np.int64).T, 0, SCORE_BINS - 1)  # rows x metrics
+            names, cohort_index = np.unique(keys, return_inverse=True)
+            # One flat bincount for (cohort, metric, score) over the whole partition
+            flat = (cohort_index[:, None] * len(SCORE_FIELDS) + np.arange(len(SCORE_FIELDS))) * SCORE_BINS + scores
+            counts = np.bincount(flat.ravel(), minlength=len(names) * len(SCORE_FIELDS) * SCORE_BINS)
+            counts = counts.reshape(len(names), len(SCORE_FIELDS), SCORE_BINS)
+            for name, cohort_counts in zip(names, counts):
+                key = tuple(str(name).split("\0", 1))
+                cohorts[key] = cohorts[key] + cohort_counts if key in cohorts else cohort_counts
+            counted += len(partition)
+    finally:
+        db.rollback()
+        db.close()
+
+    bins = {
+        (role, interview_round, metric, score): int(count)
+        for (role, interview_round), cohort_counts in cohorts.items()
+        for metric, metric_counts in zip(SCORE_FIELDS, cohort_counts)
+        for score, count in enumerate(metric_counts) if count
+    }
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            # Conflicts with the ROW EXCLUSIVE lock taken by record()'s UPDATE/INSERT, not with plain reads
+            db.execute(text("LOCK TABLE score_histogram_bins IN EXCLUSIVE MODE"))
+        else:
+            # On SQLite this first write takes the database write lock
+            db.query(ScoreHistogramBin).filter(ScoreHistogramBin.count < 0).delete(synchronize_session=False)
+        # Interviews saved since the snapshot
+        for key, count in _current_bins(db).items():
+            added = count - snapshot_bins.get(key, 0)
+            if added > 0:
+                bins[key] = bins.get(key, 0) + added
+
+        db.query(ScoreHistogramBin).delete(synchronize_session=False)
+        db.bulk_save_objects([
+            ScoreHistogramBin(role=role, interview_round=interview_round, metric=metric, score=score, count=count)
+            for (role, interview_round, metric, score), count in bins.items()
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    with score_distributions.lock:
+        score_distributions.tables.clear()
+    return counted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="recount every histogram from the interviews table")
+    rebuild.add_argument("--window-days", type=int, default=SCORE_DISTRIBUTION_WINDOW_DAYS,
+                         help="only count interviews completed in the last N days (0 for all)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counted = rebuild_histograms(args.window_days)
+    print(f"[OK] Rebuilt score histograms from {counted} interviews in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Session router - runs N backend workers and sends each interview session to the worker that owns it
+
+Interview state (sessions, history, turn scores, frame analyses) lives in the
+memory of the worker that started the session. Each worker gets a
+WORKER_SHARD, start_interview prefixes session ids with 'w{shard}-', and this
+ASGI proxy routes every call that names a session to that shard. Calls
+without a session (auth, /start, reports) are spread round-robin.
+
+The session id is looked up, in order, in:
+  /api/interview/ws/{session_id} and /api/interview/{session_id}/status paths,
+  the X-Session-Id header, the session_id query parameter, and a JSON body's
+  "session_id" field within its first SESSION_SCAN_BYTES.
+
+Request bodies are streamed to the worker, never held whole. Anything larger
+than ROUTER_MAX_BODY_BYTES (by Content-Length or running total) gets a 413
+here rather than reaching the workers' own upload caps.
+
+Usage (from backend/):
+    python session_router.py --workers 4 --port 8000
+
+Behind nginx instead of this proxy, run one uvicorn per shard and route on the
+id prefix (the frontend sends X-Session-Id on interview calls):
+    map $http_x_session_id $interview_upstream {
+        ~^w(?<shard>\\d+)-  worker$shard;
+        default            workers;
+    }
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+import httpx
+
+from sharding import shard_for_session
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_SESSION_PATH_RE = re.compile(r"^/api/interview/(?:ws/(?P<ws>[^/]+)|(?P<status>[^/]+)/status)$")
+# Avoids parsing multi-hundred-KB frame bodies just to read one field
+_SESSION_BODY_RE = re.compile(rb'"session_id"\s*:\s*"([^"]+)"')
+
+# Largest body a worker accepts (resume upload, base64 video frame) plus multipart/JSON overhead
+ROUTER_MAX_BODY_BYTES = int(os.getenv("ROUTER_MAX_BODY_BYTES", str(max(
+    int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024))),
+    int(os.getenv("FRAME_MAX_BYTES", str(2 * 1024 * 1024))) * 4 // 3
+) + 64 * 1024)))
+# Body prefix searched for "session_id" when the path, headers and query don't name one
+SESSION_SCAN_BYTES = 64 * 1024
+
+# Not forwarded between client and worker
+HOP_BY_HOP_HEADERS = {b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"te", b"trailer", b"host"}
+
+
+def session_id_from_request(path: str, headers: dict, query_string: bytes, body: bytes = b"") -> Optional[str]:
+    """Session id named by a request, if any"""
+    match = _SESSION_PATH_RE.match(path)
+    if match:
+        return match.group("ws") or match.group("status")
+    if headers.get(b"x-session-id"):
+        return headers[b"x-session-id"].decode()
+    query = parse_qs(query_string.decode())
+    if query.get("session_id"):
+        return query["session_id"][0]
+    match = _SESSION_BODY_RE.search(body)
+    if match:
+        return match.group(1).decode()
+    return None
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class SessionRouter:
+    """ASGI app proxying HTTP and WebSocket traffic to the owning worker"""
+
+    def __init__(self, upstreams: List[str]):
+        self.upstreams = upstreams
+        self._round_robin = itertools.cycle(range(len(upstreams)))
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def pick_upstream(self, session_id: Optional[str]) -> Optional[str]:
+        """Owner of the session; round-robin for unsharded or session-less calls"""
+        shard = shard_for_session(session_id) if session_id else None
+        if shard is None:
+            return self.upstreams[next(self._round_robin)]
+        if shard >= len(self.upstreams):
+            return None
+        return self.upstreams[shard]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._proxy_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._proxy_websocket(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5.0))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.client is not None:
+                    await self.client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _proxy_http(self, scope, receive, send):
+        headers = dict(scope["headers"])
+        try:
+            declared_length = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            await _plain_response(send, 400, b"Invalid Content-Length")
+            return
+        if declared_length > ROUTER_MAX_BODY_BYTES:
+            await _plain_response(send, 413, b"Request body too large")
+            return
+
+        # Only a bounded prefix is buffered, and only when nothing else names the session
+        prefix = b""
+        more_body = True
+        session_id = session_id_from_request(scope["path"], headers, scope["query_string"])
+        while session_id is None and more_body and len(prefix) < SESSION_SCAN_BYTES:
+            message = await receive()
+            prefix += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(prefix) > ROUTER_MAX_BODY_BYTES:
+                await _plain_response(send, 413, b"Request body too large")
+                return
+            session_id = session_id_from_request(scope["path"], headers, scope["query_string"], prefix)
+
+        async def body():
+            total = len(prefix)
+            if prefix:
+                yield prefix
+            nonlocal more_body
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                chunk = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                total += len(chunk)
+                if total > ROUTER_MAX_BODY_BYTES:
+                    raise _BodyTooLarge()
+                yield chunk
+
+        upstream = self.pick_upstream(session_id)
+        if upstream is None:
+            await _plain_response(send, 503, b"Session owner unavailable")
+            return
+
+        url = f"{upstream}{scope['raw_path'].decode() if scope.get('raw_path') else scope['path']}"
+        if scope["query_string"]:
+            url = f"{url}?{scope['query_string'].decode()}"
+        request = self.client.build_request(
+            scope["method"], url, content=body(),
+            headers=[(k, v) for k, v in scope["headers"] if k not in HOP_BY_HOP_HEADERS]
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except _BodyTooLarge:
+            await _plain_response(send, 413, b"Request body too large")
+            return
+        except httpx.HTTPError:
+            await _plain_response(send, 502, b"Worker unavailable")
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in HOP_BY_HOP_HEADERS],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    async def _proxy_websocket(self, scope, receive, send):
+        import websockets
+
+        session_id = session_id_from_request(scope["path"], dict(scope["headers"]), scope["query_string"])
+        upstream = self.pick_upstream(session_id)
+        if upstream is None:
+            await send({"type": "websocket.close", "code": 1013})
+            return
+
+        url = f"{upstream.replace('http', 'ws', 1)}{scope['path']}"
+        if scope["query_string"]:
+            url = f"{url}?{scope['query_string'].decode()}"
+
+        await receive()  # websocket.connect
+        try:
+            upstream_socket = await websockets.connect(url, max_size=None)
+        except Exception:
+            # Worker refused the handshake (bad token, unknown session) or is down
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        await send({"type": "websocket.accept"})
+
+        async def client_to_worker():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    await upstream_socket.close()
+                    return
+                if message.get("bytes") is not None:
+                    await upstream_socket.send(message["bytes"])
+                elif message.get("text") is not None:
+                    await upstream_socket.send(message["text"])
+
+        async def worker_to_client():
+            try:
+                async for data in upstream_socket:
+                    if isinstance(data, bytes):
+                        await send({"type": "websocket.send", "bytes": data})
+                    else:
+                        await send({"type": "websocket.send", "text": data})
+            except websockets.ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": upstream_socket.close_code or 1000})
+
+        tasks = [asyncio.ensure_future(client_to_worker()), asyncio.ensure_future(worker_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await upstream_socket.close()
+
+
+async def _plain_response(send, status: int, body: bytes):
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def start_workers(count: int, base_port: int, host: str) -> List[subprocess.Popen]:
+    """Launch one uvicorn process per shard, each with its own WORKER_SHARD"""
+    processes = []
+    for shard in range(count):
+        # Per-worker memory buckets would multiply the rate limits by the worker count
+        env = {"RATE_LIMIT_BACKEND": "db", **os.environ, "WORKER_SHARD": str(shard)}
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", str(base_port + shard)],
+            cwd=BACKEND_DIR, env=env
+        ))
+    return processes
+
+
+def wait_for_workers(upstreams: List[str], timeout: float = 60.0):
+    """Block until every worker answers GET /"""
+    deadline = time.monotonic() + timeout
+    for upstream in upstreams:
+        while True:
+            try:
+                httpx.get(f"{upstream}/", timeout=2.0)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Worker {upstream} did not start within {timeout:.0f}s")
+                time.sleep(0.5)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--worker-base-port", type=int, default=9001)
+    args = parser.parse_args()
+
+    worker_host = "127.0.0.1"
+    upstreams = [f"http://{worker_host}:{args.worker_base_port + shard}" for shard in range(args.workers)]
+    processes = start_workers(args.workers, args.worker_base_port, worker_host)
+    # uvicorn re-raises SIGTERM once it has shut down; leave through the finally below so the workers stop too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        wait_for_workers(upstreams)
+        print(f"[OK] Routing sessions across {args.workers} workers")
+        uvicorn.run(SessionRouter(upstreams), host=args.host, port=args.port, log_level="warning")
+    finally:
+        for process in processes:
+            process.terminate()
+        # Workers drain (SESSION_DRAIN_GRACE_SECONDS) and snapshot their sessions before exiting
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Session hand-off - snapshot live interviews on shutdown and rehydrate them on another worker
+"""
+import json
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from db_config import SessionLocal
+from models import SessionSnapshot
+from logger import get_logger
+
+logger = get_logger("session_store")
+
+# Snapshots older than this are ignored (the candidate has long gone)
+SNAPSHOT_MAX_AGE_HOURS = int(os.getenv("SESSION_SNAPSHOT_MAX_AGE_HOURS", "12"))
+# How long shutdown waits (in total, across all sessions) for queued turn scores before snapshotting without them
+SCORE_FLUSH_TIMEOUT_SECONDS = 3.0
+# After SIGTERM the worker keeps serving live sessions, answering new /start calls with 503, for this long
+# before the server stops accepting connections. Keep it well inside the platform's shutdown grace period.
+DRAIN_GRACE_SECONDS = float(os.getenv("SESSION_DRAIN_GRACE_SECONDS", "5"))
+
+_draining = threading.Event()
+_restore_lock = threading.Lock()
+
+
+def begin_drain():
+    """Stop accepting new interview sessions on this worker"""
+    _draining.set()
+
+
+def is_draining() -> bool:
+    return _draining.is_set()
+
+
+def _forward_signal(previous, signum: int):
+    """Hand a signal to the handler that was installed before ours"""
+    if callable(previous):
+        previous(signum, None)
+    else:
+        signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+def install_drain_handler():
+    """Start draining as soon as SIGTERM arrives, then pass it on to the server DRAIN_GRACE_SECONDS later.
+
+    Call from the startup hook: uvicorn installs its own SIGTERM handler before
+    the app starts, and that handler (which stops accepting connections) is
+    chained rather than replaced. A second SIGTERM is forwarded immediately.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        if is_draining():
+            _forward_signal(previous, signum)
+            return
+        begin_drain()
+        logger.info("drain_started", extra={"grace_seconds": DRAIN_GRACE_SECONDS})
+        timer = threading.Timer(DRAIN_GRACE_SECONDS, _forward_signal, (previous, signum))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+def _json_safe(value):
+    """Round-trip through JSON so datetimes and other stragglers become strings"""
+    return json.loads(json.dumps(value, default=str))
+
+
+def snapshot_sessions(interview_agent, video_analyzer) -> int:
+    """Write every active session to session_snapshots; returns the number saved"""
+    session_ids = [
+        session_id for session_id, session in list(interview_agent.sessions.items())
+        if session.get("status") == "active"
+    ]
+    if not session_ids:
+        return 0
+
+    # One deadline for every session's pending scores, so shutdown time doesn't grow with the session count
+    interview_agent.answer_scorer.wait_for_sessions(session_ids, timeout=SCORE_FLUSH_TIMEOUT_SECONDS)
+
+    db = SessionLocal()
+    try:
+        for session_id in session_ids:
+            session = interview_agent.sessions[session_id]
+            db.merge(SessionSnapshot(
+                session_id=session_id,
+                user_id=session.get("user_id"),
+                session=_json_safe(session),
+                conversation_history=_json_safe(interview_agent.conversation_history.get(session_id, [])),
+                code_submissions=_json_safe(interview_agent.code_submissions.get(session_id, [])),
+                turn_scores=_json_safe(interview_agent.answer_scorer.get_turn_scores(session_id)),
+                frame_analyses=_json_safe(video_analyzer.frame_analysis_history.get(session_id, [])),
+                created_at=datetime.utcnow()
+            ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.error("session_snapshot_failed", exc_info=True, extra={"sessions": len(session_ids)})
+        return 0
+    finally:
+        db.close()
+
+    logger.info("sessions_snapshotted", extra={"sessions": len(session_ids)})
+    return len(session_ids)
+
+
+def restore_session(interview_agent, video_analyzer, session_id: str) -> bool:
+    """Load a snapshotted session into this worker's memory; False if there is none"""
+    with _restore_lock:
+        # Another request for the same session may have restored it while we waited
+        if session_id in interview_agent.sessions:
+            return True
+
+        db = SessionLocal()
+        try:
+            snapshot = db.query(SessionSnapshot).filter(SessionSnapshot.session_id == session_id).first()
+            if snapshot is None:
+                return False
+            # Read everything before the commit expires the row
+            state = {
+                "session": snapshot.session,
+                "conversation_history": snapshot.conversation_history or [],
+                "code_submissions": snapshot.code_submissions or [],
+                "turn_scores": snapshot.turn_scores or [],
+                "frame_analyses": snapshot.frame_analyses or [],
+                "created_at": snapshot.created_at
+            }
+            # One owner at a time - the snapshot is consumed by the worker that restores it
+            db.delete(snapshot)
+            db.commit()
+        finally:
+            db.close()
+
+        if state["created_at"] < datetime.utcnow() - timedelta(hours=SNAPSHOT_MAX_AGE_HOURS):
+            logger.info("session_snapshot_expired", extra={"session_id": session_id})
+            return False
+
+        interview_agent.conversation_history[session_id] = state["conversation_history"]
+        if state["code_submissions"]:
+            interview_agent.code_submissions[session_id] = state["code_submissions"]
+        if state["turn_scores"]:
+            interview_agent.answer_scorer.restore_session(session_id, state["turn_scores"])
+        if state["frame_analyses"]:
+            video_analyzer.frame_analysis_history[session_id] = state["frame_analyses"]
+        # Published last so other threads never see a session without its history
+        interview_agent.sessions[session_id] = state["session"]
+
+    logger.info("session_restored", extra={
+        "session_id": session_id,
+        "messages": len(state["conversation_history"])
+    })
+    return True
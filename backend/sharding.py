@@ -0,0 +1,26 @@
+"""
+Session sharding - session ids carry the id of the worker that owns their in-memory state
+"""
+import os
+import re
+import uuid
+from typing import Optional
+
+# Set per worker by session_router.py; empty when running a single process
+WORKER_SHARD = os.getenv("WORKER_SHARD", "")
+
+_SHARD_PREFIX_RE = re.compile(r"^w(\d+)-")
+
+
+def new_session_id() -> str:
+    """uuid4 session id, prefixed with 'w{shard}-' when running as one of several workers"""
+    session_id = str(uuid.uuid4())
+    if WORKER_SHARD:
+        return f"w{WORKER_SHARD}-{session_id}"
+    return session_id
+
+
+def shard_for_session(session_id: str) -> Optional[int]:
+    """Owning worker shard of a session id, or None for unsharded ids"""
+    match = _SHARD_PREFIX_RE.match(session_id or "")
+    return int(match.group(1)) if match else None
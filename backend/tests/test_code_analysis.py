@@ -0,0 +1,30 @@
+"""
+Code analysis tests - pathological submissions skip the pre-pass instead of failing the code review
+
+Run from backend/:
+    python -m pytest tests/test_code_analysis.py
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from code_analysis import MAX_CODE_CHARS, analyze_code
+
+
+def test_nested_loops_are_analyzed():
+    code = "def pairs(xs):\n    for a in xs:\n        for b in xs:\n            print(a, b)\n"
+    analysis = analyze_code(code, "python")
+    assert analysis["syntax_error"] is None
+    assert (analysis["loop_depth"], analysis["complexity"]) == (2, "O(n^2)")
+
+
+@pytest.mark.parametrize("code", [
+    "x=" + "-" * 10000 + "1",  # ast.parse raises MemoryError: parser stack overflowed
+    "x = 1\n" * (MAX_CODE_CHARS // 6 + 1),
+], ids=["parser-stack-overflow", "over-length-cap"])
+def test_pathological_code_is_skipped(code):
+    assert analyze_code(code, "python") is None
@@ -0,0 +1,87 @@
+"""
+Code sandbox tests - isolation is enforced or nothing runs, and hidden tests stay hidden
+
+The escape test needs Linux with unprivileged user namespaces and seccomp; it
+is skipped where the probe worker refuses to start.
+
+Run from backend/:
+    python -m pytest tests/test_code_sandbox.py
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import code_sandbox
+from code_sandbox import SandboxPool, format_execution_report
+from coding_problems import PROBLEMS
+
+REVERSE = next(problem for problem in PROBLEMS if problem["id"] == "reverse_string")
+
+ESCAPES = """
+def reverse_string(s):
+    import os
+    attempts = []
+    for name, attempt in (
+        ("open", lambda: open("/etc/passwd").read()),
+        ("socket", lambda: __import__("socket")),
+        ("fork", os.fork),
+        ("signal", lambda: os.kill(os.getppid(), 0)),
+    ):
+        try:
+            attempt()
+            attempts.append(name)
+        except (OSError, ImportError):
+            pass
+    return ",".join(attempts) or s[::-1]
+"""
+
+
+@pytest.fixture
+def sandbox(monkeypatch):
+    monkeypatch.setattr(code_sandbox, "CODE_SANDBOX_ENABLED", True)
+    monkeypatch.setattr(code_sandbox, "_pool", None)
+    yield
+    code_sandbox.shutdown_sandbox_pool()
+
+
+def test_pool_fails_closed_when_isolation_fails(monkeypatch):
+    # A runner whose isolation step fails, as when namespaces are not permitted
+    broken = (
+        f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import sandbox_runner as runner\n"
+        "def fail(): raise RuntimeError('unshare failed: Operation not permitted')\n"
+        "runner._isolate = fail; sys.argv = ['runner', '2', str(256 * 1024 * 1024)]; runner.main()"
+    )
+    monkeypatch.setitem(code_sandbox.LANGUAGE_COMMANDS, "python", [sys.executable, "-I", "-S", "-c", broken])
+    pool = SandboxPool(pool_size=1)
+    try:
+        assert not pool.probe()
+        assert pool.run("python", {"code": "x = 1", "function_names": [], "tests": [], "compare": None}) is None
+    finally:
+        pool.shutdown()
+
+
+def test_hidden_tests_report_only_pass_fail(sandbox):
+    if not code_sandbox.get_sandbox_pool().available:
+        pytest.skip("sandbox isolation is not available here")
+    code = "def reverse_string(s):\n    raise ValueError('input was ' + s)\n"
+    result = code_sandbox.run_submission(REVERSE, code, "python")
+
+    shown = code_sandbox.CODE_SANDBOX_VISIBLE_TESTS
+    visible, hidden = result["tests"][:shown], result["tests"][shown:]
+    assert all("input was" in test["error"] for test in visible)
+    assert hidden and all(test == {"hidden": True, "passed": False, "error_type": "ValueError", "ms": test["ms"]}
+                          for test in hidden)
+    report = format_execution_report(result)
+    assert "racecar" not in report and "FAILED hidden test 3 (raised ValueError)" in report
+
+
+def test_submission_cannot_escape(sandbox):
+    if not code_sandbox.get_sandbox_pool().available:
+        pytest.skip("sandbox isolation is not available here")
+    result = code_sandbox.run_submission(REVERSE, ESCAPES, "python")
+    assert result["isolated"] is True
+    assert result["passed"] == result["total"], format_execution_report(result)
@@ -0,0 +1,43 @@
+"""
+Feedback parser tests - malformed scores in the LLM's JSON fall back to the text parser instead of failing /end
+
+Run from backend/:
+    python -m pytest tests/test_feedback_parser.py
+"""
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pydantic import ValidationError
+
+from feedback_analyzer import FeedbackAnalyzer, StructuredFeedback
+
+VALID = {
+    "overall_score": 7, "communication_score": "8/10", "technical_score": 6.6, "preparation_score": "5",
+    "strengths": ["Clear answers"], "areas_for_improvement": [], "detailed_analysis": "Solid.", "recommendations": [],
+}
+
+
+def test_scores_are_coerced_and_clamped():
+    feedback = StructuredFeedback.model_validate({**VALID, "overall_score": 14})
+    assert (feedback.overall_score, feedback.communication_score, feedback.technical_score,
+            feedback.preparation_score) == (10, 8, 7, 5)
+
+
+@pytest.mark.parametrize("score", [None, True, [7], {"value": 7}, "n/a", float("nan")])
+def test_non_numeric_scores_fail_validation(score):
+    with pytest.raises(ValidationError):
+        StructuredFeedback.model_validate({**VALID, "overall_score": score})
+
+
+@pytest.mark.parametrize("score", [None, [7], {"value": 7}])
+def test_malformed_json_falls_back_to_text_parser(score):
+    reply = json.dumps({**VALID, "overall_score": score})
+    parsed = FeedbackAnalyzer()._parse_feedback(reply, [])
+    assert parsed["format"] == "text"
+    assert parsed["overall_score"] == 5
@@ -0,0 +1,78 @@
+"""
+Frame admission tests - a frame's vision slot is returned however its analysis ends
+
+Run from backend/:
+    python -m pytest tests/test_frame_admission.py
+"""
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+
+import interview_routes
+from interview_routes import _analyze_admitted_frame, frame_scheduler
+
+SESSION_ID = "frame-admission-test"
+
+
+@pytest.fixture(autouse=True)
+def admitted(monkeypatch):
+    async def admit(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(interview_routes, "_ensure_session", lambda session_id: None)
+    monkeypatch.setattr(interview_routes.rate_limiter, "admit", admit)
+    yield
+    frame_scheduler.clear_session(SESSION_ID)
+
+
+def _assert_no_slots_held():
+    assert SESSION_ID not in frame_scheduler.in_flight
+    assert frame_scheduler.total_in_flight == 0
+
+
+def test_cancelled_frame_releases_its_slot():
+    started, finish = threading.Event(), threading.Event()
+
+    def analyze(session_id, frame):
+        started.set()
+        finish.wait(5)
+        return {}
+
+    async def cancel_mid_analysis():
+        task = asyncio.create_task(_analyze_admitted_frame(SESSION_ID, analyze, b"frame"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        assert frame_scheduler.in_flight[SESSION_ID] == 1
+        # What the WebSocket handler does to in-flight frames when the client disconnects
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        finish.set()
+
+    asyncio.run(cancel_mid_analysis())
+    _assert_no_slots_held()
+    # The session is admitted again rather than throttled for good
+    frame_scheduler.acquire(SESSION_ID)
+    frame_scheduler.cancel(SESSION_ID)
+
+
+def test_failed_and_successful_frames_release_their_slot():
+    def fail(session_id, frame):
+        raise RuntimeError("vision provider down")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_analyze_admitted_frame(SESSION_ID, fail, b"frame"))
+    assert error.value.status_code == 500
+    _assert_no_slots_held()
+
+    result = asyncio.run(_analyze_admitted_frame(SESSION_ID, lambda session_id, frame: {"ok": True}, b"frame"))
+    assert result["analysis"] == {"ok": True} and result["next_frame_after_ms"] > 0
+    _assert_no_slots_held()
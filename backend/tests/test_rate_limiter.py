@@ -0,0 +1,68 @@
+"""
+Rate limiter tests - workers sharing the database backend never charge the same tokens twice
+
+Run from backend/:
+    python -m pytest tests/test_rate_limiter.py
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import db_config
+from models import Base, RateLimitBucket
+from rate_limiter import DatabaseBucketStore, per_minute_bucket
+
+RESERVATIONS = 40
+COST = 10.0
+
+
+@pytest.fixture
+def sqlite_file_sessions(tmp_path, monkeypatch):
+    # A file database, so every thread gets its own connection like separate workers would
+    engine = create_engine(f"sqlite:///{tmp_path / 'buckets.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db_config, "SessionLocal", sessions)
+    yield sessions
+    engine.dispose()
+
+
+def test_concurrent_reservations_are_all_charged(sqlite_file_sessions):
+    # Slow refill, so the final balance is just capacity minus what was charged
+    spec = per_minute_bucket("global:llm", 6)._replace(capacity=1000.0)
+    store = DatabaseBucketStore()
+    store.reserve([spec], 0, max_wait=60)  # Create the row up front
+    start = threading.Barrier(8)
+    errors = []
+
+    def reserve_many():
+        start.wait()
+        try:
+            for _ in range(RESERVATIONS // 8):
+                store.reserve([spec], COST, max_wait=60)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    db = sqlite_file_sessions()
+    try:
+        tokens = db.get(RateLimitBucket, "global:llm").tokens
+    finally:
+        db.close()
+    # Refill over the test run is at most a few tokens; a lost update would cost COST each
+    assert 1000.0 - RESERVATIONS * COST <= tokens < 1000.0 - (RESERVATIONS - 1) * COST
@@ -0,0 +1,46 @@
+"""
+Resume cache tests - /start only reuses a cached resume the caller uploaded themselves
+
+Run from backend/:
+    python -m pytest tests/test_resume_cache.py
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base
+from resume_cache import get_cached_resume, get_user_resume, resume_sha256, store_resume
+
+ALICE, BOB = 1, 2
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_resume_hash_is_scoped_to_its_uploaders(db):
+    sha256 = resume_sha256(b"%PDF alice's resume")
+    store_resume(db, sha256, "Alice - 10 years of Python", ALICE)
+
+    assert get_user_resume(db, sha256, ALICE).resume_text == "Alice - 10 years of Python"
+    # Knowing the hash is not enough
+    assert get_user_resume(db, sha256, BOB) is None
+
+    # Uploading the same bytes proves possession and links the cached parse
+    assert get_cached_resume(db, sha256, BOB).resume_text == "Alice - 10 years of Python"
+    assert get_user_resume(db, sha256, BOB) is not None
+    assert get_cached_resume(db, sha256, BOB) is not None
@@ -0,0 +1,105 @@
+"""
+Resume parser tests - one slow resume fails alone, and oversized uploads stop before multipart parsing
+
+Run from backend/:
+    python -m pytest tests/test_resume_parser.py
+"""
+import asyncio
+import io
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+import resume_parser
+from resume_parser import ResumeParseError, ResumeUploadLimit, parse_resume_bytes
+
+UPLOAD_PATH = "/api/interview/resume/parse"
+
+
+def _blank_pdf() -> bytes:
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    writer = PyPDF2.PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_worker_deadline_fails_only_that_job(monkeypatch):
+    def stuck(contents, max_chars):
+        while True:
+            time.sleep(0.01)
+
+    monkeypatch.setattr(resume_parser, "PARSE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(resume_parser, "_extract_pdf_text", stuck)
+    with pytest.raises(ResumeParseError, match="too long"):
+        resume_parser.extract_pdf_text(b"%PDF")
+
+
+def test_timeout_leaves_other_parses_running(monkeypatch):
+    contents = _blank_pdf()
+
+    async def timeout_beside_another_parse():
+        other = asyncio.create_task(parse_resume_bytes(contents))
+        await asyncio.sleep(0)  # Let it reach the pool with the normal deadline
+        monkeypatch.setattr(resume_parser, "PARSE_GRACE_SECONDS", -resume_parser.PARSE_TIMEOUT_SECONDS)
+        with pytest.raises(ResumeParseError, match="too long"):
+            await parse_resume_bytes(contents)
+        monkeypatch.undo()
+        return await other
+
+    try:
+        executor = resume_parser.get_parse_executor()
+        assert asyncio.run(timeout_beside_another_parse()) == ""
+        assert resume_parser._executor is executor
+    finally:
+        resume_parser.shutdown_parse_executor()
+
+
+def _upload_app(seen: list):
+    app = FastAPI()
+
+    @app.post(UPLOAD_PATH)
+    async def upload(file: UploadFile = File(...)):
+        seen.append(file.filename)
+        return {"ok": True}
+
+    return ResumeUploadLimit(app, max_bytes=4096)
+
+
+def _post(app, **kwargs) -> httpx.Response:
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(UPLOAD_PATH, **kwargs)
+
+    return asyncio.run(post())
+
+
+def test_oversized_uploads_are_rejected_before_parsing():
+    seen = []
+    app = _upload_app(seen)
+
+    assert _post(app, files={"file": ("small.pdf", b"x" * 1024, "application/pdf")}).status_code == 200
+    assert seen == ["small.pdf"]
+
+    response = _post(app, files={"file": ("large.pdf", b"x" * 8192, "application/pdf")})
+    assert response.status_code == 413 and "smaller than" in response.json()["detail"]
+
+    async def chunked():
+        # No Content-Length - the cap is enforced on the stream itself
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.pdf\"\r\n\r\n"
+        for _ in range(8):
+            yield b"x" * 1024
+
+    response = _post(app, content=chunked(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert seen == ["small.pdf"]
@@ -0,0 +1,192 @@
+"""
+Session routing integration test - two real workers behind session_router.py
+
+Starts `python session_router.py --workers 2` against a throwaway SQLite
+database with no LLM keys (replies fall back to the canned interviewer text),
+opens one interview on each shard and checks that every call naming a session
+(path, X-Session-Id header, JSON body) reaches the worker that holds it.
+
+Run from backend/:
+    python -m pytest tests/test_session_router.py
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("uvicorn")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from session_router import SessionRouter, session_id_from_request
+from sharding import shard_for_session
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _answers(url: str) -> bool:
+    try:
+        httpx.get(f"{url}/", timeout=2.0)
+        return True
+    except httpx.HTTPError:
+        return False
+
+
+def test_session_id_from_request():
+    assert session_id_from_request("/api/interview/w1-abc/status", {}, b"") == "w1-abc"
+    assert session_id_from_request("/api/interview/ws/w0-abc", {}, b"") == "w0-abc"
+    assert session_id_from_request("/api/interview/message", {b"x-session-id": b"w1-x"}, b"") == "w1-x"
+    assert session_id_from_request("/api/interview/end", {}, b"session_id=w0-q") == "w0-q"
+    assert session_id_from_request("/api/interview/message", {}, b"", b'{"message": "hi", "session_id": "w1-b"}') == "w1-b"
+    assert session_id_from_request("/api/auth/login", {}, b"", b'{"email": "a@b.c"}') is None
+
+
+def test_pick_upstream():
+    router = SessionRouter(["http://w0", "http://w1"])
+    assert router.pick_upstream("w1-abc") == "http://w1"
+    assert router.pick_upstream("w0-abc") == "http://w0"
+    assert router.pick_upstream("w7-abc") is None  # Owner not running
+    # Session-less calls alternate between workers
+    assert {router.pick_upstream(None), router.pick_upstream(None)} == {"http://w0", "http://w1"}
+    assert router.pick_upstream("plain-uuid") in router.upstreams
+
+
+def _call_router(router, path, chunks, headers=()):
+    """Drive the router's ASGI app with a body sent in chunks; returns (status, upstream bodies received)"""
+    import asyncio
+
+    received = []
+
+    async def upstream(request):
+        received.append(await request.aread())
+        return httpx.Response(200, stream=httpx.ByteStream(b"ok"))
+
+    async def run():
+        router.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+                    for index, chunk in enumerate(chunks)]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": path, "query_string": b"", "headers": list(headers)}
+        try:
+            await router(scope, receive, send)
+        finally:
+            await router.client.aclose()
+        return sent[0]["status"]
+
+    return asyncio.run(run()), received
+
+
+def test_bodies_are_streamed_and_capped(monkeypatch):
+    import session_router
+
+    monkeypatch.setattr(session_router, "ROUTER_MAX_BODY_BYTES", 1000)
+    router = SessionRouter(["http://w0", "http://w1"])
+
+    # Declared too large: refused before any of the body is read
+    status, received = _call_router(router, "/api/interview/message", [b"x" * 10], [(b"content-length", b"5000")])
+    assert status == 413 and received == []
+
+    # Undeclared (chunked) body over the cap once streaming: 413, never forwarded whole
+    status, received = _call_router(router, "/api/interview/message",
+                                    [b'{"session_id": "w1-a", "message": "', b"x" * 600, b"x" * 600])
+    assert status == 413
+
+    # Within the cap: forwarded intact, routed by the session id near the start of the body
+    body = [b'{"session_id": "w1-a", "message": "', b"x" * 300, b'"}']
+    status, received = _call_router(router, "/api/interview/message", body)
+    assert status == 200 and received == [b"".join(body)]
+
+
+@pytest.fixture(scope="module")
+def router_url(tmp_path_factory):
+    port, worker_base_port = _free_port(), _free_port()
+    while worker_base_port + 1 == port:
+        worker_base_port = _free_port()
+    database = tmp_path_factory.mktemp("router") / "router_test.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "GROQ_API_KEY": "", "GEMINI_API_KEY": "", "OPENAI_API_KEY": "",
+        "WARMUP_PROVIDERS": "0", "CODE_SANDBOX_ENABLED": "0",
+    }
+    # Create the tables once so both workers don't race on create_all
+    subprocess.run([sys.executable, "-c", "from db_config import init_db; init_db()"], cwd=BACKEND_DIR, env=env,
+                   check=True, capture_output=True)
+    router = subprocess.Popen(
+        [sys.executable, "session_router.py", "--workers", "2", "--host", "127.0.0.1",
+         "--port", str(port), "--worker-base-port", str(worker_base_port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    workers = [f"http://127.0.0.1:{worker_base_port + shard}" for shard in range(2)]
+    try:
+        deadline = time.monotonic() + 90
+        while True:
+            try:
+                httpx.get(f"{url}/", timeout=2.0)
+                break
+            except httpx.HTTPError:
+                if router.poll() is not None or time.monotonic() > deadline:
+                    pytest.fail("session router did not start")
+                time.sleep(0.5)
+        yield url, workers
+    finally:
+        router.terminate()
+        router.wait(timeout=60)
+    # Stopping the router stops its workers
+    assert not any(_answers(worker) for worker in workers)
+
+
+
+def test_sessions_reach_their_owner(router_url):
+    url, workers = router_url
+    with httpx.Client(base_url=url, timeout=60.0) as client:
+        registered = client.post("/api/auth/register", json={
+            "email": "router-test@example.com", "password": "router-test-pw", "full_name": "Router Test"
+        })
+        assert registered.status_code == 200, registered.text
+        headers = {"Authorization": f"Bearer {registered.json()['access_token']}"}
+
+        # /start has no session yet, so consecutive starts land on different workers
+        sessions = []
+        for _ in range(2):
+            started = client.post("/api/interview/start", headers=headers, json={"role": "engineer"})
+            assert started.status_code == 200, started.text
+            sessions.append(started.json()["session_id"])
+        assert sorted(shard_for_session(session_id) for session_id in sessions) == [0, 1]
+
+        # Session state exists only on its owner; a mis-route would 404
+        for session_id in sessions:
+            other_worker = workers[1 - shard_for_session(session_id)]
+            assert httpx.get(f"{other_worker}/api/interview/{session_id}/status", headers=headers).status_code == 404
+        for _ in range(3):
+            for session_id in sessions:
+                status = client.get(f"/api/interview/{session_id}/status", headers=headers)
+                assert status.status_code == 200, status.text
+                assert status.json()["session_id"] == session_id
+
+                reply = client.post("/api/interview/message", headers=headers,
+                                    json={"session_id": session_id, "message": "I mostly work on backend APIs."})
+                assert reply.status_code == 200, reply.text
+                assert reply.json()["session_id"] == session_id
+
+                by_header = client.get(f"/api/interview/{session_id}/status",
+                                       headers={**headers, "X-Session-Id": session_id})
+                assert by_header.status_code == 200, by_header.text
+
@@ -7,6 +7,12 @@ import base64
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from interview_agent import configure_gemini
+from logger import get_logger
+from metrics import track_vision_call
+
+logger = get_logger("video_analyzer")
+
 # Lazy initialization of clients
 _openai_client = None
 _gemini_model = None
@@ -35,8 +41,7 @@ def get_gemini_model():
             print("[INFO] No GEMINI_API_KEY found in environment")
             return None
         try:
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
+            genai = configure_gemini(api_key)
             
             # Try models in order of preference (vision-capable models)
             model_names = [
@@ -73,7 +78,22 @@ class VideoAnalyzer:
         self.frame_analysis_history: Dict[str, List[Dict]] = {}  # session_id -> list of analyses
     
     def analyze_frame(self, session_id: str, image_base64: str, current_question: str = "") -> Dict:
-        """Analyze a single video frame for facial expressions and body language"""
+        """Analyze a single base64-encoded video frame for facial expressions and body language"""
+        try:
+            image_bytes = base64.b64decode(image_base64)
+        except Exception as e:
+            logger.error("frame_decode_failed", extra={"session_id": session_id, "error": str(e)})
+            return {
+                "eye_contact": "unknown",
+                "facial_expression": "neutral",
+                "body_language": "neutral",
+                "confidence_level": "neutral",
+                "notes": f"Analysis unavailable: {str(e)}"
+            }
+        return self.analyze_frame_bytes(session_id, image_bytes, "image/jpeg", current_question)
+    
+    def analyze_frame_bytes(self, session_id: str, image_bytes: bytes, mime_type: str = "image/jpeg", current_question: str = "") -> Dict:
+        """Analyze a single encoded video frame (JPEG/WebP/PNG bytes) for facial expressions and body language"""
         try:
             # Try Gemini first (free), then OpenAI
             gemini_model = get_gemini_model()
@@ -81,7 +101,7 @@ class VideoAnalyzer:
             
             # If no vision API available, return neutral analysis WITHOUT storing
             if gemini_model is None and openai_client is None:
-                print(f"[INFO] Video analysis skipped - No API key configured")
+                logger.debug("video_analysis_skipped", extra={"session_id": session_id, "reason": "no_api_key"})
                 return {
                     "eye_contact": "unknown",
                     "facial_expression": "neutral",
@@ -99,63 +119,63 @@ class VideoAnalyzer:
             # Try Gemini first (free tier available)
             if gemini_model:
                 try:
-                    import PIL.Image
-                    import io
-                    
-                    print(f"[INFO] Analyzing frame with Gemini for session {session_id}")
-                    
-                    # Decode base64 image
-                    image_data = base64.b64decode(image_base64)
-                    image = PIL.Image.open(io.BytesIO(image_data))
-                    
-                    print(f"[INFO] Image decoded successfully: {image.size}")
+                    # Pass the encoded image through as-is; no need to decode it locally
+                    image_part = {"mime_type": mime_type, "data": image_bytes}
                     
                     # Call Gemini Vision API
-                    response = gemini_model.generate_content([analysis_prompt, image])
-                    
-                    # Check if response was blocked
-                    if hasattr(response, 'prompt_feedback'):
-                        print(f"[INFO] Prompt feedback: {response.prompt_feedback}")
+                    with track_vision_call("gemini"):
+                        response = gemini_model.generate_content([analysis_prompt, image_part])
+                        analysis_text = response.text.strip()
                     
-                    analysis_text = response.text.strip()
-                    print(f"[SUCCESS] Gemini analysis completed: {analysis_text[:100]}...")
+                    logger.debug("frame_analyzed", extra={
+                        "session_id": session_id,
+                        "provider": "gemini",
+                        "image_bytes": len(image_bytes),
+                        "prompt_feedback": str(getattr(response, "prompt_feedback", ""))
+                    })
                     
                 except Exception as gemini_error:
-                    print(f"[ERROR] Gemini analysis failed: {gemini_error}")
-                    print(f"[ERROR] Error type: {type(gemini_error).__name__}")
+                    logger.error("gemini_vision_failed", extra={
+                        "session_id": session_id,
+                        "error": str(gemini_error),
+                        "error_type": type(gemini_error).__name__
+                    })
                     # Fall back to OpenAI if available
                     if openai_client is None:
                         raise gemini_error
             
             # Use OpenAI if Gemini failed or not available
             if not analysis_text and openai_client:
-                response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert interview coach analyzing a candidate's video frame during a mock interview. Provide detailed, constructive observations about facial expressions, body language, eye contact, and presentation."
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": analysis_prompt
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_base64}"
+                # The OpenAI API only takes images as URLs, so encode here rather than on every frame
+                image_base64 = base64.b64encode(image_bytes).decode()
+                with track_vision_call("openai"):
+                    response = openai_client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are an expert interview coach analyzing a candidate's video frame during a mock interview. Provide detailed, constructive observations about facial expressions, body language, eye contact, and presentation."
+                            },
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": analysis_prompt
+                                    },
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:{mime_type};base64,{image_base64}"
+                                        }
                                     }
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=200,
-                    temperature=0.7
-                )
-                analysis_text = response.choices[0].message.content.strip()
+                                ]
+                            }
+                        ],
+                        max_tokens=200,
+                        temperature=0.7
+                    )
+                    analysis_text = response.choices[0].message.content.strip()
             
             # Parse and structure the analysis
             structured_analysis = self._parse_analysis(analysis_text)
@@ -173,12 +193,15 @@ class VideoAnalyzer:
             
             self.frame_analysis_history[session_id].append(analysis_record)
             
-            print(f"[INFO] Frame analyzed for session {session_id}. Total frames: {len(self.frame_analysis_history[session_id])}")
+            logger.info("frame_stored", extra={
+                "session_id": session_id,
+                "total_frames": len(self.frame_analysis_history[session_id])
+            })
             
             return structured_analysis
             
         except Exception as e:
-            print(f"Error analyzing video frame: {e}")
+            logger.error("frame_analysis_failed", extra={"session_id": session_id, "error": str(e)})
             return {
                 "eye_contact": "unknown",
                 "facial_expression": "neutral",
@@ -0,0 +1,77 @@
+"""
+Startup warm-up - loads provider SDKs and clients in the background so the first interview doesn't pay for them
+"""
+import os
+import threading
+import time
+
+from logger import get_logger
+
+logger = get_logger("warmup")
+
+# Set WARMUP_PROVIDERS=0 to skip (e.g. in the cold-start benchmark or one-off scripts)
+WARMUP_ENABLED = os.getenv("WARMUP_PROVIDERS", "1") != "0"
+
+
+def _warm_groq():
+    from interview_agent import get_groq_client
+    get_groq_client()
+
+
+def _warm_gemini():
+    from video_analyzer import get_gemini_model
+    get_gemini_model()
+
+
+def _warm_local_llm():
+    from local_llm import local_llm
+    local_llm.load()
+
+
+def _warm_code_sandbox():
+    from code_sandbox import CODE_SANDBOX_ENABLED, get_sandbox_pool
+    if CODE_SANDBOX_ENABLED:
+        get_sandbox_pool().fill()
+
+
+def _warm_zstd_dictionaries():
+    from compression import ZSTD_AVAILABLE, _load_dictionaries
+    if ZSTD_AVAILABLE:
+        _load_dictionaries()
+
+
+def _warm_resume_parser():
+    # PDF parsing runs in the forkserver/spawn pool, so importing PyPDF2 here would not help
+    from resume_parser import warm_parse_executor
+    warm_parse_executor()
+
+
+# Each step is independent; a missing key or package only skips that provider
+WARMUP_STEPS = (
+    ("groq", _warm_groq),
+    ("gemini", _warm_gemini),
+    ("local_llm", _warm_local_llm),
+    ("code_sandbox", _warm_code_sandbox),
+    ("zstd_dictionaries", _warm_zstd_dictionaries),
+    ("resume_parser", _warm_resume_parser),
+)
+
+
+def _run_warmup():
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.info("warmup_skipped", extra={"step": name, "error": str(e)})
+            continue
+        logger.info("warmup_done", extra={"step": name, "seconds": round(time.perf_counter() - started, 3)})
+
+
+def start_warmup():
+    """Warm provider clients on a daemon thread; returns immediately"""
+    if not WARMUP_ENABLED:
+        return None
+    thread = threading.Thread(target=_run_warmup, name="provider-warmup", daemon=True)
+    thread.start()
+    return thread
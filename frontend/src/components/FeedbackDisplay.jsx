@@ -20,6 +20,21 @@ function FeedbackDisplay({ feedback, onNewInterview, onStartNew }) {
     return ((score || 0) / 10) * 100
   }
 
+  // Cohort ranking from precomputed (role, round) histograms; absent until the cohort is large enough
+  const renderPercentile = (metric, withCohort = false) => {
+    const ranking = feedback.percentiles?.[metric]
+    if (!ranking) return null
+    const cohort = feedback.cohort
+    const label = withCohort && cohort
+      ? `${cohort.role.replace('_', ' ')}/${cohort.interview_round} candidates`
+      : 'candidates'
+    return (
+      <div className="score-percentile">
+        Better than {Math.floor(ranking.percentile)}% of {label}
+      </div>
+    )
+  }
+
   return (
     <div className="feedback-display">
       <div className="feedback-card">
@@ -51,6 +66,7 @@ function FeedbackDisplay({ feedback, onNewInterview, onStartNew }) {
               {feedback.overall_score >= 8 ? '🌟 Excellent' : 
                feedback.overall_score >= 6 ? '👍 Good' : '📈 Needs Improvement'}
             </div>
+            {renderPercentile('overall_score', true)}
           </div>
 
           <div className="score-card">
@@ -79,6 +95,7 @@ function FeedbackDisplay({ feedback, onNewInterview, onStartNew }) {
                 }}
               ></div>
             </div>
+            {renderPercentile('communication_score')}
           </div>
 
           <div className="score-card">
@@ -107,6 +124,7 @@ function FeedbackDisplay({ feedback, onNewInterview, onStartNew }) {
                 }}
               ></div>
             </div>
+            {renderPercentile('technical_score')}
           </div>
 
           <div className="score-card">
@@ -135,6 +153,7 @@ function FeedbackDisplay({ feedback, onNewInterview, onStartNew }) {
                 }}
               ></div>
             </div>
+            {renderPercentile('preparation_score')}
           </div>
         </div>
 
@@ -1,8 +1,14 @@
 import React, { useState, useEffect, useRef } from 'react'
 import axios from 'axios'
 import CodeEditor from './CodeEditor'
+import InterviewSocket, { actionKey, settleAction, sendWithFallback } from '../interviewSocket'
 import './InterviewSession.css'
 
+// Frame pacing bounds; the server's next_frame_after_ms hint is used within them
+const DEFAULT_FRAME_INTERVAL_MS = 5000
+const MIN_FRAME_INTERVAL_MS = 2000
+const MAX_FRAME_INTERVAL_MS = 30000
+
 function InterviewSession({ sessionData, onEnd, token }) {
   const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
   
@@ -21,7 +27,12 @@ function InterviewSession({ sessionData, onEnd, token }) {
   const messagesEndRef = useRef(null)
   const videoRef = useRef(null)
   const streamRef = useRef(null)
-  const frameIntervalRef = useRef(null)
+  const frameTimerRef = useRef(null) // Next scheduled frame capture
+  const frameInFlightRef = useRef(false) // A frame is being analyzed by the server
+  const captureFrameRef = useRef(null) // Latest captureAndAnalyzeFrame, for the timer chain
+  const socketRef = useRef(null) // Session WebSocket; HTTP is used whenever it isn't open
+  const messageActionRef = useRef(null) // Idempotency key of the latest message send, reused by its retries
+  const codeActionRef = useRef(null) // Same for code submissions
   const canvasRef = useRef(null)
   const speechSynthesisRef = useRef(null)
   const recognitionRef = useRef(null) // Store recognition instance for callbacks
@@ -178,8 +189,9 @@ function InterviewSession({ sessionData, onEnd, token }) {
     return () => {
       clearTimeout(videoTimer)
       stopSpeaking()
-      if (frameIntervalRef.current) {
-        clearInterval(frameIntervalRef.current)
+      if (frameTimerRef.current) {
+        clearTimeout(frameTimerRef.current)
+        frameTimerRef.current = null
       }
       if (streamRef.current) {
         streamRef.current.getTracks().forEach(track => track.stop())
@@ -219,6 +231,21 @@ function InterviewSession({ sessionData, onEnd, token }) {
     scrollToBottom()
   }, [messages])
 
+  // One authenticated WebSocket per session for messages, code and frames
+  useEffect(() => {
+    if (!sessionData?.session_id || !token) return
+    const socket = new InterviewSocket(API_URL, sessionData.session_id, token, {
+      onError: () => console.log('Interview socket unavailable - using HTTP')
+    })
+    socket.connect()
+    socketRef.current = socket
+    return () => {
+      socket.close()
+      socketRef.current = null
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [sessionData?.session_id, token])
+
   // Debug: Log when videoEnabled changes
   useEffect(() => {
     console.log('videoEnabled state changed to:', videoEnabled)
@@ -473,24 +500,34 @@ function InterviewSession({ sessionData, onEnd, token }) {
     console.log('Sending message in mode:', currentMode, 'State mode:', mode)
 
     try {
-      const response = await axios.post(`${API_URL}/api/interview/message`, {
-        session_id: sessionData.session_id,
-        message: text.trim(),
-        is_voice: isVoice
-      }, {
-        headers: { Authorization: `Bearer ${token}` }
-      })
+      const idempotencyKey = actionKey(messageActionRef, text.trim())
+      const data = await sendWithFallback(
+        socketRef.current,
+        { type: 'message', message: text.trim(), is_voice: isVoice, idempotency_key: idempotencyKey },
+        () => axios.post(`${API_URL}/api/interview/message`, {
+          session_id: sessionData.session_id,
+          message: text.trim(),
+          is_voice: isVoice
+        }, {
+          headers: {
+            Authorization: `Bearer ${token}`,
+            'X-Session-Id': sessionData.session_id,
+            'Idempotency-Key': idempotencyKey
+          }
+        })
+      )
+      settleAction(messageActionRef, idempotencyKey)
 
       const assistantMessage = {
         role: 'assistant',
-        content: response.data.response,
+        content: data.response,
         timestamp: new Date().toISOString()
       }
 
       setMessages(prev => [...prev, assistantMessage])
       
       // Auto-open code editor if interviewer explicitly asks for code editor
-      const responseText = response.data.response.toLowerCase()
+      const responseText = data.response.toLowerCase()
       const explicitEditorKeywords = ['code editor', 'use the editor', 'use the code editor']
       const shouldOpenEditor = explicitEditorKeywords.some(keyword => responseText.includes(keyword))
       
@@ -501,29 +538,32 @@ function InterviewSession({ sessionData, onEnd, token }) {
 
       // Check mode again after async operation
       const modeAfterResponse = modeRef.current
-      console.log('Response received. Mode ref:', modeAfterResponse, 'Response:', response.data.response?.substring(0, 50))
+      console.log('Response received. Mode ref:', modeAfterResponse, 'Response:', data.response?.substring(0, 50))
       
       // Always speak if we're in voice mode OR if this was a voice message
-      if ((modeAfterResponse === 'voice' || isVoice) && response.data.response) {
+      if ((modeAfterResponse === 'voice' || isVoice) && data.response) {
         console.log('Voice mode active - speaking response')
         // Small delay to ensure message is rendered
         setTimeout(() => {
           console.log('Actually calling speakText now')
-          speakText(response.data.response)
+          speakText(data.response)
         }, 300)
       } else {
         console.log('Not speaking - mode ref is:', modeAfterResponse, 'isVoice:', isVoice)
       }
 
       // Check if interview should end
-      if (!response.data.should_continue) {
+      if (!data.should_continue) {
         handleEndInterview()
       }
     } catch (err) {
       console.error(err)
+      const rateLimited = err.response?.status === 429
       setMessages(prev => [...prev, {
         role: 'assistant',
-        content: 'Sorry, I encountered an error. Please try again.',
+        content: rateLimited
+          ? "You're sending messages faster than I can keep up. Please wait a few seconds and try again."
+          : 'Sorry, I encountered an error. Please try again.',
         timestamp: new Date().toISOString(),
         error: true
       }])
@@ -556,11 +596,13 @@ function InterviewSession({ sessionData, onEnd, token }) {
     }
   }
 
+  // Returns how long to wait before the next frame, as suggested by the server
   const captureAndAnalyzeFrame = async () => {
-    if (!videoRef.current || !videoEnabled || !videoAnalysisEnabled || loading) {
-      return
+    if (!videoRef.current || !videoEnabled || !videoAnalysisEnabled || loading || frameInFlightRef.current) {
+      return DEFAULT_FRAME_INTERVAL_MS
     }
 
+    frameInFlightRef.current = true
     try {
       // Create canvas to capture frame
       if (!canvasRef.current) {
@@ -571,7 +613,7 @@ function InterviewSession({ sessionData, onEnd, token }) {
 
       // Check if video is ready
       if (!video.videoWidth || !video.videoHeight) {
-        return
+        return DEFAULT_FRAME_INTERVAL_MS
       }
 
       // Set canvas dimensions to video dimensions
@@ -582,36 +624,74 @@ function InterviewSession({ sessionData, onEnd, token }) {
       const ctx = canvas.getContext('2d')
       ctx.drawImage(video, 0, 0, canvas.width, canvas.height)
 
-      // Convert canvas to base64
-      const imageBase64 = canvas.toDataURL('image/jpeg', 0.8).split(',')[1]
+      // Encode the frame as JPEG bytes (sent as-is, no base64)
+      const frameBlob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.8))
+      if (!frameBlob) {
+        return DEFAULT_FRAME_INTERVAL_MS
+      }
 
       // Get current question context
       const currentQuestion = messages.length > 0 && messages[messages.length - 1].role === 'assistant'
         ? messages[messages.length - 1].content.substring(0, 200)
         : ''
 
-      // Send frame to backend for analysis (fire and forget - don't block)
+      // Send frame to backend for analysis (one at a time - the server paces us)
       console.log('📸 Capturing frame for analysis...')
-      axios.post(`${API_URL}/api/interview/video-frame`, {
-        session_id: sessionData.session_id,
-        image_base64: imageBase64,
-        current_question: currentQuestion
-      }, {
-        headers: { Authorization: `Bearer ${token}` }
-      }).then(response => {
-        if (response.data && response.data.analysis) {
-          console.log('✅ Video analysis received:', response.data.analysis)
-          setLatestAnalysis(response.data.analysis)
+      const socket = socketRef.current
+      if (socket && socket.isOpen()) {
+        const result = await socket.sendFrame(frameBlob)
+        if (!result.throttled && result.analysis) {
+          console.log('✅ Video analysis received:', result.analysis)
+          setLatestAnalysis(result.analysis)
         }
-      }).catch(err => {
-        // Silently fail - video analysis is optional
-        console.log('❌ Video analysis error (non-critical):', err.message)
-      })
+        return result.next_frame_after_ms || DEFAULT_FRAME_INTERVAL_MS
+      }
 
+      const response = await axios.post(`${API_URL}/api/interview/video-frame/binary`, frameBlob, {
+        params: {
+          session_id: sessionData.session_id,
+          current_question: currentQuestion
+        },
+        headers: {
+          Authorization: `Bearer ${token}`,
+          'Content-Type': 'image/jpeg'
+        }
+      })
+      if (response.data && response.data.analysis) {
+        console.log('✅ Video analysis received:', response.data.analysis)
+        setLatestAnalysis(response.data.analysis)
+      }
+      return response.data?.next_frame_after_ms || DEFAULT_FRAME_INTERVAL_MS
     } catch (err) {
-      console.log('Error capturing frame (non-critical):', err.message)
+      // Server is over its vision budget - back off for as long as it asks
+      if (err.response?.status === 429) {
+        const hintMs = err.response.data?.detail?.next_frame_after_ms
+        const retryAfterMs = Number(err.response.headers?.['retry-after']) * 1000
+        return hintMs || retryAfterMs || MAX_FRAME_INTERVAL_MS
+      }
+      // Silently fail - video analysis is optional
+      console.log('❌ Video analysis error (non-critical):', err.message)
+      return DEFAULT_FRAME_INTERVAL_MS
+    } finally {
+      frameInFlightRef.current = false
     }
   }
+  captureFrameRef.current = captureAndAnalyzeFrame
+
+  // Capture a frame, then schedule the next one after the server's hint
+  const scheduleNextFrame = (delayMs) => {
+    if (frameTimerRef.current) {
+      clearTimeout(frameTimerRef.current)
+    }
+    frameTimerRef.current = setTimeout(async () => {
+      const nextDelayMs = await captureFrameRef.current()
+      // Stopped while the frame was in flight
+      if (frameTimerRef.current === null) {
+        return
+      }
+      scheduleNextFrame(Math.min(Math.max(nextDelayMs, MIN_FRAME_INTERVAL_MS), MAX_FRAME_INTERVAL_MS))
+    }, delayMs)
+  }
 
   const startVideo = async () => {
     // Prevent multiple simultaneous starts
@@ -656,12 +736,10 @@ function InterviewSession({ sessionData, onEnd, token }) {
             await videoRef.current.play()
             console.log('Video playing successfully')
             
-            // Start periodic frame capture for analysis (every 5 seconds)
+            // Start periodic frame capture for analysis, paced by the server
             if (videoAnalysisEnabled) {
-              console.log('🎥 Starting periodic video analysis (every 5 seconds)')
-              frameIntervalRef.current = setInterval(() => {
-                captureAndAnalyzeFrame()
-              }, 5000) // Capture every 5 seconds
+              console.log('🎥 Starting periodic video analysis')
+              scheduleNextFrame(DEFAULT_FRAME_INTERVAL_MS)
             }
           } catch (playErr) {
             console.error('Error playing video:', playErr)
@@ -708,10 +786,10 @@ function InterviewSession({ sessionData, onEnd, token }) {
     // Reset the starting flag
     isStartingVideoRef.current = false
     
-    // Stop frame capture interval
-    if (frameIntervalRef.current) {
-      clearInterval(frameIntervalRef.current)
-      frameIntervalRef.current = null
+    // Stop frame capture timer
+    if (frameTimerRef.current) {
+      clearTimeout(frameTimerRef.current)
+      frameTimerRef.current = null
     }
     
     // Clear video element FIRST
@@ -759,13 +837,23 @@ function InterviewSession({ sessionData, onEnd, token }) {
     
     try {
       // Send code to backend for review - this will automatically add it to conversation history
-      const codeResponse = await axios.post(`${API_URL}/api/interview/code-submission`, {
-        session_id: sessionData.session_id,
-        code: code.trim(),
-        language: language
-      }, {
-        headers: { Authorization: `Bearer ${token}` }
-      })
+      const idempotencyKey = actionKey(codeActionRef, `${language}\n${code.trim()}`)
+      const codeData = await sendWithFallback(
+        socketRef.current,
+        { type: 'code', code: code.trim(), language: language, idempotency_key: idempotencyKey },
+        () => axios.post(`${API_URL}/api/interview/code-submission`, {
+          session_id: sessionData.session_id,
+          code: code.trim(),
+          language: language
+        }, {
+          headers: {
+            Authorization: `Bearer ${token}`,
+            'X-Session-Id': sessionData.session_id,
+            'Idempotency-Key': idempotencyKey
+          }
+        })
+      )
+      settleAction(codeActionRef, idempotencyKey)
 
       // Add code message to conversation
       const codeMessage = {
@@ -780,7 +868,7 @@ function InterviewSession({ sessionData, onEnd, token }) {
       // Add reviewer response (from backend)
       const assistantMessage = {
         role: 'assistant',
-        content: codeResponse.data.review || 'Thank you for submitting your code. Let me review it.',
+        content: codeData.review || 'Thank you for submitting your code. Let me review it.',
         timestamp: new Date().toISOString()
       }
 
@@ -813,7 +901,7 @@ function InterviewSession({ sessionData, onEnd, token }) {
       const response = await axios.post(`${API_URL}/api/interview/end`, {
         session_id: sessionData.session_id
       }, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}`, 'X-Session-Id': sessionData.session_id }
       })
       onEnd(response.data)
     } catch (err) {
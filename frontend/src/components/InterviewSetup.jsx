@@ -12,6 +12,7 @@ function InterviewSetup({ onStart, token }) {
   const [resumeFile, setResumeFile] = useState(null)
   const [resumeFileName, setResumeFileName] = useState('')
   const [resumeText, setResumeText] = useState('')
+  const [resumeHash, setResumeHash] = useState('')
   const [parsingResume, setParsingResume] = useState(false)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
@@ -67,6 +68,7 @@ function InterviewSetup({ onStart, token }) {
       })
       
       setResumeText(response.data.resume_text || '')
+      setResumeHash(response.data.resume_hash || '')
       
       if (!response.data.resume_text || response.data.resume_text.trim().length < 50) {
         setError('Could not extract meaningful text from resume. Please ensure it is a valid PDF with text content.')
@@ -76,6 +78,7 @@ function InterviewSetup({ onStart, token }) {
       setResumeFile(null)
       setResumeFileName('')
       setResumeText('')
+      setResumeHash('')
     } finally {
       setParsingResume(false)
     }
@@ -92,6 +95,7 @@ function InterviewSetup({ onStart, token }) {
     setResumeFile(null)
     setResumeFileName('')
     setResumeText('')
+    setResumeHash('')
   }
 
   const handleSubmit = async (e) => {
@@ -116,7 +120,8 @@ function InterviewSetup({ onStart, token }) {
         interview_round: interviewRound,
         duration_minutes: duration,
         voice_gender: voiceGender,
-        resume_text: resumeText || undefined
+        resume_text: resumeText || undefined,
+        resume_hash: resumeHash || undefined
       }, {
         headers: { Authorization: `Bearer ${token}` }
       })
@@ -39,6 +39,23 @@ const ReportsTab = () => {
     }
   };
 
+  const downloadHistory = async (format) => {
+    try {
+      const response = await fetch(`${API_URL}/api/reports/export?format=${format}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const url = URL.createObjectURL(await response.blob());
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `interview-reports.${format}`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error('Failed to download interview history:', error);
+    }
+  };
+
   const getScoreColor = (score) => {
     if (score >= 80) return '#4CAF50';
     if (score >= 60) return '#FFC107';
@@ -63,7 +80,13 @@ const ReportsTab = () => {
     <div className="reports-tab">
       {!selectedInterview ? (
         <div className="reports-list">
-          <h2>Interview History</h2>
+          <div className="reports-list-header">
+            <h2>Interview History</h2>
+            <div className="download-actions">
+              <button onClick={() => downloadHistory('csv')} className="back-btn">⬇ CSV</button>
+              <button onClick={() => downloadHistory('ndjson')} className="back-btn">⬇ JSON</button>
+            </div>
+          </div>
           <div className="interviews-grid">
             {interviews.map((interview) => (
               <div
@@ -0,0 +1,147 @@
+// One WebSocket per interview session, carrying messages, code, status and webcam frames.
+// Callers fall back to the HTTP endpoints whenever isOpen() is false.
+
+const REQUEST_TIMEOUT_MS = 60000
+
+// Repeats of an action this soon after it completed (recognition restarts, double-clicks) are duplicates
+const DUPLICATE_WINDOW_MS = 5000
+
+// One key per user action; retries and duplicate sends of that action reuse it
+export const newIdempotencyKey = () =>
+  (window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`)
+
+// Key for sending `payload`: the previous action's key when this is the same payload again
+// (still pending, failed and being retried, or repeated within DUPLICATE_WINDOW_MS), otherwise a new one
+export const actionKey = (actionRef, payload) => {
+  const previous = actionRef.current
+  const duplicate = previous && previous.payload === payload &&
+    (previous.settledAt === null || Date.now() - previous.settledAt < DUPLICATE_WINDOW_MS)
+  if (!duplicate) {
+    actionRef.current = { payload, key: newIdempotencyKey(), settledAt: null }
+  }
+  return actionRef.current.key
+}
+
+// Mark the action acknowledged by the server; only quick repeats reuse its key from now on
+export const settleAction = (actionRef, key) => {
+  if (actionRef.current?.key === key) {
+    actionRef.current = { ...actionRef.current, settledAt: Date.now() }
+  }
+}
+
+// Send over the socket when it is open; if it drops mid-request, retry the same action (same key) over HTTP
+export const sendWithFallback = async (socket, socketEvent, httpRequest) => {
+  if (socket && socket.isOpen()) {
+    try {
+      return await socket.request(socketEvent)
+    } catch (err) {
+      if (err.response) throw err // The server answered - not a transport failure
+    }
+  }
+  return (await httpRequest()).data
+}
+
+export class InterviewSocket {
+  constructor(apiUrl, sessionId, token, { onStatus, onError } = {}) {
+    const wsUrl = apiUrl.replace(/^http/, 'ws')
+    this.url = `${wsUrl}/api/interview/ws/${encodeURIComponent(sessionId)}?token=${encodeURIComponent(token)}`
+    this.onStatus = onStatus
+    this.onError = onError
+    this.socket = null
+    this.nextId = 1
+    this.pending = new Map() // request id -> { resolve, reject, timer }
+    this.pendingFrame = null // frames carry no id; only one is in flight at a time
+  }
+
+  connect() {
+    this.socket = new WebSocket(this.url)
+    this.socket.binaryType = 'arraybuffer'
+    this.socket.onmessage = (event) => this.handleEvent(JSON.parse(event.data))
+    this.socket.onclose = () => this.failPending(new Error('Interview socket closed'))
+    this.socket.onerror = () => {
+      if (this.onError) this.onError()
+    }
+  }
+
+  isOpen() {
+    return this.socket !== null && this.socket.readyState === WebSocket.OPEN
+  }
+
+  close() {
+    if (this.socket) {
+      this.socket.onclose = null
+      this.socket.close()
+      this.socket = null
+    }
+    this.failPending(new Error('Interview socket closed'))
+  }
+
+  // Send a typed event and resolve with the server event that echoes its id
+  request(event) {
+    const id = String(this.nextId++)
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id)
+        reject(new Error(`Interview socket ${event.type} request timed out`))
+      }, REQUEST_TIMEOUT_MS)
+      this.pending.set(id, { resolve, reject, timer })
+      this.socket.send(JSON.stringify({ ...event, id }))
+    })
+  }
+
+  // Send a JPEG/WebP blob; resolves with { analysis, next_frame_after_ms } or { throttled, next_frame_after_ms }
+  async sendFrame(blob) {
+    const bytes = await blob.arrayBuffer()
+    return new Promise((resolve, reject) => {
+      this.pendingFrame = { resolve, reject }
+      this.socket.send(bytes)
+    })
+  }
+
+  handleEvent(event) {
+    if (event.type === 'frame_analysis' || event.type === 'frame_throttled') {
+      if (this.pendingFrame) {
+        this.pendingFrame.resolve({ ...event, throttled: event.type === 'frame_throttled' })
+        this.pendingFrame = null
+      }
+      return
+    }
+    if (event.type === 'error' && event.request_type === 'frame' && this.pendingFrame) {
+      this.pendingFrame.reject(new Error(event.message))
+      this.pendingFrame = null
+      return
+    }
+
+    const request = event.id ? this.pending.get(event.id) : null
+    if (request) {
+      clearTimeout(request.timer)
+      this.pending.delete(event.id)
+      if (event.type === 'error') {
+        // Same shape as an axios error, so callers handle both transports alike
+        const detail = event.message
+        const error = new Error(typeof detail === 'string' ? detail : detail?.message)
+        error.response = { status: event.status, data: { detail } }
+        request.reject(error)
+      } else {
+        request.resolve(event)
+      }
+    } else if (event.type === 'status' && this.onStatus) {
+      // Pushed after every reply and code review
+      this.onStatus(event)
+    }
+  }
+
+  failPending(error) {
+    this.pending.forEach(({ reject, timer }) => {
+      clearTimeout(timer)
+      reject(error)
+    })
+    this.pending.clear()
+    if (this.pendingFrame) {
+      this.pendingFrame.reject(error)
+      this.pendingFrame = null
+    }
+  }
+}
+
+export default InterviewSocket